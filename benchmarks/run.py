@@ -0,0 +1,276 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from importlib.metadata import PackageNotFoundError, version
+from typing import Any, Callable
+
+import django
+
+
+def timed(func: Callable[[], Any], repeat: int) -> dict[str, float]:
+    """Run the function `repeat` times and return its min and median runtime."""
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        runs.append((time.perf_counter() - start) * 1000)
+    return {"min_ms": min(runs), "median_ms": statistics.median(runs)}
+
+
+def bench_log_single(events: int) -> dict[str, float]:
+    """Events per second logged one by one, each with its own INSERT."""
+    from eventlog import EventGroup
+
+    e = EventGroup()
+    start = time.perf_counter()
+    for i in range(events):
+        e.info("Hello World", data={"i": i})
+    return {"events_per_sec": events / (time.perf_counter() - start)}
+
+
+def bench_log_batched(events: int, batch_size: int) -> dict[str, float]:
+    """Events per second logged within `batch()` blocks."""
+    from eventlog import EventGroup
+
+    e = EventGroup()
+    start = time.perf_counter()
+    for i in range(0, events, batch_size):
+        with e.batch():
+            for j in range(i, min(i + batch_size, events)):
+                e.info("Hello World", data={"i": j})
+    return {"events_per_sec": events / (time.perf_counter() - start)}
+
+
+def bench_dispatch(calls: int) -> dict[str, float]:
+    """
+    Nanoseconds per lookup of an event method, on a new and on an already
+    used EventGroup, and per event type lookup.
+    """
+    from eventlog import EventGroup
+
+    groups = [EventGroup(group_id="bench") for _ in range(calls)]
+    start = time.perf_counter_ns()
+    for g in groups:
+        g.info  # noqa: B018 Useless expression
+    first = (time.perf_counter_ns() - start) / calls
+
+    g = groups[0]
+    start = time.perf_counter_ns()
+    for _ in range(calls):
+        g.info  # noqa: B018 Useless expression
+    cached = (time.perf_counter_ns() - start) / calls
+
+    event_types = g.event_types
+    start = time.perf_counter_ns()
+    for _ in range(calls):
+        event_types.by_name("critical")
+    by_name = (time.perf_counter_ns() - start) / calls
+
+    return {"getattr_ns": first, "cached_getattr_ns": cached, "by_name_ns": by_name}
+
+
+def bench_memory(events: int) -> dict[str, float]:
+    """Memory allocated per (buffered, not yet written) event."""
+    from django.apps import apps
+
+    from eventlog import EventGroup
+
+    config = apps.get_app_config("eventlog")
+    buffer_size, buffer_timeout = config.buffer_size, config.buffer_timeout
+    config.buffer_size, config.buffer_timeout = events + 1, None
+    try:
+        e = EventGroup(buffered=True)
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        for i in range(events):
+            e.info("Hello World", data={"i": i})
+        allocated = tracemalloc.get_traced_memory()[0] - before
+        tracemalloc.stop()
+        e._buffer = []  # noqa: SLF001 Private member
+    finally:
+        config.buffer_size, config.buffer_timeout = buffer_size, buffer_timeout
+    return {"bytes_per_event": allocated / events}
+
+
+def populate(rows: int) -> None:
+    """Fill the event table up to `rows` events, ten events per group."""
+    from eventlog.models import Event
+
+    types = ("info", "warning", "error", "critical")
+    start = Event.objects.count()
+    now = datetime.now(tz=dt_timezone.utc)
+    for offset in range(start, rows, 10_000):
+        Event.objects.bulk_create(
+            Event(
+                type=types[i % len(types)],
+                group=f"group-{i // 10}",
+                message=f"Event {i}",
+                data={"i": i},
+                timestamp=now - timedelta(seconds=rows - i),
+            )
+            for i in range(offset, min(offset + 10_000, rows))
+        )
+
+
+def bench_admin(rows: int, repeat: int) -> dict[str, dict[str, float]]:
+    """Render times of the admin changelist and change form."""
+    from django.contrib.auth import get_user_model
+    from django.test import Client
+    from django.urls import reverse
+
+    from eventlog.models import Event
+
+    populate(rows)
+    user_model = get_user_model()
+    user = user_model.objects.filter(username="bench").first()
+    user = user or user_model.objects.create_superuser("bench", "bench@example.com")
+    client = Client()
+    client.force_login(user)
+
+    changelist_url = reverse("admin:eventlog_event_changelist")
+    obj = Event.objects.order_by("pk")[rows // 2]
+    change_url = reverse("admin:eventlog_event_change", args=(obj.pk,))
+
+    return {
+        "changelist": timed(lambda: client.get(changelist_url), repeat),
+        "changelist_type_filter": timed(
+            lambda: client.get(changelist_url, {"type": "error"}), repeat
+        ),
+        "changelist_search": timed(
+            lambda: client.get(changelist_url, {"q": obj.group}), repeat
+        ),
+        "change_form": timed(lambda: client.get(change_url), repeat),
+    }
+
+
+def run_benchmarks(
+    *, events: int, batch_size: int, rows: list[int], repeat: int
+) -> dict[str, Any]:
+    """Run all benchmarks. Events are written to the current database."""
+    results: dict[str, Any] = {
+        "log_single": bench_log_single(events),
+        "log_batched": bench_log_batched(events, batch_size),
+        "dispatch": bench_dispatch(events),
+        "memory": bench_memory(events),
+        "admin": {},
+    }
+
+    from eventlog.models import Event
+
+    Event.objects.all().delete()
+    for count in sorted(rows):
+        results["admin"][str(count)] = bench_admin(count, repeat)
+    return results
+
+
+def flatten(results: dict[str, Any], prefix: str = "") -> dict[str, float]:
+    """Flatten nested results into {"admin.10000.changelist.min_ms": 1.0, ...}"""
+    flat = {}
+    for key, value in results.items():
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{prefix}{key}."))
+        else:
+            flat[f"{prefix}{key}"] = value
+    return flat
+
+
+def compare(results: dict[str, Any], baseline: dict[str, Any]) -> list[str]:
+    """Lines comparing each result with the same result of a baseline."""
+    old = flatten(baseline["results"])
+    lines = []
+    for key, value in flatten(results).items():
+        if old.get(key):
+            lines.append(
+                f"{key}: {old[key]:.2f} -> {value:.2f} ({value / old[key]:.2f}x)"
+            )
+    return lines
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark django-eventlog. Writes the results as JSON."
+    )
+    parser.add_argument(
+        "--events", type=int, default=10_000, help="Events logged per benchmark."
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=100, help="Events per batch() block."
+    )
+    parser.add_argument(
+        "--rows",
+        default="10000",
+        help="Comma separated table sizes for the admin benchmarks, e.g. 10000,1000000",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="Runs per admin benchmark."
+    )
+    parser.add_argument("-o", "--output", help="Write the results to this file.")
+    parser.add_argument(
+        "--compare", metavar="FILE", help="Compare the results with a previous run."
+    )
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "benchmarks.settings")
+    django.setup()
+
+    from django.db import connection
+    from django.test.utils import setup_test_environment
+
+    setup_test_environment()
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        results = run_benchmarks(
+            events=args.events,
+            batch_size=args.batch_size,
+            rows=[int(r) for r in args.rows.split(",")],
+            repeat=args.repeat,
+        )
+    finally:
+        connection.creation.destroy_test_db(
+            connection.settings_dict["NAME"], verbosity=0
+        )
+
+    try:
+        eventlog_version = version("django-eventlog")
+    except PackageNotFoundError:
+        eventlog_version = None
+
+    output = json.dumps(
+        {
+            "meta": {
+                "date": datetime.now(tz=dt_timezone.utc).isoformat(),
+                "eventlog": eventlog_version,
+                "django": django.get_version(),
+                "python": platform.python_version(),
+                "database": connection.vendor,
+                "events": args.events,
+                "batch_size": args.batch_size,
+                "repeat": args.repeat,
+            },
+            "results": results,
+        },
+        indent=2,
+    )
+
+    if args.output:
+        with open(args.output, "w") as f:  # noqa: PTH123 open()
+            f.write(output)
+    else:
+        sys.stdout.write(output + "\n")
+
+    if args.compare:
+        with open(args.compare) as f:  # noqa: PTH123 open()
+            sys.stderr.write("\n".join(compare(results, json.load(f))) + "\n")
+
+
+if __name__ == "__main__":
+    main()
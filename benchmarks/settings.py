@@ -0,0 +1,17 @@
+import os
+
+from eventlog.tests.testapp.settings import *  # noqa: F403 Star import
+
+# Query logging slows down and grows the process.
+DEBUG = False
+
+# Run against PostgreSQL with `BENCHMARK_DATABASE=postgresql`. The connection
+# is configured with the libpq environment variables, e.g. PGHOST, PGUSER,
+# PGPASSWORD and PGDATABASE.
+if os.environ.get("BENCHMARK_DATABASE") == "postgresql":
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.postgresql",
+            "NAME": os.environ.get("PGDATABASE", "eventlog"),
+        },
+    }
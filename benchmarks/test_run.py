@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+import pytest
+
+from benchmarks.run import compare, flatten, run_benchmarks
+
+
+@pytest.mark.django_db
+def test_benchmarks() -> None:
+    """The benchmark suite runs, with tiny numbers."""
+    results = run_benchmarks(events=20, batch_size=5, rows=[30], repeat=1)
+
+    assert set(results) == {"log_single", "log_batched", "dispatch", "memory", "admin"}
+    assert results["log_batched"]["events_per_sec"] > 0
+    assert set(results["admin"]["30"]) == {
+        "changelist",
+        "changelist_type_filter",
+        "changelist_search",
+        "change_form",
+    }
+    assert "admin.30.change_form.min_ms" in flatten(results)
+
+
+def test_compare() -> None:
+    baseline = {"results": {"log_single": {"events_per_sec": 100.0}, "new": {}}}
+    results = {"log_single": {"events_per_sec": 150.0}, "other": {"value": 1.0}}
+    assert compare(results, baseline) == [
+        "log_single.events_per_sec: 100.00 -> 150.00 (1.50x)"
+    ]
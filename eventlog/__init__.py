@@ -1,3 +1,4 @@
 from .events import EventGroup
+from .query import EventQuery
 
-__all__ = ["EventGroup"]
+__all__ = ["EventGroup", "EventQuery"]
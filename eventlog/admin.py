@@ -1,21 +1,129 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any
+import json
+from datetime import datetime, time, timedelta
+from datetime import timezone as dt_timezone
+from functools import partial
+from typing import TYPE_CHECKING, Any, Callable
 
 from django.apps import apps
 from django.contrib import admin
+from django.core.cache import cache
+from django.core.exceptions import PermissionDenied
+from django.core.paginator import Paginator
+from django.db import connections, router
+from django.db.models import Count, Q
 from django.template.defaultfilters import timesince_filter
+from django.template.response import TemplateResponse
+from django.urls import path, reverse
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from django.utils.functional import cached_property
+from django.utils.html import format_html
+from django.utils.text import smart_split, unescape_string_literal
 from django.utils.translation import gettext_lazy as _
 
+from .archive import find_archived_group
+from .db import FULL_TEXT_CONFIG
+from .query import EventQuery
+
 if TYPE_CHECKING:
+    from datetime import date
+
+    from django.db.models import QuerySet
     from django.http import HttpRequest, HttpResponse
+    from django.urls import URLPattern
 
     from .apps import EventLogConfig
-    from .models import Event
+    from .models import Event, EventGroupSummary
 
 
 config: EventLogConfig = apps.get_app_config("eventlog")
 event_model: Event = apps.get_model("eventlog", "Event")
+summary_model: EventGroupSummary = apps.get_model("eventlog", "EventGroupSummary")
+
+TYPE_COUNTS_CACHE_KEY = "eventlog:type_counts"
+
+# Maximum number of days looked up by the archive view. Each day costs one
+# read of its index from the archive storage.
+ARCHIVE_LOOKUP_DAYS = 31
+
+# Time span charted by the rates view, per interval.
+RATE_SPANS = {
+    "minute": timedelta(hours=1),
+    "hour": timedelta(days=2),
+    "day": timedelta(days=30),
+}
+
+
+def estimate_count(queryset: QuerySet) -> int | None:
+    """
+    The number of rows of the queryset as estimated by the query planner,
+    or None if the database backend does not support it (PostgreSQL only).
+    """
+    if connections[queryset.db].vendor != "postgresql":
+        return None
+    plan = json.loads(queryset.explain(format="json"))
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator using the estimated number of rows for large tables, rather
+    than running a slow `COUNT(*)`. See `EventLogConfig.admin_estimated_count`.
+    """
+
+    @cached_property
+    def count(self) -> int:
+        threshold = config.admin_estimated_count
+        if threshold is not None:
+            estimate = estimate_count(self.object_list)
+            if estimate is not None and estimate > threshold:
+                return estimate
+        return super().count
+
+
+def get_type_counts() -> dict[str, int]:
+    """
+    The number of events per event type. The result is cached for
+    `admin_type_counts` seconds, so the table is not scanned on every request.
+    """
+    counts = cache.get(TYPE_COUNTS_CACHE_KEY)
+    if counts is None:
+        counts = dict(
+            event_model.objects.using(config.database)
+            .order_by()
+            .values_list("type")
+            .annotate(count=Count("pk"))
+            .values_list("type", "count")
+        )
+        cache.set(TYPE_COUNTS_CACHE_KEY, counts, config.admin_type_counts)
+    return counts
+
+
+class EventTypeListFilter(admin.SimpleListFilter):
+    """
+    Filter by the event types defined in the config, rather than querying
+    all distinct types of the event table.
+    """
+
+    title = _("Event Type")
+    parameter_name = "type"
+
+    def lookups(
+        self, request: HttpRequest, model_admin: admin.ModelAdmin
+    ) -> list[tuple[str, str]]:
+        event_types = config.get_event_types().events
+        if config.admin_type_counts is None:
+            return [(t.name, t.label) for t in event_types]
+
+        counts = get_type_counts()
+        return [(t.name, f"{t.label} ({counts.get(t.name, 0)})") for t in event_types]
+
+    def queryset(self, request: HttpRequest, queryset: QuerySet) -> QuerySet:
+        if self.value():
+            return queryset.filter(type=self.value())
+        return queryset
 
 
 def get_difference(obj: Event, next_obj: Event) -> str:
@@ -27,8 +135,15 @@ def get_difference(obj: Event, next_obj: Event) -> str:
     "4h 7m 0s"
     "5s"
     """
-    delay = int((next_obj.timestamp - obj.timestamp).total_seconds())
-    years, remainder = divmod(delay, 60 * 60 * 24 * 365)
+    return format_delay(next_obj.timestamp - obj.timestamp)
+
+
+def format_delay(delay: timedelta) -> str:
+    """
+    Formats the elapsed time between two events, see `get_difference()`.
+    """
+    seconds = int(delay.total_seconds())
+    years, remainder = divmod(seconds, 60 * 60 * 24 * 365)
     days, remainder = divmod(remainder, 60 * 60 * 24)
     hours, remainder = divmod(remainder, 60 * 60)
     mins, secs = divmod(remainder, 60)
@@ -51,8 +166,8 @@ class EventAdmin(admin.ModelAdmin):
         "message",
         "initiator",
     )
-    search_fields = ("group", "message", "initiator")
-    list_filter = ("type", "timestamp")
+    paginator = EstimatedCountPaginator
+    list_filter = (EventTypeListFilter, "timestamp")
     change_list_template = "admin/eventlog/event/change_list.html"
     change_form_template = "admin/eventlog/event/change_form.html"
 
@@ -60,10 +175,189 @@ class EventAdmin(admin.ModelAdmin):
         super().__init__(*args, **kwargs)
         self.event_types = config.get_event_types()
 
+    def get_queryset(self, request: HttpRequest) -> QuerySet[Event]:
+        """Events are read from `EventLogConfig.database`, if set."""
+        return super().get_queryset(request).using(config.database)
+
+    @property
+    def show_full_result_count(self) -> bool:  # type: ignore[override]
+        """Don't count the total number of events, if counts are estimated."""
+        return config.admin_estimated_count is None
+
+    def get_search_fields(self, request: HttpRequest) -> tuple[str, ...]:
+        """
+        Full-text search ("@field") requires PostgreSQL and `django.contrib.postgres`,
+        otherwise those fields are searched with a regular "contains" lookup.
+        """
+        using = config.database or router.db_for_read(event_model)
+        full_text = connections[using].vendor == "postgresql" and apps.is_installed(
+            "django.contrib.postgres"
+        )
+        return tuple(
+            field if full_text or not field.startswith("@") else field[1:]
+            for field in config.admin_search_fields
+        )
+
+    def get_search_results(
+        self, request: HttpRequest, queryset: QuerySet[Event], search_term: str
+    ) -> tuple[QuerySet[Event], bool]:
+        """
+        Like the default search, but with lookups which can use an index:
+        "=field" is an exact, case-sensitive match (the default is `iexact`),
+        and "@field" a full-text search with the text search config of the
+        full-text index of `message` (see migration 0012).
+        """
+        search_fields = self.get_search_fields(request)
+        if not (search_fields and search_term):
+            return queryset, False
+
+        lookups: list[tuple[str, Callable[[str], Any]]] = []
+        for field in search_fields:
+            if field.startswith("="):
+                lookups.append((f"{field[1:]}__exact", str))
+            elif field.startswith("^"):
+                lookups.append((f"{field[1:]}__istartswith", str))
+            elif field.startswith("@"):
+                # Requires a PostgreSQL driver, see get_search_fields().
+                from django.contrib.postgres.search import (  # noqa: PLC0415 Import outside top-level
+                    SearchQuery,
+                )
+
+                query = partial(SearchQuery, config=FULL_TEXT_CONFIG)
+                lookups.append((f"{field[1:]}__search", query))
+            else:
+                lookups.append((f"{field}__icontains", str))
+
+        # Each term must match one of the fields.
+        terms = Q()
+        for bit in smart_split(search_term):
+            term = (
+                unescape_string_literal(bit)
+                if bit.startswith(('"', "'")) and bit[0] == bit[-1]
+                else bit
+            )
+            terms &= Q(
+                *(Q(**{lookup: value(term)}) for lookup, value in lookups),
+                _connector=Q.OR,
+            )
+        return queryset.filter(terms), False
+
     @admin.display(description="Time", ordering="timestamp")
     def relative_timestamp(self, obj: Event) -> str:
         return _("{time} ago").format(time=timesince_filter(obj.timestamp))
 
+    def get_urls(self) -> list[URLPattern]:
+        return [
+            path(
+                "rates/",
+                self.admin_site.admin_view(self.rates_view),
+                name="eventlog_event_rates",
+            ),
+            path(
+                "archive/",
+                self.admin_site.admin_view(self.archive_view),
+                name="eventlog_event_archive",
+            ),
+            *super().get_urls(),
+        ]
+
+    def archive_view(self, request: HttpRequest) -> HttpResponse:
+        """
+        Look up the events of a group in the archive, see `eventlog_archive`.
+        """
+        if not self.has_view_permission(request):
+            raise PermissionDenied
+
+        group = request.GET.get("group", "").strip()
+        since = get_date(request, "since")
+        until = get_date(request, "until")
+        error = None
+        event_list = []
+
+        if group and not (since and until):
+            # The days of the group's summary, if any, or the last days.
+            summary = (
+                summary_model.objects.using(config.database).filter(group=group).first()
+            )
+            if summary:
+                since = summary.first_timestamp.astimezone(dt_timezone.utc).date()
+                until = summary.last_timestamp.astimezone(dt_timezone.utc).date()
+            else:
+                until = timezone.now().astimezone(dt_timezone.utc).date()
+                since = until
+            since = max(since, until - timedelta(days=ARCHIVE_LOOKUP_DAYS - 1))
+
+        if group and since and until:
+            if (until - since).days >= ARCHIVE_LOOKUP_DAYS:
+                error = _("Choose a range of at most %(days)s days.") % {
+                    "days": ARCHIVE_LOOKUP_DAYS
+                }
+            else:
+                event_list = find_archived_group(
+                    group,
+                    since=datetime.combine(since, time(), dt_timezone.utc),
+                    until=datetime.combine(
+                        until + timedelta(days=1), time(), dt_timezone.utc
+                    ),
+                )
+        for e in event_list:
+            e["html_label"] = self.event_types.by_name_or_fallback(e["type"]).html_label
+
+        context = {
+            **self.admin_site.each_context(request),
+            "title": _("Archived Events"),
+            "opts": self.model._meta,  # noqa: SLF001 Private member
+            "group": group,
+            "since": since,
+            "until": until,
+            "error": error,
+            "event_list": event_list,
+        }
+        return TemplateResponse(request, "admin/eventlog/event/archive.html", context)
+
+    def rates_view(self, request: HttpRequest) -> HttpResponse:
+        """
+        Chart of the number of events per interval and type, read from the
+        rollups. See `EventLogConfig.rollup`.
+        """
+        if not self.has_view_permission(request):
+            raise PermissionDenied
+
+        interval = request.GET.get("interval", "hour")
+        if interval not in RATE_SPANS:
+            interval = "hour"
+        since = timezone.now() - RATE_SPANS[interval]
+
+        buckets: dict[datetime, dict[str, int]] = {}
+        for start, event_type, count in EventQuery().rates(interval, since=since):
+            buckets.setdefault(start, {})[event_type] = count
+
+        types = sorted(
+            {t for counts in buckets.values() for t in counts},
+            key=self.event_types.severity,
+        )
+        max_total = max((sum(c.values()) for c in buckets.values()), default=0)
+        rows = [
+            {
+                "start": start,
+                "counts": [counts.get(t, 0) for t in types],
+                "total": sum(counts.values()),
+                "percent": round(100 * sum(counts.values()) / max_total),
+            }
+            for start, counts in sorted(buckets.items(), reverse=True)
+        ]
+
+        context = {
+            **self.admin_site.each_context(request),
+            "title": _("Event Rates"),
+            "opts": self.model._meta,  # noqa: SLF001 Private member
+            "interval": interval,
+            "intervals": list(RATE_SPANS),
+            "types": [self.event_types.by_name_or_fallback(t) for t in types],
+            "rows": rows,
+        }
+        return TemplateResponse(request, "admin/eventlog/event/rates.html", context)
+
     def has_add_permission(self, request: HttpRequest) -> bool:
         """Nobody can add events manually. Only programmatically."""
         return False
@@ -87,12 +381,112 @@ class EventAdmin(admin.ModelAdmin):
         if not obj:  # pragma: no cover
             return super().render_change_form(request, context, obj=obj, **kwargs)
 
-        qs = event_model.objects.filter(group=obj.group).order_by("timestamp")
+        context.update(self.get_timeline(obj))
+        return super().render_change_form(request, context, obj=obj, **kwargs)
+
+    def get_timeline(self, obj: Event) -> dict[str, Any]:
+        """
+        The events of the group around the given event. At most
+        `admin_timeline_size` events before and after the event are listed.
+
+        The events before and after are fetched by two queries continuing
+        from the given event, using the (group, timestamp) index, so the cost
+        doesn't depend on the size of the group.
+        """
+        size = config.admin_timeline_size
+        qs = (
+            event_model.objects.using(config.database)
+            .filter(group=obj.group)
+            .only("type", "timestamp", "message", "initiator", "occurrences")
+        )
+
+        # Fetch one more event on each side, to know if there are more events.
+        # The one before is also required for the delay of the first event.
+        before = qs.filter(
+            Q(timestamp__lt=obj.timestamp) | Q(timestamp=obj.timestamp, pk__lt=obj.pk)
+        ).order_by("-timestamp", "-pk")[: size + 1]
+        after = qs.filter(
+            Q(timestamp__gt=obj.timestamp) | Q(timestamp=obj.timestamp, pk__gte=obj.pk)
+        ).order_by("timestamp", "pk")[: size + 2]
+        event_list = [*reversed(before), *after]
+
+        previous = None
+        for e in event_list:
+            e.timestamp_delay = (
+                format_delay(e.timestamp - previous.timestamp) if previous else None
+            )
+            previous = e
+
+        has_earlier = len(before) > size
+        has_later = len(after) > size + 1
+        event_list = event_list[int(has_earlier) : len(event_list) - int(has_later)]
+
+        return {
+            "event_list": event_list,
+            "earlier_event": event_list[0] if has_earlier else None,
+            "later_event": event_list[-1] if has_later else None,
+        }
+
 
-        last = None
-        for e in qs:
-            if last:
-                e.timestamp_delay = get_difference(last, obj)
-            last = e
-        context["event_list"] = qs
-        return super().render_change_form(request, context, **kwargs)
+def get_date(request: HttpRequest, name: str) -> date | None:
+    """A date (YYYY-MM-DD) in the query string, or None if missing or invalid."""
+    try:
+        return parse_date(request.GET.get(name, ""))
+    except ValueError:
+        return None
+
+
+class SeverityListFilter(admin.SimpleListFilter):
+    """Filter groups by their most severe event type."""
+
+    title = _("worst event type")
+    parameter_name = "worst_type"
+
+    def lookups(
+        self, request: HttpRequest, model_admin: admin.ModelAdmin
+    ) -> list[tuple[str, str]]:
+        return [(t.name, t.label) for t in config.get_event_types().events]
+
+    def queryset(self, request: HttpRequest, queryset: QuerySet) -> QuerySet:
+        if self.value():
+            return queryset.filter(worst_type=self.value())
+        return queryset
+
+
+@admin.register(summary_model)
+class EventGroupSummaryAdmin(admin.ModelAdmin):
+    """Event groups, see `EventLogConfig.group_summary`."""
+
+    list_display = (
+        "group_link",
+        "html_label",
+        "event_count",
+        "last_message",
+        "first_timestamp",
+        "last_timestamp",
+    )
+    list_filter = (SeverityListFilter, "last_timestamp")
+    search_fields = ("=group",)
+    sortable_by = ("group_link", "html_label", "event_count", "last_timestamp")
+    show_full_result_count = False
+
+    def get_queryset(self, request: HttpRequest) -> QuerySet[EventGroupSummary]:
+        """Summaries are read from `EventLogConfig.database`, if set."""
+        return super().get_queryset(request).using(config.database)
+
+    @admin.display(description=_("Event Group"), ordering="group")
+    def group_link(self, obj: EventGroupSummary) -> str:
+        url = reverse("admin:eventlog_event_changelist")
+        return format_html('<a href="{}?group={}">{}</a>', url, obj.group, obj)
+
+    @admin.display(description=_("Worst event type"), ordering="severity")
+    def html_label(self, obj: EventGroupSummary) -> str:
+        return obj.html_label
+
+    def has_add_permission(self, request: HttpRequest) -> bool:
+        return False
+
+    def has_change_permission(
+        self, request: HttpRequest, obj: EventGroupSummary | None = None
+    ) -> bool:
+        return False
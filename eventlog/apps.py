@@ -1,12 +1,27 @@
 from __future__ import annotations
 
+import atexit
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Callable
 from uuid import uuid4
 
 from django.apps import AppConfig
 from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import router
+from django.utils.translation import get_language
 from django.utils.translation import gettext_lazy as _
 
 from .datastructures import EventType, EventTypeList
+from .events import write_events
+from .mail import send_event_mails
+from .writer import EventWriter
+
+if TYPE_CHECKING:
+    import json
+
+    from .metrics import MetricsCollector
 
 
 class EventLogConfig(AppConfig):
@@ -14,6 +29,10 @@ class EventLogConfig(AppConfig):
     verbose_name = "EventLog"
     default_auto_field = "django.db.models.AutoField"
 
+    # Guards the creation of the queues, threads and the metrics collector
+    # shared by all threads, which are created on first use.
+    _lock = threading.Lock()
+
     # -- List of event types to be used in events.
     event_types: EventTypeList = EventTypeList(
         EventType(name="info", label=_("Info")),
@@ -22,6 +41,149 @@ class EventLogConfig(AppConfig):
         EventType(name="critical", label=_("Critical"), color="white", bgcolor="red"),
     )
 
+    # -- JSON encoder used to serialize the data attached to an event. The
+    # DjangoJSONEncoder supports datetimes, Decimals, UUIDs and more. Use
+    # `eventlog.encoders.OrjsonEncoder` for a faster encoding, if `orjson` is
+    # installed. Data which can't be serialized is stored as a string.
+    data_encoder: type[json.JSONEncoder] = DjangoJSONEncoder
+
+    # -- Database
+    #
+    # Alias of the database (of the Django `DATABASES` setting) events are
+    # written to, e.g. a separate database for a high volume of events. None
+    # asks the database routers, which default to the "default" database. The
+    # admin, `EventQuery` and the management commands use this database as
+    # well. Add `eventlog.routers.EventLogRouter` to the `DATABASE_ROUTERS`
+    # setting, so the migrations (and other queries of the models) use it too.
+    database: str | None = None
+
+    # Write events outside the transaction of the caller, so they are kept if
+    # it's rolled back. Within an atomic block, events are then written by a
+    # separate thread with its own database connection, and the caller waits
+    # for it. Events written to a separate `database` are never part of the
+    # caller's transaction.
+    autonomous_writes: bool = False
+
+    # Number of threads writing events autonomously, each with its own
+    # database connection. If all threads are busy, callers wait for a free
+    # one, so use at least the number of threads logging events concurrently
+    # within atomic blocks (e.g. the threads of the WSGI server).
+    autonomous_workers: int = 4
+
+    _autonomous_executor: ThreadPoolExecutor | None = None
+
+    # -- Payload Limits
+    #
+    # Maximum size of the message in bytes, the size of the serialized data
+    # in bytes, and the nesting depth of the data. None disables the limit.
+    # Checking the data size requires serializing the data one more time.
+    max_message_bytes: int | None = None
+    max_data_bytes: int | None = None
+    max_data_depth: int | None = None
+
+    # What to do with events exceeding a limit. Truncated events are marked
+    # with `Event.truncated`.
+    #
+    # "truncate" ..: Cut the message, replace data nested too deep with "..."
+    #                and store data that is too large as a cut JSON string.
+    # "summarize" .: Like "truncate", but data that is too large is replaced
+    #                by a short summary of its type, size and keys.
+    # "reject" ....: Don't store the event at all.
+    oversize_policy: str = "truncate"
+
+    # -- Throttling
+    #
+    # Maximum number of events of a group with the same type and message logged
+    # within `throttle_period` seconds, across all processes. None disables it. The
+    # counters are stored in the `throttle_cache` of the Django CACHES setting,
+    # which must be shared by all processes, e.g. Redis or Memcached.
+    throttle_rate: int | None = None
+    throttle_period: int = 60
+    throttle_cache: str = "default"
+
+    # What to do with events exceeding the rate. No emails are sent for them.
+    #
+    # "drop" ......: Don't store the event.
+    # "collapse" ..: Increase `Event.occurrences` and update `Event.last_seen`
+    #                of the latest stored event of the same group with the
+    #                same type and message.
+    throttle_mode: str = "drop"
+
+    # -- Group Summaries
+    #
+    # Maintain an `EventGroupSummary` per group (number of events, first and
+    # last event, most severe event type) when events are written. This costs
+    # one additional UPDATE per group and write. Use the
+    # `eventlog_rebuild_summaries` command to create the summaries of existing
+    # events, e.g. after enabling it or after deleting events.
+    group_summary: bool = False
+
+    # -- Rollups
+    #
+    # Count events per minute and type in `EventRollup`, for charts of event
+    # rates which don't have to aggregate the events themselves.
+    #
+    # None .......: Disabled.
+    # "write" ....: Update the counts when events are written (committed). This
+    #               costs one UPDATE per minute and type and write, and all
+    #               writers of a type within a minute update the same row.
+    # "command" ..: Count new events with the periodic `eventlog_rollup` command.
+    #               Recommended for a high volume of events.
+    rollup: str | None = None
+
+    # Each run of the `eventlog_rollup` command counts the minutes within the
+    # last number of seconds again, so events committed late (e.g. by a long
+    # transaction, after events with a higher id were counted) are included.
+    # Events committed later than that after they were logged are missed.
+    rollup_grace: int = 300
+
+    # -- Retention
+    #
+    # Number of days events are kept by the `eventlog_prune` command, per event
+    # type. `None` keeps them forever. The key "*" applies to all event types
+    # without an explicit retention. Events are kept forever by default.
+    #
+    # E.g. to keep "info" events 30 days, "critical" events forever and all
+    # other events 90 days: `{"info": 30, "critical": None, "*": 90}`
+    retention: dict[str, int | None] = {}  # noqa: RUF012 Mutable class attribute
+
+    # -- Archive
+    #
+    # Events archived by the `eventlog_archive` command are stored as gzip
+    # compressed JSON Lines files in this storage (an alias of the Django
+    # `STORAGES` setting, None for the default storage), below `archive_path`.
+    archive_storage: str | None = None
+    archive_path: str = "eventlog"
+
+    # -- Partitioning (PostgreSQL only)
+    #
+    # Interval of the partitions created by the `eventlog_partition` command,
+    # "day" or "month", and the number of future partitions created ahead.
+    partition_interval: str = "month"
+    partition_ahead: int = 3
+
+    # -- Admin
+    #
+    # Number of events of the same group listed before and after the current
+    # event on the admin change page.
+    admin_timeline_size: int = 25
+
+    # Fields searched in the admin changelist. Prefix a field with "=" for an
+    # exact, case-sensitive match, "^" for a prefix match, or "@" for a
+    # full-text search (PostgreSQL with `django.contrib.postgres` only). Only
+    # "=" and "@message" use an index, e.g. for large tables:
+    # `("=group", "@message")`
+    admin_search_fields: tuple[str, ...] = ("group", "message", "initiator")
+
+    # Use the row count estimated by the database (PostgreSQL only) for the
+    # changelist pagination, if it's larger than this number. The exact count
+    # runs a `COUNT(*)` which is slow on large tables. None always counts.
+    admin_estimated_count: int | None = None
+
+    # Show the number of events per type in the changelist type filter. The
+    # counts are cached for this number of seconds. None disables the counts.
+    admin_type_counts: int | None = None
+
     # -- Email Notification Settings
 
     # Fail silently if the email server does not exist or respond
@@ -33,7 +195,9 @@ class EventLogConfig(AppConfig):
     # Email subject and text body templates. This needs to be a standard
     # Python string. You may use 'new style' format variables here.
     #
-    # {type} ......: Event type, such as "Info" or "Warning".
+    # {type} ......: Event type, rendered as its label, such as "Info" or
+    #                "Warning". Use {type.name} for its name.
+    # {type_label} : The label of the event type.
     # {date} ......: The date and time the event was triggered.
     # {message} ...: The message sent with the event.
     # {data} ......: The JSON data attached to the event.
@@ -43,6 +207,70 @@ class EventLogConfig(AppConfig):
         "The Event was {type} on {date}\n\n{message}\n\n-- {initiator}",
     )
 
+    # Subject of digest emails combining multiple events. {count} is the
+    # number of events.
+    email_digest_subject_template: str = _("Event Log: {count} events")
+
+    # -- Mail Queue
+    #
+    # If enabled, emails are not sent by the thread logging the event. They are
+    # queued and sent by a background thread, up to `mail_batch_size` emails
+    # over one connection.
+    mail_queue: bool = False
+    mail_queue_size: int = 10_000
+    mail_batch_size: int = 100
+
+    # Seconds the mail queue collects emails before sending them, and combines
+    # all events for the same recipient into one digest email. None disables
+    # the digest mode.
+    mail_digest_window: float | None = None
+
+    # Seconds to wait for the mail queue to be drained when the process exits.
+    mail_shutdown_timeout: float = 10.0
+
+    _mail_dispatcher: EventWriter | None = None
+    _mail_templates: dict[str, tuple[Callable[..., str], ...]] | None = None
+
+    # -- Buffered Mode
+    #
+    # Settings for EventGroups created with `buffered=True` or within an
+    # `EventGroup.batch()` block. Buffered events are written with a single
+    # bulk INSERT once `buffer_size` events are collected, or if the oldest
+    # buffered event is older than `buffer_timeout` seconds (None to disable)
+    # when the next event is logged. An idle buffer is not flushed, call
+    # `flush()` once done, otherwise the buffered events are lost.
+    buffer_size: int = 100
+    buffer_timeout: float | None = 5.0
+
+    # -- Write-Behind Queue
+    #
+    # If enabled, events are not written by the calling thread. They are put
+    # into a bounded in-process queue which is drained by background threads,
+    # writing up to `write_behind_batch_size` events per INSERT. Emails are
+    # sent by the background threads as well.
+    write_behind: bool = False
+    write_behind_queue_size: int = 10_000
+    write_behind_workers: int = 1
+    write_behind_batch_size: int = 100
+
+    # What to do if the queue is full: Wait for a free slot ("block"), or
+    # discard the oldest ("drop_oldest") or the new event ("drop_newest").
+    write_behind_overflow: str = "block"
+
+    # Seconds to wait for the queue to be drained when the process exits.
+    write_behind_shutdown_timeout: float = 10.0
+
+    _event_writer: EventWriter | None = None
+
+    # -- Metrics
+    #
+    # Class collecting counters (events per type, failures) and timings
+    # (serialization, INSERT, email) of logged events, e.g. the built-in
+    # `eventlog.metrics.InMemoryMetrics`. None disables the instrumentation.
+    metrics_class: type[MetricsCollector] | None = None
+
+    _metrics: MetricsCollector | None = None
+
     def get_event_types(self) -> EventTypeList:
         """
         All code calls this method and not `self.event_types`, so you can
@@ -50,8 +278,111 @@ class EventLogConfig(AppConfig):
         """
         return self.event_types
 
+    def get_retention(self) -> dict[str, int | None]:
+        """
+        Retention in days per event type, used by the `eventlog_prune` command.
+        """
+        return self.retention
+
     def generate_group_id(self) -> str:
         """
         Method to create a new, random group id.
         """
         return uuid4().hex
+
+    def get_database(self) -> str:
+        """
+        The alias of the database events are written to.
+        """
+        if self.database is not None:
+            return self.database
+        return router.db_for_write(self.get_model("Event"))
+
+    def get_event_writer(self) -> EventWriter | None:
+        """
+        The write-behind queue used by all EventGroups, or None if disabled.
+        The queue is started on first use.
+        """
+        if not self.write_behind:
+            return None
+
+        if self._event_writer is None:
+            with self._lock:
+                if self._event_writer is None:
+                    writer = EventWriter(
+                        handler=write_events,
+                        maxsize=self.write_behind_queue_size,
+                        workers=self.write_behind_workers,
+                        batch_size=self.write_behind_batch_size,
+                        overflow=self.write_behind_overflow,
+                    )
+                    writer.start()
+                    atexit.register(writer.shutdown, self.write_behind_shutdown_timeout)
+                    self._event_writer = writer
+        return self._event_writer
+
+    def get_mail_dispatcher(self) -> EventWriter | None:
+        """
+        The queue of email notifications, or None if disabled. The queue is
+        started on first use.
+        """
+        if not self.mail_queue:
+            return None
+
+        if self._mail_dispatcher is None:
+            with self._lock:
+                if self._mail_dispatcher is None:
+                    dispatcher = EventWriter(
+                        handler=send_event_mails,
+                        maxsize=self.mail_queue_size,
+                        batch_size=self.mail_batch_size,
+                        linger=self.mail_digest_window or 0,
+                    )
+                    dispatcher.start()
+                    atexit.register(dispatcher.shutdown, self.mail_shutdown_timeout)
+                    self._mail_dispatcher = dispatcher
+        return self._mail_dispatcher
+
+    def get_autonomous_executor(self) -> ThreadPoolExecutor:
+        """
+        The threads writing events outside the transaction of the caller,
+        see `autonomous_writes`. They are started on first use.
+        """
+        if self._autonomous_executor is None:
+            with self._lock:
+                if self._autonomous_executor is None:
+                    self._autonomous_executor = ThreadPoolExecutor(
+                        max_workers=self.autonomous_workers,
+                        thread_name_prefix="eventlog-autonomous",
+                    )
+        return self._autonomous_executor
+
+    def get_mail_templates(self) -> tuple[Callable[..., str], ...]:
+        """
+        The email subject, body and digest subject templates, as format
+        functions. They are translated once per language.
+        """
+        if self._mail_templates is None:
+            self._mail_templates = {}
+
+        language = get_language()
+        if language not in self._mail_templates:
+            self._mail_templates[language] = (
+                str(self.email_subject_template).format,
+                str(self.email_template).format,
+                str(self.email_digest_subject_template).format,
+            )
+        return self._mail_templates[language]
+
+    def get_metrics(self) -> MetricsCollector | None:
+        """
+        The metrics collector used by all EventGroups, or None if disabled.
+        """
+        if self.metrics_class is None:
+            return None
+
+        if self._metrics is None:
+            with self._lock:
+                if self._metrics is None:
+                    self._metrics = self.metrics_class()
+        return self._metrics
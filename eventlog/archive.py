@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import gzip
+import io
+import json
+import tempfile
+from contextlib import ExitStack
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from typing import IO, TYPE_CHECKING, Any, TextIO
+
+from django.apps import apps
+from django.core.files import File
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage, storages
+
+from .transfer import dump_events, export_events, load_events
+
+if TYPE_CHECKING:
+    from django.core.files.storage import Storage
+
+    from .apps import EventLogConfig
+
+INDEX = "index.json"
+
+
+def get_storage() -> Storage:
+    """The storage defined in `EventLogConfig.archive_storage`."""
+    config: EventLogConfig = apps.get_app_config("eventlog")
+    if config.archive_storage is None:
+        return default_storage
+    return storages[config.archive_storage]
+
+
+def day_path(day: datetime) -> str:
+    """Directory of the archive of a day, e.g. eventlog/2024/03/01"""
+    config: EventLogConfig = apps.get_app_config("eventlog")
+    return f"{config.archive_path}/{day:%Y/%m/%d}"
+
+
+def archive_events(
+    before: datetime, *, storage: Storage | None = None, chunk_size: int = 1000
+) -> dict[str, int]:
+    """
+    Move all events of the days prior to `before` from the database into
+    archive files. Only complete days (in UTC) are archived.
+
+    Each day gets one gzip compressed JSON Lines file per event type, and an
+    index file mapping the group ids to the files holding their events.
+
+    Returns the number of archived events per day.
+    """
+    config: EventLogConfig = apps.get_app_config("eventlog")
+    # The events are read from the database they are deleted from.
+    using = config.get_database()
+    events = apps.get_model("eventlog", "Event").objects.using(using)
+    storage = storage or get_storage()
+    before = before.astimezone(dt_timezone.utc).replace(
+        hour=0, minute=0, second=0, microsecond=0
+    )
+    results = {}
+
+    first = events.filter(timestamp__lt=before).order_by("timestamp")
+    if not (first_event := first.only("timestamp").first()):
+        return results
+
+    day = first_event.timestamp.astimezone(dt_timezone.utc).replace(
+        hour=0, minute=0, second=0, microsecond=0
+    )
+    while day < before:
+        if count := _archive_day(day, storage, chunk_size, using):
+            results[f"{day:%Y-%m-%d}"] = count
+        day += timedelta(days=1)
+    return results
+
+
+def _archive_day(day: datetime, storage: Storage, chunk_size: int, using: str) -> int:
+    events = apps.get_model("eventlog", "Event").objects.using(using)
+    path = day_path(day)
+    end = day + timedelta(days=1)
+
+    # Write the events into one temporary, compressed file per type.
+    files: dict[str, tuple[IO[bytes], TextIO]] = {}
+    index: dict[str, set[str]] = {}
+    names: dict[str, str] = {}
+    max_pk = count = 0
+    with ExitStack() as stack:
+        for event in export_events(
+            since=day, until=end, chunk_size=chunk_size, using=using
+        ):
+            if event["type"] not in files:
+                f = stack.enter_context(tempfile.TemporaryFile())
+                gz = gzip.GzipFile(fileobj=f, mode="wb")
+                files[event["type"]] = (f, io.TextIOWrapper(gz, encoding="utf-8"))
+            dump_events([event], files[event["type"]][1])
+            index.setdefault(event["group"], set()).add(event["type"])
+            max_pk = max(max_pk, event["id"])
+            count += 1
+
+        for event_type, (f, stream) in files.items():
+            stream.close()  # Finishes the gzip stream, but keeps `f` open.
+            f.seek(0)
+            name = storage.save(f"{path}/{event_type}.jsonl.gz", File(f))
+            names[event_type] = name.rsplit("/", 1)[-1]
+
+    if not count:
+        return 0
+
+    # Merge the index with an existing one, in case the day was archived before.
+    groups = read_index(day, storage)
+    for group, types in index.items():
+        groups[group] = sorted({*groups.get(group, []), *(names[t] for t in types)})
+    if storage.exists(f"{path}/{INDEX}"):
+        storage.delete(f"{path}/{INDEX}")
+    storage.save(f"{path}/{INDEX}", ContentFile(json.dumps(groups).encode()))
+
+    # Delete the archived events in chunks.
+    qs = events.filter(timestamp__gte=day, timestamp__lt=end, pk__lte=max_pk)
+    while pks := list(qs.values_list("pk", flat=True)[:chunk_size]):
+        events.filter(pk__in=pks).delete()
+
+    return count
+
+
+def read_index(day: datetime, storage: Storage | None = None) -> dict[str, list[str]]:
+    """The index of a day, mapping group ids to their archive files."""
+    storage = storage or get_storage()
+    name = f"{day_path(day)}/{INDEX}"
+    if not storage.exists(name):
+        return {}
+    with storage.open(name) as f:
+        return json.loads(f.read())
+
+
+def archived_days(storage: Storage | None = None) -> list[datetime]:
+    """All archived days, oldest first."""
+    config: EventLogConfig = apps.get_app_config("eventlog")
+    storage = storage or get_storage()
+    if not storage.exists(config.archive_path):
+        return []
+
+    days = []
+    for year in storage.listdir(config.archive_path)[0]:
+        for month in storage.listdir(f"{config.archive_path}/{year}")[0]:
+            days.extend(
+                datetime(int(year), int(month), int(day), tzinfo=dt_timezone.utc)
+                for day in storage.listdir(f"{config.archive_path}/{year}/{month}")[0]
+            )
+    return sorted(days)
+
+
+def find_archived_group(
+    group_id: str,
+    *,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    storage: Storage | None = None,
+) -> list[dict[str, Any]]:
+    """
+    All archived events of a group, ordered by timestamp. Only the index of
+    each day between `since` and `until` and the archive files holding events
+    of this group are read.
+
+    Pass both `since` and `until` on large archives. Otherwise all archived
+    days are listed, and the index of each of them is read.
+    """
+    storage = storage or get_storage()
+    if since is not None and until is not None:
+        days = []
+        day = since.astimezone(dt_timezone.utc).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        while day < until:
+            days.append(day)
+            day += timedelta(days=1)
+    else:
+        days = [
+            day
+            for day in archived_days(storage)
+            if not (since and day + timedelta(days=1) <= since)
+            and not (until and day >= until)
+        ]
+
+    events = []
+    for day in days:
+        for name in read_index(day, storage).get(group_id, []):
+            with storage.open(f"{day_path(day)}/{name}") as f:
+                stream = io.TextIOWrapper(gzip.GzipFile(fileobj=f), encoding="utf-8")
+                events.extend(e for e in load_events(stream) if e["group"] == group_id)
+    return sorted(events, key=lambda e: (e["timestamp"], e["id"]))
@@ -1,10 +1,14 @@
 from __future__ import annotations
 
 import re
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 from django.utils.decorators import method_decorator
 from django.utils.safestring import mark_safe
+from django.utils.translation import get_language
+
+# Valid event type names, see `EventType.name`.
+NAME_RE = re.compile(r"^[a-zA-Z_][a-zA-Z0-9_]{0,49}$")
 
 
 @dataclass
@@ -24,18 +28,33 @@ class EventType:
     color: str | None = None  # Foreground CSS color used in the Admin changelist.
     bgcolor: str | None = None  # Background CSS color used in the Admin changelist.
 
+    # Rendered HTML labels, per language.
+    _html_labels: dict[str | None, str] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
     def __post_init__(self) -> None:
         """Validate the attributes"""
-        if not re.match(r"^[a-zA-Z_][a-zA-Z0-9_]{0,49}$", self.name):
+        if not NAME_RE.match(self.name):
             msg = (
                 f"The name {self.name} must be alphanumeric characters, "
                 f"not start with number, and at most 50 characters."
             )
             raise TypeError(msg)
 
+    def __str__(self) -> str:
+        return str(self.label)  # The label may be a lazy translation.
+
     @property
-    @method_decorator(mark_safe)
     def html_label(self) -> str:
+        """The label rendered as HTML. It's rendered once per language."""
+        language = get_language()
+        if language not in self._html_labels:
+            self._html_labels[language] = self._render_html_label()
+        return self._html_labels[language]
+
+    @method_decorator(mark_safe)
+    def _render_html_label(self) -> str:
         styles = " ".join(
             (
                 f"color: {self.color};" if self.color else "",
@@ -49,18 +68,68 @@ class EventType:
 class EventTypeList:
     """
     List that holds all event types and adds some filter features.
+
+    Event types are indexed by their name. Use `add()` and `remove()` to
+    modify the list, so the index is kept up to date.
     """
 
     events: list[EventType]
+    _index: dict[str, EventType] = field(repr=False, compare=False)
+
+    # Event types created for names which are not (or no longer) in the list.
+    _fallbacks: dict[str, EventType] = field(repr=False, compare=False)
 
     def __init__(self, *events: EventType) -> None:
-        self.events = list(events)
+        self.events = []
+        self._index = {}
+        self._fallbacks = {}
+        for event_type in events:
+            if event_type is not None:
+                self.add(event_type)
+
+    def add(self, event_type: EventType) -> None:
+        """
+        Add an event type to the end of the list. An existing event type with
+        the same name is replaced at its position, so its severity is kept.
+        """
+        if old := self._index.get(event_type.name):
+            self.events[self.events.index(old)] = event_type
+        else:
+            self.events.append(event_type)
+        self._index[event_type.name] = event_type
+        self._fallbacks.pop(event_type.name, None)
+
+    def remove(self, name: str) -> None:
+        """Remove an event type from the list by its name."""
+        if name not in self._index:
+            msg = f'Event type "{name}" does not exist.'
+            raise TypeError(msg)
+        self.events.remove(self._index.pop(name))
 
     def by_name(self, name: str) -> EventType | None:
         """
         Get an event type from the list by its name.
         Returns None if the event does not exist.
         """
-        return next(
-            filter(lambda e: e is not None and e.name == name, self.events), None
-        )
+        return self._index.get(name)
+
+    def by_name_or_fallback(self, name: str) -> EventType:
+        """
+        Get an event type from the list by its name. If it does not exist,
+        e.g. for events of a type that was removed from the config, an event
+        type with a title-cased label is created and cached.
+        """
+        if event_type := self._index.get(name):
+            return event_type
+        if name not in self._fallbacks:
+            self._fallbacks[name] = EventType(name=name, label=name.title())
+        return self._fallbacks[name]
+
+    def severity(self, name: str) -> int:
+        """
+        The severity of an event type, its position in the list starting at 1,
+        so later event types are more severe. 0 for unknown event types.
+        """
+        if event_type := self._index.get(name):
+            return self.events.index(event_type) + 1
+        return 0
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from django.db import IntegrityError, router, transaction
+from django.db.migrations import AddIndex
+from django.db.migrations.operations.base import Operation
+
+if TYPE_CHECKING:
+    from django.db.backends.base.base import BaseDatabaseWrapper
+    from django.db.backends.base.schema import BaseDatabaseSchemaEditor
+    from django.db.migrations.state import ProjectState
+    from django.db.models import Model
+
+# Text search config of the full-text index of `Event.message`, searched by
+# "@message" in the admin changelist.
+FULL_TEXT_CONFIG = "simple"
+FULL_TEXT_INDEX = "eventlog_event_message_fts"
+
+
+def upsert(
+    model: type[Model],
+    lookup: dict[str, Any],
+    update: dict[str, Any],
+    create: dict[str, Any],
+    *,
+    using: str | None = None,
+) -> None:
+    """
+    Update the row matching the `lookup`, or create it. `update` may use
+    expressions referring to the current values, e.g. `F("count") + 1`.
+
+    This is an UPDATE, followed by an INSERT within a savepoint if no row
+    matched. If another process inserted the row in the meantime, the UPDATE
+    is repeated.
+    """
+    using = using or router.db_for_write(model)
+    qs = model.objects.using(using).filter(**lookup)
+    if qs.update(**update):
+        return
+
+    try:
+        with transaction.atomic(using=using):
+            model.objects.using(using).create(**lookup, **create)
+    except IntegrityError:
+        qs.update(**update)
+
+
+class AddIndexConcurrently(AddIndex):
+    """
+    Like `AddIndex`, but creates the index with `CREATE INDEX CONCURRENTLY`
+    on PostgreSQL, which doesn't block writes to the table while the index is
+    built. The migration must be non-atomic (`atomic = False`).
+    """
+
+    def describe(self) -> str:
+        return f"Concurrently {super().describe().lower()}"
+
+    def database_forwards(
+        self,
+        app_label: str,
+        schema_editor: BaseDatabaseSchemaEditor,
+        from_state: ProjectState,
+        to_state: ProjectState,
+    ) -> None:
+        if schema_editor.connection.vendor != "postgresql":
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+            return
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            schema_editor.add_index(model, self.index, concurrently=True)
+
+    def database_backwards(
+        self,
+        app_label: str,
+        schema_editor: BaseDatabaseSchemaEditor,
+        from_state: ProjectState,
+        to_state: ProjectState,
+    ) -> None:
+        if schema_editor.connection.vendor != "postgresql":
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+            return
+        model = from_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            schema_editor.remove_index(model, self.index, concurrently=True)
+
+
+def full_text_index_sql(
+    table: str, column: str, name: str, *, concurrently: bool = False
+) -> str:
+    """
+    SQL creating a GIN index of the text search vector of a column. The
+    expression matches the `search` lookup with a `SearchQuery` using the
+    `FULL_TEXT_CONFIG`.
+    """
+    return (
+        f"CREATE INDEX {'CONCURRENTLY ' if concurrently else ''}"
+        f'IF NOT EXISTS "{name}" ON "{table}" USING gin '
+        f"(to_tsvector('{FULL_TEXT_CONFIG}'::regconfig, COALESCE(\"{column}\", '')))"
+    )
+
+
+def is_partitioned(connection: BaseDatabaseWrapper, table: str) -> bool:
+    """True if the PostgreSQL table is partitioned, see `eventlog_partition`."""
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT relkind FROM pg_class WHERE oid = %s::regclass", [table])
+        return cursor.fetchone()[0] == "p"
+
+
+class AddFullTextIndex(Operation):
+    """
+    Create the GIN index of `full_text_index_sql()` on PostgreSQL, without
+    blocking writes to the table (unless it's partitioned, which can't be
+    indexed concurrently). Other databases are skipped. The migration must be
+    non-atomic (`atomic = False`).
+
+    The index is not part of the model state, as the expression indexes of
+    `django.contrib.postgres` require a PostgreSQL driver on all databases.
+    """
+
+    reversible = True
+
+    def __init__(self, model_name: str, field_name: str, name: str) -> None:
+        self.model_name = model_name
+        self.field_name = field_name
+        self.name = name
+
+    def deconstruct(self) -> tuple[str, list, dict[str, str]]:
+        kwargs = {
+            "model_name": self.model_name,
+            "field_name": self.field_name,
+            "name": self.name,
+        }
+        return self.__class__.__name__, [], kwargs
+
+    def state_forwards(self, app_label: str, state: ProjectState) -> None:
+        pass
+
+    def database_forwards(
+        self,
+        app_label: str,
+        schema_editor: BaseDatabaseSchemaEditor,
+        from_state: ProjectState,
+        to_state: ProjectState,
+    ) -> None:
+        connection = schema_editor.connection
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if connection.vendor != "postgresql" or not self.allow_migrate_model(
+            connection.alias, model
+        ):
+            return
+        table = model._meta.db_table  # noqa: SLF001 Private member
+        column = model._meta.get_field(self.field_name).column  # noqa: SLF001 Private member
+        schema_editor.execute(
+            full_text_index_sql(
+                table,
+                column,
+                self.name,
+                concurrently=not is_partitioned(connection, table),
+            )
+        )
+
+    def database_backwards(
+        self,
+        app_label: str,
+        schema_editor: BaseDatabaseSchemaEditor,
+        from_state: ProjectState,
+        to_state: ProjectState,
+    ) -> None:
+        connection = schema_editor.connection
+        model = from_state.apps.get_model(app_label, self.model_name)
+        if connection.vendor != "postgresql" or not self.allow_migrate_model(
+            connection.alias, model
+        ):
+            return
+        table = model._meta.db_table  # noqa: SLF001 Private member
+        concurrently = "" if is_partitioned(connection, table) else "CONCURRENTLY "
+        schema_editor.execute(f'DROP INDEX {concurrently}IF EXISTS "{self.name}"')
+
+    def describe(self) -> str:
+        return (
+            f"Create full-text index {self.name} on field {self.field_name} "
+            f"of {self.model_name} (PostgreSQL only)"
+        )
+
+    @property
+    def migration_name_fragment(self) -> str:
+        return f"{self.model_name.lower()}_{self.name.lower()}"
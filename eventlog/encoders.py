@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import json
+import time
+from typing import TYPE_CHECKING, Any
+
+from django.apps import apps
+from django.core.serializers.json import DjangoJSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+if TYPE_CHECKING:
+    from .apps import EventLogConfig
+
+
+class EventDataEncoder(json.JSONEncoder):
+    """
+    JSON encoder of the `Event.data` field. It delegates to the encoder
+    defined in `EventLogConfig.data_encoder`.
+
+    Data which is not JSON serializable is stored as its string representation,
+    rather than failing upon a log entry. This way the data is serialized only
+    once, when it's written to the database.
+    """
+
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        config: EventLogConfig = apps.get_app_config("eventlog")
+        self.encoder = config.data_encoder(**kwargs)
+        self.metrics = config.get_metrics()
+
+    def encode(self, o: Any) -> str:
+        if self.metrics is None:
+            return self._encode(o)
+
+        start = time.perf_counter()
+        try:
+            return self._encode(o)
+        finally:
+            self.metrics.observe("serialize", time.perf_counter() - start)
+
+    def _encode(self, o: Any) -> str:
+        try:
+            return self.encoder.encode(o)
+        except (TypeError, ValueError):
+            if self.metrics is not None:
+                self.metrics.increment("serialize_fallbacks")
+            return self.encoder.encode(str(o))
+
+
+class OrjsonEncoder(DjangoJSONEncoder):
+    """
+    JSON encoder using `orjson`, if installed. Types not supported by orjson
+    are handled by the DjangoJSONEncoder.
+    """
+
+    def encode(self, o: Any) -> str:
+        if orjson is None:  # pragma: no cover
+            return super().encode(o)
+        return orjson.dumps(
+            o, default=self.default, option=orjson.OPT_NON_STR_KEYS
+        ).decode()
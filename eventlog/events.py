@@ -1,15 +1,24 @@
 from __future__ import annotations
 
-import json
-from typing import TYPE_CHECKING, Any, Callable
+import time
+from contextlib import asynccontextmanager, contextmanager
+from functools import partial
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, Iterator
 
+from asgiref.sync import sync_to_async
 from django.apps import apps
-from django.core.mail import send_mail as django_send_mail
-from django.utils.html import linebreaks
+from django.db import close_old_connections, transaction
+
+from .limits import enforce_limits
+from .mail import dispatch_mails, send_event_mail  # noqa: F401 Re-exported
+from .rollup import MODE_WRITE, update_rollups
+from .summary import update_summaries
+from .throttle import throttle
 
 if TYPE_CHECKING:
     from .apps import EventLogConfig
     from .datastructures import EventTypeList
+    from .metrics import MetricsCollector
     from .models import Event
 
 
@@ -20,18 +29,31 @@ class EventGroup:
     event_model: Event
     event_types: EventTypeList
     group_id: str
+    metrics: MetricsCollector | None
     send_mail: str | None = None
+    buffered: bool = False
 
     def __init__(
         self,
         send_mail: str | None = None,
         group_id: str | None = None,
+        buffered: bool = False,
     ) -> None:
         self.event_model = apps.get_model("eventlog", "Event")
         self.config = apps.get_app_config("eventlog")
         self.group_id = group_id or self.config.generate_group_id()
         self.event_types = self.config.get_event_types()
+        self.metrics = self.config.get_metrics()
         self.send_mail = send_mail
+        self.buffered = buffered
+
+        # Events (with their mail recipient, and the flush of the atomic block
+        # they were logged in) collected in buffered mode.
+        self._buffer: list[tuple[Event, str | None, _Commit | None]] = []
+        self._buffer_started: float = 0.0
+        # The on_commit() flush of each atomic block with buffered events,
+        # by the savepoints of the block.
+        self._commits: dict[tuple[str | None, ...], _Commit] = {}
 
         max_length = self.event_model._meta.get_field("group").max_length  # noqa: SLF001 Private member
         if len(self.group_id) > max_length:
@@ -39,15 +61,106 @@ class EventGroup:
             raise TypeError(msg)
 
     def __getattr__(self, attr: str) -> Callable:
+        """
+        Create the logging method for an event type, e.g. `e.info()`, or its
+        awaitable variant, e.g. `await e.ainfo()`.
+
+        The method is stored on the instance, so further lookups are plain
+        attribute access and don't call `__getattr__` again.
+        """
+        method: Callable
         if self.event_types.by_name(attr):
 
-            def f(*args: Any, **kwargs: Any) -> None:
+            def method(*args: Any, **kwargs: Any) -> None:
                 return self._log_event(attr, *args, **kwargs)
 
-            f.__name__ = attr
-            return f
-        err = f'Event type "{attr}" does not exist.'
-        raise TypeError(err)
+        # Awaitable variant of the event type, e.g. `await e.ainfo()`
+        elif attr.startswith("a") and self.event_types.by_name(attr[1:]):
+            event_type = attr[1:]
+
+            async def amethod(*args: Any, **kwargs: Any) -> None:
+                return await self._alog_event(event_type, *args, **kwargs)
+
+            method = amethod
+
+        else:
+            err = f'Event type "{attr}" does not exist.'
+            raise TypeError(err)
+
+        method.__name__ = attr
+        self.__dict__[attr] = method
+        return method
+
+    @contextmanager
+    def batch(self) -> Iterator[EventGroup]:
+        """
+        Buffer all events logged within this block and write them with
+        a single bulk INSERT once the block is left.
+        """
+        buffered = self.buffered
+        self.buffered = True
+        try:
+            yield self
+        finally:
+            self.buffered = buffered
+            self.flush()
+
+    @asynccontextmanager
+    async def abatch(self) -> AsyncIterator[EventGroup]:
+        """
+        Like `batch()`, for async code. The buffered events are written with
+        the async ORM once the block is left.
+        """
+        buffered = self.buffered
+        self.buffered = True
+        try:
+            yield self
+        finally:
+            self.buffered = buffered
+            await self.aflush()
+
+    def flush(self) -> None:
+        """Write all buffered events to the database."""
+        self._discard_rolled_back()
+        pending, self._buffer = self._buffer, []
+        if pending:
+            self._write([(event, mail) for event, mail, _ in pending])
+
+    async def aflush(self) -> None:
+        """Write all buffered events to the database."""
+        self._discard_rolled_back()
+        pending, self._buffer = self._buffer, []
+        if pending:
+            await self._awrite([(event, mail) for event, mail, _ in pending])
+
+    def _flush_committed(self) -> None:
+        """
+        Write the buffered events of committed atomic blocks. Events of other
+        blocks are kept until their own flush is called on commit.
+        """
+        self._commits = {
+            sids: commit
+            for sids, commit in self._commits.items()
+            if not commit.committed
+        }
+        pending = [entry for entry in self._buffer if _is_committed(entry)]
+        if pending:
+            self._buffer = [entry for entry in self._buffer if not _is_committed(entry)]
+            self._write([(event, mail) for event, mail, _ in pending])
+
+    def _discard_rolled_back(self) -> None:
+        """Drop the buffered events of atomic blocks which were rolled back."""
+        alive = {
+            sids: commit for sids, commit in self._commits.items() if commit.is_alive()
+        }
+        if len(alive) < len(self._commits):
+            self._commits = alive
+            commits = set(alive.values())
+            self._buffer = [
+                entry
+                for entry in self._buffer
+                if entry[2] is None or entry[2] in commits
+            ]
 
     def _log_event(
         self,
@@ -58,47 +171,266 @@ class EventGroup:
         data: Any | None = None,
     ) -> None:
         """Log a new event entry."""
+        if not (
+            built := self._build_event(event_type, message, initiator, send_mail, data)
+        ):
+            return
+        event_object, mail = built
+
+        if self.config.throttle_rate is not None and self._throttle(event_object):
+            return
 
-        # Make sure, the data is JSON serializable, otherwise store it as a string.
-        if data:
-            try:
-                json.dumps(data)
-            except TypeError:
-                data = str(data)
+        if self.buffered:
+            if self._buffer_event(event_object, mail):
+                self.flush()
+            return
+
+        self._write([(event_object, mail)])
+
+    async def _alog_event(
+        self,
+        event_type: str,
+        message: str,
+        initiator: str | None = None,
+        send_mail: str | None = None,
+        data: Any | None = None,
+    ) -> None:
+        """Log a new event entry, using the async ORM."""
+        if not (
+            built := self._build_event(event_type, message, initiator, send_mail, data)
+        ):
+            return
+        event_object, mail = built
+
+        if self.config.throttle_rate is not None and await sync_to_async(
+            self._throttle
+        )(event_object):
+            return
+
+        if self.buffered:
+            if self._buffer_event(event_object, mail):
+                await self.aflush()
+            return
+
+        await self._awrite([(event_object, mail)])
+
+    def _build_event(
+        self,
+        event_type: str,
+        message: str,
+        initiator: str | None,
+        send_mail: str | None,
+        data: Any | None,
+    ) -> tuple[Event, str | None] | None:
+        """
+        Create the (unsaved) event object and determine the email recipient.
+        Returns None if the event is rejected due to the payload limits.
+        """
+        if not (limited := enforce_limits(self.config, message, data)):
+            if self.metrics:
+                self.metrics.increment("rejected", event_type)
+            return None
+        message, data, truncated = limited
 
-        event_object = self.event_model.objects.create(
+        if self.metrics:
+            self.metrics.increment("events", event_type)
+            if truncated:
+                self.metrics.increment("truncated", event_type)
+
+        # The timestamp is set upon creation of the object, so buffered
+        # events keep the time they were logged, not the time they were written.
+        event_object = self.event_model(
             type=event_type,
             group=self.group_id,
             message=message,
             data=data,
             initiator=initiator,
+            truncated=truncated,
         )
 
         # Mail this event per email. Either if this method has it enabled,
         # or if its globally enabled for the EventGroup.
-        mail = send_mail or self.send_mail
-        if mail:
-            self._send_mail(mail, event_object)
-
-    def _send_mail(self, email: str, event_object: Event) -> None:
-        """Send a simple HTML email to the recipient defined in :email:."""
-
-        context = {
-            "type": self.event_types.by_name(event_object.type),
-            "message": event_object.message,
-            "data": event_object.data,
-            "initiator": event_object.initiator,
-            "date": event_object.timestamp,
-        }
-        subject = self.config.email_subject_template.format(**context)
-        text_message = self.config.email_template.format(**context)
-        html_message = f"<html><body>{linebreaks(text_message)}</body></html>"
-
-        django_send_mail(
-            subject=subject,
-            message=text_message,
-            html_message=html_message,
-            recipient_list=[email],
-            from_email=self.config.email_from,
-            fail_silently=self.config.email_fail_silently,
+        return event_object, send_mail or self.send_mail
+
+    def _throttle(self, event_object: Event) -> bool:
+        """
+        Returns True if the event exceeds the throttle rate and is dropped,
+        or collapsed into an earlier (possibly buffered) event.
+        """
+        if not throttle(self.config, event_object, (e for e, _, _ in self._buffer)):
+            return False
+        if self.metrics:
+            self.metrics.increment("throttled", event_object.type)
+        return True
+
+    def _write(self, pending: list[tuple[Event, str | None]]) -> None:
+        """Write events directly, or hand them over to the write-behind queue."""
+        if writer := self.config.get_event_writer():
+            for item in pending:
+                writer.put(item)
+        elif self.config.autonomous_writes:
+            write_events_autonomously(pending)
+        else:
+            write_events(pending)
+
+    async def _awrite(self, pending: list[tuple[Event, str | None]]) -> None:
+        """Write events directly, or hand them over to the write-behind queue."""
+        if writer := self.config.get_event_writer():
+            for item in pending:
+                await writer.aput(item)
+        elif self.config.autonomous_writes:
+            await sync_to_async(write_events_autonomously)(pending)
+        else:
+            await awrite_events(pending)
+
+    def _buffer_event(self, event_object: Event, mail: str | None) -> bool:
+        """
+        Add an event to the buffer. Returns True if the size or time limit
+        is reached, and the buffer should be flushed. If called within a
+        transaction, the buffer is flushed at the latest once the transaction
+        is committed, and discarded if it's rolled back.
+        """
+        commit = None
+        using = self.config.get_database()
+        connection = transaction.get_connection(using)
+        if self._commits:
+            self._discard_rolled_back()
+        if connection.in_atomic_block:
+            # One flush per atomic block; if the block is rolled back, Django
+            # drops it, and its events are discarded with it.
+            sids = tuple(connection.savepoint_ids)
+            if not (commit := self._commits.get(sids)):
+                commit = self._commits[sids] = _Commit(self, using)
+                transaction.on_commit(commit, using=using)
+
+        if not self._buffer:
+            self._buffer_started = time.monotonic()
+        self._buffer.append((event_object, mail, commit))
+
+        timeout = self.config.buffer_timeout
+        return len(self._buffer) >= self.config.buffer_size or (
+            timeout is not None and time.monotonic() - self._buffer_started >= timeout
         )
+
+
+class _Commit:
+    """
+    The flush of the events buffered in one atomic block, registered with
+    `on_commit()`. Django drops it if the block is rolled back.
+    """
+
+    def __init__(self, group: EventGroup, using: str) -> None:
+        self.group = group
+        self.using = using
+        self.committed = False
+
+    def __call__(self) -> None:
+        self.committed = True
+        self.group._flush_committed()  # noqa: SLF001 Private member
+
+    def is_alive(self) -> bool:
+        """False once the block, or a block enclosing it, is rolled back."""
+        if self.committed:
+            return True
+        connection = transaction.get_connection(self.using)
+        return any(func is self for _, func, _ in connection.run_on_commit)
+
+
+def _is_committed(entry: tuple[Event, str | None, _Commit | None]) -> bool:
+    return entry[2] is None or entry[2].committed
+
+
+def write_events(pending: list[tuple[Event, str | None]]) -> None:
+    """
+    Write a list of (event, email) tuples to the database and send the
+    email notifications, if an email is given.
+    """
+    config: EventLogConfig = apps.get_app_config("eventlog")
+    metrics = config.get_metrics()
+    using = config.get_database()
+    start = time.perf_counter() if metrics else 0.0
+    try:
+        if len(pending) == 1:
+            pending[0][0].save(using=using)
+        else:
+            event_model = apps.get_model("eventlog", "Event")
+            event_model.objects.using(using).bulk_create(
+                [event for event, _ in pending]
+            )
+    except Exception:
+        if metrics:
+            metrics.increment("write_failures", count=len(pending))
+        raise
+    if metrics:
+        metrics.observe("write", time.perf_counter() - start)
+
+    if config.group_summary:
+        update_summaries((event for event, _ in pending), using)
+    if config.rollup == MODE_WRITE:
+        # Once committed, so the rollup rows are not locked until the end of
+        # the caller's transaction.
+        events = [event for event, _ in pending]
+        transaction.on_commit(partial(update_rollups, events, using), using=using)
+
+    if mails := [(mail, event_object) for event_object, mail in pending if mail]:
+        dispatch_mails(mails)
+
+
+async def awrite_events(pending: list[tuple[Event, str | None]]) -> None:
+    """
+    Write a list of (event, email) tuples to the database using the async ORM.
+
+    Django has no async email API, so emails are sent in a thread.
+    """
+    config: EventLogConfig = apps.get_app_config("eventlog")
+    metrics = config.get_metrics()
+    using = config.get_database()
+    start = time.perf_counter() if metrics else 0.0
+    try:
+        if len(pending) == 1:
+            await pending[0][0].asave(using=using)
+        else:
+            event_model = apps.get_model("eventlog", "Event")
+            await event_model.objects.using(using).abulk_create(
+                [event for event, _ in pending]
+            )
+    except Exception:
+        if metrics:
+            metrics.increment("write_failures", count=len(pending))
+        raise
+    if metrics:
+        metrics.observe("write", time.perf_counter() - start)
+
+    if config.group_summary:
+        await sync_to_async(update_summaries)([event for event, _ in pending], using)
+    if config.rollup == MODE_WRITE:
+        events = [event for event, _ in pending]
+        await sync_to_async(transaction.on_commit)(
+            partial(update_rollups, events, using), using=using
+        )
+
+    if mails := [(mail, event_object) for event_object, mail in pending if mail]:
+        await sync_to_async(dispatch_mails)(mails)
+
+
+def write_events_autonomously(pending: list[tuple[Event, str | None]]) -> None:
+    """
+    Write a list of (event, email) tuples outside the transaction of the
+    calling thread, so they are kept if the transaction is rolled back.
+
+    Within an atomic block, the events are written by a separate thread,
+    which uses its own database connection, and the caller waits for it.
+    """
+    config: EventLogConfig = apps.get_app_config("eventlog")
+    if not transaction.get_connection(config.get_database()).in_atomic_block:
+        write_events(pending)
+        return
+
+    config.get_autonomous_executor().submit(_write_in_thread, pending).result()
+
+
+def _write_in_thread(pending: list[tuple[Event, str | None]]) -> None:
+    try:
+        write_events(pending)
+    finally:
+        close_old_connections()
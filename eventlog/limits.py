@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import threading
+from logging import getLogger
+from typing import TYPE_CHECKING, Any
+
+from .encoders import EventDataEncoder
+
+if TYPE_CHECKING:
+    from .apps import EventLogConfig
+
+logger = getLogger(__name__)
+
+POLICY_TRUNCATE = "truncate"
+POLICY_SUMMARIZE = "summarize"
+POLICY_REJECT = "reject"
+POLICIES = (POLICY_TRUNCATE, POLICY_SUMMARIZE, POLICY_REJECT)
+
+# Placeholder for data nested deeper than the allowed depth.
+TRUNCATED = "..."
+
+
+class TruncationStats:
+    """Counts the events which exceeded a payload limit."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.messages = 0
+            self.data = 0
+            self.rejected = 0
+
+    def count(self, *, messages: int = 0, data: int = 0, rejected: int = 0) -> None:
+        with self._lock:
+            self.messages += messages
+            self.data += data
+            self.rejected += rejected
+
+    def as_dict(self) -> dict[str, int]:
+        return {
+            "messages": self.messages,
+            "data": self.data,
+            "rejected": self.rejected,
+        }
+
+
+stats = TruncationStats()
+
+
+def enforce_limits(
+    config: EventLogConfig, message: str, data: Any
+) -> tuple[str, Any, bool] | None:
+    """
+    Apply the payload limits defined in the config to the message and data.
+
+    Returns a tuple of (message, data, truncated), or None if the event
+    exceeds a limit and must be rejected.
+    """
+    policy = config.oversize_policy
+    if policy not in POLICIES:
+        msg = f"oversize_policy must be one of {', '.join(POLICIES)}"
+        raise TypeError(msg)
+
+    message_truncated = data_truncated = False
+
+    max_message_bytes = config.max_message_bytes
+    if max_message_bytes is not None:
+        encoded = message.encode()
+        if len(encoded) > max_message_bytes:
+            message_truncated = True
+            message = encoded[:max_message_bytes].decode(errors="ignore")
+
+    if data is not None and config.max_data_depth is not None:
+        data, data_truncated = _limit_depth(data, config.max_data_depth)
+
+    max_data_bytes = config.max_data_bytes
+    if data is not None and max_data_bytes is not None:
+        serialized = EventDataEncoder().encode(data)
+        size = len(serialized.encode())
+        if size > max_data_bytes:
+            data_truncated = True
+            if policy == POLICY_SUMMARIZE:
+                data = _summarize(data, size)
+            else:
+                data = serialized.encode()[:max_data_bytes].decode(errors="ignore")
+
+    if not (message_truncated or data_truncated):
+        return message, data, False
+
+    if policy == POLICY_REJECT:
+        stats.count(rejected=1)
+        logger.warning("Event rejected, it exceeds the payload limits.")
+        return None
+
+    stats.count(messages=int(message_truncated), data=int(data_truncated))
+    return message, data, True
+
+
+def _limit_depth(data: Any, depth: int) -> tuple[Any, bool]:
+    """
+    Replace containers nested deeper than `depth` with a placeholder.
+    Returns the new data and whether anything was replaced.
+    """
+    if not isinstance(data, (dict, list, tuple)):
+        return data, False
+    if depth <= 0:
+        return TRUNCATED, True
+
+    truncated = False
+    if isinstance(data, dict):
+        limited = {}
+        for key, value in data.items():
+            limited[key], value_truncated = _limit_depth(value, depth - 1)
+            truncated = truncated or value_truncated
+        return limited, truncated
+
+    items = []
+    for value in data:
+        item, value_truncated = _limit_depth(value, depth - 1)
+        items.append(item)
+        truncated = truncated or value_truncated
+    return items, truncated
+
+
+def _summarize(data: Any, size: int) -> dict[str, Any]:
+    """A short summary of data which exceeds the size limit."""
+    summary: dict[str, Any] = {
+        "summary": True,
+        "type": type(data).__name__,
+        "bytes": size,
+    }
+    if isinstance(data, dict):
+        summary["keys"] = [str(key) for key in list(data)[:20]]
+    elif isinstance(data, (list, tuple, str)):
+        summary["length"] = len(data)
+    return summary
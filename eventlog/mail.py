@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING
+
+from django.apps import apps
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.utils.html import linebreaks
+
+if TYPE_CHECKING:
+    from .apps import EventLogConfig
+    from .models import Event
+
+
+def dispatch_mails(pending: list[tuple[str, Event]]) -> None:
+    """
+    Send the email notifications of a list of (email, event) tuples, or hand
+    them over to the mail queue, if enabled.
+    """
+    config: EventLogConfig = apps.get_app_config("eventlog")
+    if dispatcher := config.get_mail_dispatcher():
+        for item in pending:
+            dispatcher.put(item)
+    else:
+        send_event_mails(pending)
+
+
+def send_event_mail(email: str, event_object: Event) -> None:
+    """Send a simple HTML email to the recipient defined in :email:."""
+    send_event_mails([(email, event_object)])
+
+
+def send_event_mails(pending: list[tuple[str, Event]]) -> None:
+    """
+    Send the email notifications of a list of (email, event) tuples over a
+    single connection. In digest mode, all events for the same recipient
+    are combined into one email.
+    """
+    config: EventLogConfig = apps.get_app_config("eventlog")
+
+    recipients: dict[str, list[Event]] = {}
+    if config.mail_digest_window is not None:
+        for email, event_object in pending:
+            recipients.setdefault(email, []).append(event_object)
+        messages = [
+            (build_mail(email, events), events) for email, events in recipients.items()
+        ]
+    else:
+        messages = [
+            (build_mail(email, [event_object]), [event_object])
+            for email, event_object in pending
+        ]
+
+    metrics = config.get_metrics()
+    with get_connection(fail_silently=config.email_fail_silently) as connection:
+        for message, events in messages:
+            start = time.perf_counter() if metrics else 0.0
+            try:
+                sent = connection.send_messages([message])
+            except Exception:
+                if metrics:
+                    for event_object in events:
+                        metrics.increment("mail_failures", event_object.type)
+                raise
+            if metrics:
+                metrics.observe("mail", time.perf_counter() - start)
+                for event_object in events:
+                    metrics.increment(
+                        "mails" if sent else "mail_failures", event_object.type
+                    )
+
+
+def build_mail(email: str, events: list[Event]) -> EmailMultiAlternatives:
+    """
+    The email for one event, or the digest email for multiple events, using
+    the templates defined in the config.
+    """
+    config: EventLogConfig = apps.get_app_config("eventlog")
+    event_types = config.get_event_types()
+    subject_template, template, digest_subject_template = config.get_mail_templates()
+
+    bodies = []
+    for event_object in events:
+        event_type = event_types.by_name_or_fallback(event_object.type)
+        context = {
+            "type": event_type,
+            "type_label": event_type.label,
+            "message": event_object.message,
+            "data": event_object.data,
+            "initiator": event_object.initiator,
+            "date": event_object.timestamp,
+        }
+        bodies.append(template(**context))
+
+    if len(events) == 1:
+        subject = subject_template(**context)
+    else:
+        subject = digest_subject_template(count=len(events))
+
+    text_message = "\n\n----\n\n".join(bodies)
+    html_message = f"<html><body>{linebreaks(text_message)}</body></html>"
+
+    message = EmailMultiAlternatives(
+        subject=subject,
+        body=text_message,
+        from_email=config.email_from,
+        to=[email],
+    )
+    message.attach_alternative(html_message, "text/html")
+    return message
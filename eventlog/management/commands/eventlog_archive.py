@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import TYPE_CHECKING, Any
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from eventlog.archive import archive_events
+
+if TYPE_CHECKING:
+    from argparse import ArgumentParser
+
+
+class Command(BaseCommand):
+    help = (
+        "Move events older than the given number of days from the database "
+        "into compressed archive files, stored in EventLogConfig.archive_storage."
+    )
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            "--older-than",
+            type=int,
+            required=True,
+            metavar="DAYS",
+            help="Archive all events of the days before this number of days.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="Number of events read and deleted per query. Default: 1000",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        before = timezone.now() - timedelta(days=options["older_than"])
+        results = archive_events(before, chunk_size=options["chunk_size"])
+
+        for day, count in results.items():
+            self.stdout.write(f"{day}: {count} events archived.")
+        if not results:
+            self.stdout.write("No events to archive.")
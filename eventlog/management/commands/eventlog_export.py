@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import gzip
+import sys
+from typing import TYPE_CHECKING, Any
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_datetime
+
+from eventlog.transfer import CSV, FORMATS, JSONL, dump_events, export_events
+
+if TYPE_CHECKING:
+    from argparse import ArgumentParser
+    from datetime import datetime
+
+
+def datetime_argument(value: str) -> datetime:
+    dt = parse_datetime(value)
+    if dt is None:
+        msg = f"Invalid datetime '{value}', use ISO 8601."
+        raise CommandError(msg)
+    return dt
+
+
+class Command(BaseCommand):
+    help = "Export events as JSON Lines or CSV, ordered by timestamp."
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            "-o",
+            "--output",
+            default="-",
+            help=("Output file. Files ending with .gz are compressed. Default: stdout"),
+        )
+        parser.add_argument(
+            "--format",
+            choices=FORMATS,
+            help="Output format. Default: Derived from the file name, or jsonl.",
+        )
+        parser.add_argument(
+            "--gzip", action="store_true", help="Compress the output with gzip."
+        )
+        parser.add_argument(
+            "--since",
+            type=datetime_argument,
+            help="Only export events at or after this ISO 8601 datetime.",
+        )
+        parser.add_argument(
+            "--until",
+            type=datetime_argument,
+            help="Only export events before this ISO 8601 datetime.",
+        )
+        parser.add_argument("--group", help="Only export events of this group.")
+        parser.add_argument(
+            "--type",
+            action="append",
+            dest="types",
+            help="Only export events of this type. Can be given multiple times.",
+        )
+        parser.add_argument(
+            "--after",
+            metavar="TIMESTAMP,ID",
+            help=(
+                "Resume an export after the event with this timestamp and id, "
+                "as printed at the end of a previous export."
+            ),
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=2000,
+            help="Number of events fetched per query. Default: 2000",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        output = options["output"]
+        compress = options["gzip"] or output.endswith(".gz")
+        fmt = options["format"] or (
+            CSV if output.endswith((".csv", ".csv.gz")) else JSONL
+        )
+
+        after = None
+        if options["after"]:
+            timestamp, _, pk = options["after"].rpartition(",")
+            if not pk.isdigit():
+                msg = "Invalid checkpoint, use --after TIMESTAMP,ID."
+                raise CommandError(msg)
+            after = (datetime_argument(timestamp), int(pk))
+
+        events = export_events(
+            since=options["since"],
+            until=options["until"],
+            group=options["group"],
+            types=options["types"],
+            after=after,
+            chunk_size=options["chunk_size"],
+        )
+
+        if output == "-" and not compress:
+            self.stdout.ending = ""
+            last = dump_events(events, self.stdout, fmt)
+        elif compress:
+            target = sys.stdout.buffer if output == "-" else output
+            with gzip.open(target, "wt", newline="", encoding="utf-8") as stream:
+                last = dump_events(events, stream, fmt)
+        else:
+            with open(output, "w", newline="", encoding="utf-8") as stream:  # noqa: PTH123 open()
+                last = dump_events(events, stream, fmt)
+
+        if last:
+            self.stderr.write(
+                "Export complete. Resume with "
+                f"--after {last['timestamp'].isoformat()},{last['id']}"
+            )
+        else:
+            self.stderr.write("No events exported.")
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import gzip
+import sys
+from typing import TYPE_CHECKING, Any
+
+from django.core.management.base import BaseCommand
+
+from eventlog.transfer import CSV, FORMATS, JSONL, import_events, load_events
+
+if TYPE_CHECKING:
+    from argparse import ArgumentParser
+
+
+class Command(BaseCommand):
+    help = (
+        "Import events from JSON Lines or CSV files, as written by the "
+        "eventlog_export command. The original timestamps are kept."
+    )
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            "files",
+            nargs="+",
+            metavar="FILE",
+            help="Files to import. Files ending with .gz are decompressed. "
+            "Use '-' for stdin.",
+        )
+        parser.add_argument(
+            "--format",
+            choices=FORMATS,
+            help="Input format. Default: Derived from the file name, or jsonl.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of events inserted per query. Default: 1000",
+        )
+        parser.add_argument(
+            "--atomic",
+            action="store_true",
+            help="Insert each batch in its own transaction.",
+        )
+        parser.add_argument(
+            "--skip-duplicates",
+            action="store_true",
+            help=(
+                "Skip events with the same group, timestamp, type and message "
+                "as an existing event."
+            ),
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        for name in options["files"]:
+            fmt = options["format"] or (
+                CSV if name.endswith((".csv", ".csv.gz")) else JSONL
+            )
+
+            if name == "-":
+                results = self.import_stream(sys.stdin, fmt, options)
+            elif name.endswith(".gz"):
+                with gzip.open(name, "rt", newline="", encoding="utf-8") as stream:
+                    results = self.import_stream(stream, fmt, options)
+            else:
+                with open(name, newline="", encoding="utf-8") as stream:  # noqa: PTH123 open()
+                    results = self.import_stream(stream, fmt, options)
+
+            self.stdout.write(
+                f"{name}: {results['imported']} events imported, "
+                f"{results['skipped']} duplicates skipped."
+            )
+
+    def import_stream(
+        self, stream: Any, fmt: str, options: dict[str, Any]
+    ) -> dict[str, int]:
+        return import_events(
+            load_events(stream, fmt),
+            batch_size=options["batch_size"],
+            atomic=options["atomic"],
+            skip_duplicates=options["skip_duplicates"],
+        )
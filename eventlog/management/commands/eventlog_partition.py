@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import TYPE_CHECKING, Any
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from eventlog import partitions
+
+if TYPE_CHECKING:
+    from argparse import ArgumentParser
+
+
+class Command(BaseCommand):
+    help = (
+        "Manage the time based partitions of the event table (PostgreSQL only). "
+        "Creates partitions ahead of time and drops expired ones."
+    )
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        config = apps.get_app_config("eventlog")
+        parser.add_argument(
+            "--interval",
+            choices=partitions.INTERVALS,
+            default=config.partition_interval,
+            help=f"Partition interval. Default: {config.partition_interval}",
+        )
+        parser.add_argument(
+            "--ahead",
+            type=int,
+            default=config.partition_ahead,
+            help=(
+                "Number of future partitions to create. "
+                f"Default: {config.partition_ahead}"
+            ),
+        )
+        parser.add_argument(
+            "--drop-before",
+            type=int,
+            metavar="DAYS",
+            help="Drop partitions only holding events older than DAYS days.",
+        )
+        parser.add_argument(
+            "--setup",
+            action="store_true",
+            help=(
+                "Print the SQL statements to convert the existing event table "
+                "into a partitioned table. Review and run them manually."
+            ),
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        now = timezone.now()
+        interval = options["interval"]
+
+        try:
+            if options["setup"]:
+                for sql in partitions.setup_sql(now, interval):
+                    self.stdout.write(f"{sql};")
+                return
+
+            for name in partitions.create_partitions(now, interval, options["ahead"]):
+                self.stdout.write(f"Partition {name} exists.")
+
+            if options["drop_before"] is not None:
+                before = now - timedelta(days=options["drop_before"])
+                for name in partitions.drop_partitions(before):
+                    self.stdout.write(f"Partition {name} dropped.")
+        except TypeError as e:
+            raise CommandError(e) from e
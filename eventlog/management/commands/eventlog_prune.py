@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+from eventlog.prune import DEFAULT, prune_events
+
+if TYPE_CHECKING:
+    from argparse import ArgumentParser
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete events older than their retention period. The retention is "
+        "defined in EventLogConfig.retention, per event type."
+    )
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            "--keep",
+            action="append",
+            default=[],
+            metavar="TYPE=DAYS",
+            help=(
+                "Number of days to keep events of this type, or 'forever'. "
+                f"Use '{DEFAULT}' for all other types. Overrides the config "
+                "and can be given multiple times."
+            ),
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="Number of events deleted per query. Default: 1000",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=0,
+            help="Seconds to pause between two chunks. Default: 0",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only count the events which would be deleted.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        retention = dict(apps.get_app_config("eventlog").get_retention())
+        for rule in options["keep"]:
+            name, _, days = rule.partition("=")
+            if days == "forever":
+                retention[name] = None
+            elif days.isdigit():
+                retention[name] = int(days)
+            else:
+                msg = f"Invalid retention '{rule}', use TYPE=DAYS or TYPE=forever."
+                raise CommandError(msg)
+
+        if not any(days is not None for days in retention.values()):
+            self.stdout.write("No retention defined, all events are kept.")
+            return
+
+        results = prune_events(
+            retention,
+            chunk_size=options["chunk_size"],
+            sleep=options["sleep"],
+            dry_run=options["dry_run"],
+            progress=self.progress if options["verbosity"] > 1 else None,
+        )
+
+        verb = "would be deleted" if options["dry_run"] else "deleted"
+        for name, count in results.items():
+            self.stdout.write(f"{name}: {count} events {verb}.")
+
+    def progress(self, name: str, count: int) -> None:
+        self.stdout.write(f"{name}: {count} events deleted so far...")
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from django.core.management.base import BaseCommand
+
+from eventlog.summary import rebuild_summaries
+
+if TYPE_CHECKING:
+    from argparse import ArgumentParser
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete all event group summaries and create them from the existing "
+        "events. See EventLogConfig.group_summary."
+    )
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of summaries inserted per query. Default: 1000",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        count = rebuild_summaries(batch_size=options["batch_size"])
+        self.stdout.write(f"{count} group summaries created.")
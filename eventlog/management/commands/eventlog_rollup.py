@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+from eventlog.rollup import MODE_COMMAND, MODE_WRITE, rollup_events
+
+if TYPE_CHECKING:
+    from argparse import ArgumentParser
+
+
+class Command(BaseCommand):
+    help = (
+        "Count the events written since the last run per minute and type. "
+        "See EventLogConfig.rollup."
+    )
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=10_000,
+            help="Number of event ids counted per query. Default: 10000",
+        )
+        parser.add_argument(
+            "--rebuild",
+            action="store_true",
+            help="Delete all rollups and count all events.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        mode = apps.get_app_config("eventlog").rollup
+        if mode == MODE_WRITE and not options["rebuild"]:
+            msg = "Rollups are updated when events are written, use --rebuild."
+            raise CommandError(msg)
+        if mode not in (MODE_WRITE, MODE_COMMAND):
+            msg = (
+                f"Rollups are disabled, set EventLogConfig.rollup to '{MODE_COMMAND}'."
+            )
+            raise CommandError(msg)
+
+        count = rollup_events(
+            chunk_size=options["chunk_size"], rebuild=options["rebuild"]
+        )
+        self.stdout.write(f"{count} events counted.")
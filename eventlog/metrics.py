@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import threading
+from typing import Protocol
+
+
+class MetricsCollector(Protocol):
+    """
+    Interface of the class set in `EventLogConfig.metrics_class`. Both
+    methods are called by the logging threads and must be thread-safe.
+    """
+
+    def increment(self, name: str, event_type: str = "", count: int = 1) -> None:
+        """Increase a counter, e.g. "events" or "write_failures"."""
+
+    def observe(self, name: str, seconds: float) -> None:
+        """Record the duration of an operation, e.g. "write" or "mail"."""
+
+
+# Counters and timings recorded by django-eventlog.
+COUNTERS = {
+    "events": "Events logged, per type.",
+    "truncated": "Events truncated due to the payload limits, per type.",
+    "rejected": "Events rejected due to the payload limits, per type.",
+    "throttled": "Events dropped or collapsed due to the throttle rate, per type.",
+    "serialize_fallbacks": "Event data stored as a string, as it's not serializable.",
+    "write_failures": "Events which failed to be written.",
+    "mails": "Email notifications sent, per type.",
+    "mail_failures": "Email notifications which failed to be sent, per type.",
+}
+TIMINGS = {
+    "serialize": "Serialization of event data.",
+    "write": "INSERT of a single event or a batch of events.",
+    "mail": "Sending of an email notification.",
+}
+
+
+class InMemoryMetrics:
+    """
+    Aggregates counters and timings in memory, per process. Expose them in
+    the Prometheus text format with `eventlog.views.metrics_view`.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.counters: dict[tuple[str, str], int] = {}
+            # Number, sum and maximum of the recorded durations.
+            self.timings: dict[str, list[float]] = {}
+
+    def increment(self, name: str, event_type: str = "", count: int = 1) -> None:
+        with self._lock:
+            key = (name, event_type)
+            self.counters[key] = self.counters.get(key, 0) + count
+
+    def observe(self, name: str, seconds: float) -> None:
+        with self._lock:
+            timing = self.timings.setdefault(name, [0, 0.0, 0.0])
+            timing[0] += 1
+            timing[1] += seconds
+            timing[2] = max(timing[2], seconds)
+
+    def as_dict(self) -> dict[str, dict[str, float]]:
+        """E.g. {"events": {"info": 3}, "write": {"count": 3, "sum": 0.1, ...}}"""
+        with self._lock:
+            result: dict[str, dict[str, float]] = {}
+            for (name, event_type), count in sorted(self.counters.items()):
+                result.setdefault(name, {})[event_type] = count
+            for name, (count, total, maximum) in sorted(self.timings.items()):
+                result[name] = {"count": count, "sum": total, "max": maximum}
+            return result
+
+    def as_prometheus(self) -> str:
+        """The metrics in the Prometheus text exposition format."""
+        metrics = self.as_dict()
+        lines = []
+        for name, help_text in COUNTERS.items():
+            if name not in metrics:
+                continue
+            lines += [
+                f"# HELP eventlog_{name}_total {help_text}",
+                f"# TYPE eventlog_{name}_total counter",
+            ]
+            for event_type, count in metrics[name].items():
+                labels = f'{{type="{event_type}"}}' if event_type else ""
+                lines.append(f"eventlog_{name}_total{labels} {count}")
+        for name, help_text in TIMINGS.items():
+            if name not in metrics:
+                continue
+            lines += [
+                f"# HELP eventlog_{name}_seconds {help_text}",
+                f"# TYPE eventlog_{name}_seconds summary",
+                f"eventlog_{name}_seconds_count {metrics[name]['count']}",
+                f"eventlog_{name}_seconds_sum {metrics[name]['sum']}",
+            ]
+        return "\n".join(lines) + "\n"
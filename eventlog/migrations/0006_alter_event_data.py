@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:43
+
+import eventlog.encoders
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eventlog', '0005_alter_event_timestamp'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='event',
+            name='data',
+            field=models.JSONField(blank=True, encoder=eventlog.encoders.EventDataEncoder, null=True, verbose_name='Data'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eventlog', '0006_alter_event_data'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='truncated',
+            field=models.BooleanField(default=False, verbose_name='Truncated'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:49
+
+from django.db import migrations, models
+
+from eventlog.db import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+    # Builds the index without blocking writes on PostgreSQL, which can't be
+    # done within a transaction.
+    atomic = False
+
+    dependencies = [
+        ('eventlog', '0007_event_truncated'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='event',
+            index=models.Index(fields=['type', 'timestamp'], name='eventlog_ev_type_6d82d2_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eventlog', '0008_event_type_timestamp_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='last_seen',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Last seen'),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='occurrences',
+            field=models.PositiveIntegerField(default=1, verbose_name='Occurrences'),
+        ),
+    ]
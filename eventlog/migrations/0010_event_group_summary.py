@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eventlog', '0009_event_occurrences'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventGroupSummary',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('group', models.CharField(max_length=40, unique=True, verbose_name='Event Group')),
+                ('event_count', models.PositiveIntegerField(default=0, verbose_name='Events')),
+                ('first_timestamp', models.DateTimeField(verbose_name='First event')),
+                ('last_timestamp', models.DateTimeField(db_index=True, verbose_name='Last event')),
+                ('last_type', models.CharField(max_length=50, verbose_name='Last event type')),
+                ('last_message', models.TextField(verbose_name='Last message')),
+                ('worst_type', models.CharField(max_length=50, verbose_name='Worst event type')),
+                ('severity', models.PositiveSmallIntegerField(default=0, verbose_name='Severity')),
+            ],
+            options={
+                'verbose_name': 'Event Group',
+                'verbose_name_plural': 'Event Groups',
+                'ordering': ('-last_timestamp',),
+                'indexes': [models.Index(fields=['severity', 'last_timestamp'], name='eventlog_ev_severit_ba943a_idx')],
+            },
+        ),
+    ]
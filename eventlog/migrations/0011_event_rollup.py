@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eventlog', '0010_event_group_summary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventRollupWatermark',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('last_event_id', models.BigIntegerField(default=0, verbose_name='Last event id')),
+            ],
+            options={
+                'verbose_name': 'Event Rollup Watermark',
+                'verbose_name_plural': 'Event Rollup Watermarks',
+            },
+        ),
+        migrations.CreateModel(
+            name='EventRollup',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket', models.DateTimeField(verbose_name='Minute')),
+                ('type', models.CharField(max_length=50, verbose_name='Event Type')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='Events')),
+            ],
+            options={
+                'verbose_name': 'Event Rollup',
+                'verbose_name_plural': 'Event Rollups',
+                'ordering': ('-bucket', 'type'),
+                'constraints': [models.UniqueConstraint(fields=('bucket', 'type'), name='eventlog_rollup_bucket_type')],
+            },
+        ),
+    ]
@@ -0,0 +1,21 @@
+from django.db import migrations
+
+from eventlog.db import AddFullTextIndex
+
+
+class Migration(migrations.Migration):
+    # Builds the index without blocking writes on PostgreSQL, which can't be
+    # done within a transaction.
+    atomic = False
+
+    dependencies = [
+        ('eventlog', '0011_event_rollup'),
+    ]
+
+    operations = [
+        AddFullTextIndex(
+            model_name='event',
+            field_name='message',
+            name='eventlog_event_message_fts',
+        ),
+    ]
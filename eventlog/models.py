@@ -6,11 +6,10 @@ from typing import TYPE_CHECKING
 
 from django.apps import apps
 from django.db import models
-from django.utils.decorators import method_decorator
-from django.utils.safestring import mark_safe
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
-from .datastructures import EventType
+from .encoders import EventDataEncoder
 
 if TYPE_CHECKING:
     from .apps import EventLogConfig
@@ -19,45 +18,121 @@ if TYPE_CHECKING:
 logger = getLogger(__name__)
 config: EventLogConfig = apps.get_app_config("eventlog")
 
+# Group ids generated by `EventLogConfig.generate_group_id()`
+UUID_RE = re.compile(r"[a-f0-9]{32}")
+
 
 class Event(models.Model):
     """Event log model."""
 
     type = models.CharField(_("Event Type"), max_length=50)
     group = models.CharField(_("Event Group"), max_length=40, db_index=True)
-    timestamp = models.DateTimeField(_("Timestamp"), auto_now_add=True)
+    timestamp = models.DateTimeField(
+        _("Timestamp"), default=timezone.now, editable=False
+    )
     message = models.TextField(_("Message"))
-    data = models.JSONField(_("Data"), blank=True, null=True)
+    data = models.JSONField(_("Data"), blank=True, null=True, encoder=EventDataEncoder)
     initiator = models.CharField(  # noqa: DJ001 avoid null=True on CharFields
         _("Initiator"),
         max_length=500,
         blank=True,
         null=True,
     )
+    truncated = models.BooleanField(_("Truncated"), default=False)
+
+    # Repetitions collapsed into this event, see `EventLogConfig.throttle_mode`.
+    occurrences = models.PositiveIntegerField(_("Occurrences"), default=1)
+    last_seen = models.DateTimeField(_("Last seen"), blank=True, null=True)
 
     class Meta:
         ordering = ("-timestamp",)
         indexes = (
             models.Index(fields=["group", "timestamp"]),
             models.Index(fields=["timestamp"]),
+            models.Index(fields=["type", "timestamp"]),
         )
         verbose_name = _("Event Log")
         verbose_name_plural = _("Event Logs")
 
     def __str__(self) -> str:
         # If this is an UUID, shorten it to the first 8 characters
-        if re.match(r"[a-f0-9]{32}", str(self.group)):
+        if UUID_RE.match(str(self.group)):
             return self.group[:8]
         return str(self.group)
 
     @property
-    @method_decorator(mark_safe)
     def html_label(self) -> str:
-        type_name = str(self.type)
-        event_types = config.get_event_types()
+        return config.get_event_types().by_name_or_fallback(str(self.type)).html_label
+
+
+class EventGroupSummary(models.Model):
+    """
+    Summary of the events of a group, maintained when events are written if
+    `EventLogConfig.group_summary` is enabled.
+    """
+
+    group = models.CharField(_("Event Group"), max_length=40, unique=True)
+    event_count = models.PositiveIntegerField(_("Events"), default=0)
+    first_timestamp = models.DateTimeField(_("First event"))
+    last_timestamp = models.DateTimeField(_("Last event"), db_index=True)
+    last_type = models.CharField(_("Last event type"), max_length=50)
+    last_message = models.TextField(_("Last message"))
+
+    # The most severe event type of the group, see `EventTypeList.severity()`.
+    worst_type = models.CharField(_("Worst event type"), max_length=50)
+    severity = models.PositiveSmallIntegerField(_("Severity"), default=0)
+
+    class Meta:
+        ordering = ("-last_timestamp",)
+        indexes = (models.Index(fields=["severity", "last_timestamp"]),)
+        verbose_name = _("Event Group")
+        verbose_name_plural = _("Event Groups")
+
+    def __str__(self) -> str:
+        if UUID_RE.match(str(self.group)):
+            return self.group[:8]
+        return str(self.group)
 
-        # Event type exists in DB, but no longer defined in AppConfig.event_types.
-        if not (event_type := event_types.by_name(type_name)):
-            event_type = EventType(name=type_name, label=type_name.title())
+    @property
+    def html_label(self) -> str:
+        return (
+            config.get_event_types()
+            .by_name_or_fallback(str(self.worst_type))
+            .html_label
+        )
 
-        return event_type.html_label
+
+class EventRollup(models.Model):
+    """
+    Number of events per minute and type, see `EventLogConfig.rollup`.
+    """
+
+    bucket = models.DateTimeField(_("Minute"))
+    type = models.CharField(_("Event Type"), max_length=50)
+    count = models.PositiveIntegerField(_("Events"), default=0)
+
+    class Meta:
+        ordering = ("-bucket", "type")
+        constraints = (
+            models.UniqueConstraint(
+                fields=["bucket", "type"], name="eventlog_rollup_bucket_type"
+            ),
+        )
+        verbose_name = _("Event Rollup")
+        verbose_name_plural = _("Event Rollups")
+
+    def __str__(self) -> str:
+        return f"{self.bucket:%Y-%m-%d %H:%M} {self.type}: {self.count}"
+
+
+class EventRollupWatermark(models.Model):
+    """The id of the last event counted by the `eventlog_rollup` command."""
+
+    last_event_id = models.BigIntegerField(_("Last event id"), default=0)
+
+    class Meta:
+        verbose_name = _("Event Rollup Watermark")
+        verbose_name_plural = _("Event Rollup Watermarks")
+
+    def __str__(self) -> str:
+        return str(self.last_event_id)
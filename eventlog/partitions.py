@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import re
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from typing import TYPE_CHECKING
+
+from django.apps import apps
+from django.db import connections
+
+from .db import FULL_TEXT_INDEX, full_text_index_sql
+
+if TYPE_CHECKING:
+    from django.db.backends.base.base import BaseDatabaseWrapper
+    from django.db.backends.utils import CursorWrapper
+
+DAY = "day"
+MONTH = "month"
+INTERVALS = (DAY, MONTH)
+
+# Name suffix of the partition holding all events prior to the setup.
+LEGACY = "legacy"
+
+
+def get_connection() -> BaseDatabaseWrapper:
+    """The connection of the database holding the events, must be PostgreSQL."""
+    connection = connections[apps.get_app_config("eventlog").get_database()]
+    if connection.vendor != "postgresql":
+        msg = "Partitioning is only supported on PostgreSQL."
+        raise TypeError(msg)
+    return connection
+
+
+def interval_start(dt: datetime, interval: str) -> datetime:
+    """The start of the interval the given datetime is in, in UTC."""
+    if interval not in INTERVALS:
+        msg = f"interval must be one of {', '.join(INTERVALS)}"
+        raise TypeError(msg)
+    dt = dt.astimezone(dt_timezone.utc)
+    start = dt.replace(hour=0, minute=0, second=0, microsecond=0)
+    return start.replace(day=1) if interval == MONTH else start
+
+
+def next_interval(start: datetime, interval: str) -> datetime:
+    """The start of the interval following the one starting at `start`."""
+    if interval == DAY:
+        return start + timedelta(days=1)
+    return (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def partition_name(table: str, start: datetime, interval: str) -> str:
+    """E.g. eventlog_event_p202610 for monthly, or _p20261018 for daily."""
+    return f"{table}_p{start:%Y%m}" if interval == MONTH else f"{table}_p{start:%Y%m%d}"
+
+
+def parse_partition_name(table: str, name: str) -> tuple[datetime, str] | None:
+    """
+    The start and interval of a partition created by `create_partitions()`,
+    or None if the name does not match.
+    """
+    match = re.fullmatch(rf"{re.escape(table)}_p(\d{{6}}|\d{{8}})", name)
+    if not match:
+        return None
+    value = match.group(1)
+    interval = MONTH if len(value) == 6 else DAY  # noqa: PLR2004 Magic value
+    start = datetime(
+        int(value[:4]), int(value[4:6]), int(value[6:] or 1), tzinfo=dt_timezone.utc
+    )
+    return start, interval
+
+
+def create_partition_sql(table: str, start: datetime, interval: str) -> str:
+    end = next_interval(start, interval)
+    return (
+        f'CREATE TABLE IF NOT EXISTS "{partition_name(table, start, interval)}" '
+        f'PARTITION OF "{table}" '
+        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    )
+
+
+def setup_sql(now: datetime, interval: str) -> list[str]:
+    """
+    SQL statements to convert the existing Event table into a partitioned
+    table. The existing table is attached as the partition holding all events
+    up to the end of the current interval. A default partition catches events
+    outside any partition.
+
+    The primary key of a partitioned table must contain the partition key, so
+    it's changed to (id, timestamp). The id is still unique. A partitioned
+    table can't have an identity column, and a table with an identity column
+    can't be attached as a partition, so the id of both tables is changed to
+    a default taken from a sequence, continuing after the existing ids.
+    """
+    event_model = apps.get_model("eventlog", "Event")
+    connection = get_connection()
+    table = event_model._meta.db_table  # noqa: SLF001 Private member
+    legacy = f"{table}_{LEGACY}"
+    sequence = f"{table}_id_seq"
+    end = next_interval(interval_start(now, interval), interval)
+
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT indexname FROM pg_indexes WHERE tablename = %s", [table])
+        indexes = [row[0] for row in cursor.fetchall()]
+        cursor.execute(
+            "SELECT conname FROM pg_constraint "
+            "WHERE conrelid = %s::regclass AND contype = 'p'",
+            [table],
+        )
+        primary_keys = [row[0] for row in cursor.fetchall()]
+
+    with connection.schema_editor(collect_sql=True) as schema_editor:
+        index_sql = [
+            str(sql)
+            for sql in schema_editor._model_indexes_sql(event_model)  # noqa: SLF001 Private member
+        ]
+
+    return [
+        f'ALTER TABLE "{table}" RENAME TO "{legacy}"',
+        *(f'ALTER TABLE "{legacy}" DROP CONSTRAINT "{pk}"' for pk in primary_keys),
+        *(
+            f'ALTER INDEX "{index}" RENAME TO "{index[:50]}_{LEGACY}"'
+            for index in indexes
+            if index not in primary_keys
+        ),
+        # Removes the identity (Django 4.1+) or serial sequence of the id.
+        f'ALTER TABLE "{legacy}" ALTER COLUMN "id" DROP IDENTITY IF EXISTS',
+        f'ALTER TABLE "{legacy}" ALTER COLUMN "id" DROP DEFAULT',
+        f'DROP SEQUENCE IF EXISTS "{sequence}"',
+        (
+            f'CREATE TABLE "{table}" (LIKE "{legacy}" INCLUDING DEFAULTS) '
+            f'PARTITION BY RANGE ("timestamp")'
+        ),
+        f'CREATE SEQUENCE "{sequence}" OWNED BY "{table}"."id"',
+        (
+            f'ALTER TABLE "{table}" ALTER COLUMN "id" '
+            f"SET DEFAULT nextval('\"{sequence}\"')"
+        ),
+        f'ALTER TABLE "{table}" ADD PRIMARY KEY ("id", "timestamp")',
+        *index_sql,
+        # Created by a migration, not part of the model state.
+        *(
+            [full_text_index_sql(table, "message", FULL_TEXT_INDEX)]
+            if FULL_TEXT_INDEX in indexes
+            else []
+        ),
+        (
+            f"SELECT setval('\"{sequence}\"', "  # noqa: S608 SQL injection
+            f'(SELECT COALESCE(MAX("id"), 0) + 1 FROM "{legacy}"), false)'
+        ),
+        (
+            f'ALTER TABLE "{table}" ATTACH PARTITION "{legacy}" '
+            f"FOR VALUES FROM (MINVALUE) TO ('{end.isoformat()}')"
+        ),
+        f'CREATE TABLE "{table}_default" PARTITION OF "{table}" DEFAULT',
+    ]
+
+
+def legacy_end(cursor: CursorWrapper, table: str) -> datetime | None:
+    """
+    The upper bound of the partition created by `setup_sql()` holding all
+    events prior to the setup, or None if there is no such partition.
+    """
+    cursor.execute(
+        "SELECT substring(pg_get_expr(relpartbound, oid) "
+        "FROM 'TO \\(''([^'']+)''\\)')::timestamptz "
+        "FROM pg_class WHERE oid = to_regclass(%s)",
+        [f'"{table}_{LEGACY}"'],
+    )
+    row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def create_partitions(now: datetime, interval: str, ahead: int) -> list[str]:
+    """
+    Create the partitions for the current and the next `ahead` intervals,
+    if they don't exist yet. Intervals held by the legacy partition of the
+    setup are skipped. Returns the names of the partitions.
+    """
+    event_model = apps.get_model("eventlog", "Event")
+    table = event_model._meta.db_table  # noqa: SLF001 Private member
+    connection = get_connection()
+
+    names = []
+    start = interval_start(now, interval)
+    with connection.cursor() as cursor:
+        end = legacy_end(cursor, table)
+        for _ in range(ahead + 1):
+            if end is None or start >= end:
+                cursor.execute(create_partition_sql(table, start, interval))
+                names.append(partition_name(table, start, interval))
+            start = next_interval(start, interval)
+    return names
+
+
+def drop_partitions(before: datetime) -> list[str]:
+    """
+    Drop all partitions which only hold events older than `before`.
+    Returns the names of the dropped partitions.
+    """
+    event_model = apps.get_model("eventlog", "Event")
+    table = event_model._meta.db_table  # noqa: SLF001 Private member
+    connection = get_connection()
+
+    dropped = []
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = %s::regclass",
+            [table],
+        )
+        for (name,) in cursor.fetchall():
+            if not (parsed := parse_partition_name(table, name)):
+                continue
+            start, interval = parsed
+            if next_interval(start, interval) <= before:
+                cursor.execute(f'DROP TABLE "{name}"')
+                dropped.append(name)
+    return sorted(dropped)
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import time
+from datetime import timedelta
+from typing import TYPE_CHECKING, Callable
+
+from django.apps import apps
+from django.db.models import Q
+from django.utils import timezone
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+    from .apps import EventLogConfig
+
+# Key of the retention rule for all event types without an explicit rule.
+DEFAULT = "*"
+
+
+def prune_events(  # noqa: PLR0913 Too many arguments
+    retention: dict[str, int | None] | None = None,
+    *,
+    chunk_size: int = 1000,
+    sleep: float = 0,
+    dry_run: bool = False,
+    progress: Callable[[str, int], None] | None = None,
+    now: datetime | None = None,
+) -> dict[str, int]:
+    """
+    Delete events older than their retention period.
+
+    `retention` maps event type names to the number of days events of
+    this type are kept. `None` keeps them forever. The key "*" defines the
+    retention of all other event types. Defaults to the retention defined in
+    `EventLogConfig.get_retention()`.
+
+    Events are deleted in chunks of `chunk_size` rows, oldest first, so no
+    long running locks are held. `sleep` is the number of seconds to pause
+    between two chunks. `progress` is called after every chunk with the
+    rule name and the number of events deleted for this rule so far.
+
+    Returns the number of deleted events per rule. With `dry_run`, nothing
+    is deleted and the number of events which would be deleted is returned.
+    """
+    config: EventLogConfig = apps.get_app_config("eventlog")
+    events = apps.get_model("eventlog", "Event").objects.using(config.get_database())
+
+    if retention is None:
+        retention = config.get_retention()
+    now = now or timezone.now()
+
+    named_types = [name for name in retention if name != DEFAULT]
+    results = {}
+
+    for name, days in retention.items():
+        if days is None:
+            continue
+
+        type_filter = ~Q(type__in=named_types) if name == DEFAULT else Q(type=name)
+        qs = events.filter(type_filter, timestamp__lt=now - timedelta(days=days))
+
+        if dry_run:
+            results[name] = qs.count()
+            continue
+
+        results[name] = 0
+        while True:
+            pks = list(
+                qs.order_by("timestamp").values_list("pk", flat=True)[:chunk_size]
+            )
+            if not pks:
+                break
+
+            deleted, _ = events.filter(pk__in=pks).delete()
+            results[name] += deleted
+            if progress:
+                progress(name, results[name])
+
+            if len(pks) < chunk_size:
+                break
+            if sleep:
+                time.sleep(sleep)
+
+    return results
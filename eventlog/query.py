@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Iterable, Iterator
+
+from django.apps import apps
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import Trunc
+from django.utils import timezone
+
+if TYPE_CHECKING:
+    from datetime import datetime, timedelta
+
+    from django.db.models import QuerySet
+
+    from .models import Event
+
+# Intervals of `EventQuery.rates()`.
+INTERVALS = ("minute", "hour", "day")
+
+# Fields fetched by default. The data is only fetched if requested, as it
+# may be large.
+FIELDS = ("type", "group", "timestamp", "message", "initiator")
+
+
+class EventQuery:
+    """
+    Read events back, ordered and limited, using the database indexes.
+
+    Lists accept a keyset (timestamp, id) checkpoint of the last event seen,
+    so consumers can page through events or poll for new events cheaply,
+    without an OFFSET.
+
+    Events are read from the database `using`, or `EventLogConfig.database`
+    if set, otherwise the database router decides.
+    """
+
+    def __init__(self, using: str | None = None) -> None:
+        self.event_model = apps.get_model("eventlog", "Event")
+        self.using = using or apps.get_app_config("eventlog").database
+
+    def timeline(
+        self,
+        group_id: str,
+        *,
+        since: datetime | None = None,
+        after: tuple[datetime, int] | None = None,
+        limit: int = 100,
+        fields: Iterable[str] = FIELDS,
+    ) -> list[Event]:
+        """
+        The events of a group, oldest first. Uses the (group, timestamp) index.
+        """
+        qs = self._queryset(fields).filter(group=group_id)
+        if since:
+            qs = qs.filter(timestamp__gte=since)
+        if after:
+            qs = qs.filter(_after(after))
+        return list(qs.order_by("timestamp", "pk")[:limit])
+
+    def latest(
+        self,
+        *,
+        types: Iterable[str] | None = None,
+        before: tuple[datetime, int] | None = None,
+        limit: int = 25,
+        fields: Iterable[str] = FIELDS,
+    ) -> list[Event]:
+        """
+        The latest events, newest first, optionally of the given types. Pass
+        the (timestamp, id) of the last event as `before` for the next page.
+        Uses the (type, timestamp) or the (timestamp) index.
+        """
+        qs = self._queryset(fields)
+        if types:
+            qs = qs.filter(type__in=list(types))
+        if before:
+            timestamp, pk = before
+            qs = qs.filter(
+                Q(timestamp__lt=timestamp) | Q(timestamp=timestamp, pk__lt=pk)
+            )
+        return list(qs.order_by("-timestamp", "-pk")[:limit])
+
+    def counts_by_type(
+        self, window: timedelta | None = None, now: datetime | None = None
+    ) -> dict[str, int]:
+        """
+        Number of events per type, within the `window` before now, or in total.
+        """
+        qs = self.event_model.objects.using(self.using).all()
+        if window is not None:
+            qs = qs.filter(timestamp__gte=(now or timezone.now()) - window)
+        return dict(
+            qs.order_by()
+            .values_list("type")
+            .annotate(count=Count("pk"))
+            .values_list("type", "count")
+        )
+
+    def rates(
+        self,
+        interval: str = "hour",
+        *,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        types: Iterable[str] | None = None,
+    ) -> list[tuple[datetime, str, int]]:
+        """
+        Number of events per interval ("minute", "hour" or "day", in the
+        current time zone) and type, as (start, type, count) tuples, oldest
+        first. Reads only the rollups, see `EventLogConfig.rollup`.
+        """
+        if interval not in INTERVALS:
+            msg = f"interval must be one of {', '.join(INTERVALS)}"
+            raise TypeError(msg)
+
+        rollup_model = apps.get_model("eventlog", "EventRollup")
+        qs = rollup_model.objects.using(self.using).all()
+        if since:
+            qs = qs.filter(bucket__gte=since)
+        if until:
+            qs = qs.filter(bucket__lt=until)
+        if types:
+            qs = qs.filter(type__in=list(types))
+
+        if interval == "minute":
+            return list(
+                qs.order_by("bucket", "type").values_list("bucket", "type", "count")
+            )
+        return list(
+            qs.annotate(start=Trunc("bucket", interval))
+            .order_by()
+            .values_list("start", "type")
+            .annotate(total=Sum("count"))
+            .order_by("start", "type")
+        )
+
+    def iterate(
+        self,
+        *,
+        group_id: str | None = None,
+        types: Iterable[str] | None = None,
+        after: tuple[datetime, int] | None = None,
+        chunk_size: int = 1000,
+        fields: Iterable[str] = FIELDS,
+    ) -> Iterator[Event]:
+        """
+        Yield all events after the (timestamp, id) checkpoint, oldest first.
+        Each chunk is fetched by a separate query continuing after the last
+        event of the previous chunk, so no transaction or cursor is held open.
+        """
+        qs = self._queryset(fields)
+        if group_id:
+            qs = qs.filter(group=group_id)
+        if types:
+            qs = qs.filter(type__in=list(types))
+        qs = qs.order_by("timestamp", "pk")
+
+        while True:
+            chunk = list((qs.filter(_after(after)) if after else qs)[:chunk_size])
+            yield from chunk
+            if len(chunk) < chunk_size:
+                return
+            after = (chunk[-1].timestamp, chunk[-1].pk)
+
+    def _queryset(self, fields: Iterable[str]) -> QuerySet:
+        return self.event_model.objects.using(self.using).only(*fields)
+
+
+def _after(checkpoint: tuple[datetime, int]) -> Q:
+    timestamp, pk = checkpoint
+    return Q(timestamp__gt=timestamp) | Q(timestamp=timestamp, pk__gt=pk)
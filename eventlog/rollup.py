@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+from collections import Counter
+from datetime import timedelta
+from datetime import timezone as dt_timezone
+from typing import TYPE_CHECKING, Iterable
+
+from django.apps import apps
+from django.db import transaction
+from django.db.models import Count, F, Max
+from django.db.models.functions import TruncMinute
+from django.utils import timezone
+
+from .db import upsert
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+    from django.db.models import QuerySet
+
+    from .apps import EventLogConfig
+    from .models import Event
+
+MODE_WRITE = "write"
+MODE_COMMAND = "command"
+MODES = (MODE_WRITE, MODE_COMMAND)
+
+
+def bucket(timestamp: datetime) -> datetime:
+    """The minute (in UTC) an event is counted in."""
+    return timestamp.astimezone(dt_timezone.utc).replace(second=0, microsecond=0)
+
+
+def update_rollups(events: Iterable[Event], using: str | None = None) -> None:
+    """
+    Add written events to the rollups. Events are counted per minute and
+    type first, so a batch of events results in one upsert per minute and type.
+    """
+    _add(Counter((bucket(event.timestamp), event.type) for event in events), using)
+
+
+def rollup_events(*, chunk_size: int = 10_000, rebuild: bool = False) -> int:
+    """
+    Count all events written since the last run, i.e. with an id above the
+    watermark, in chunks of `chunk_size` ids. Each chunk is counted in its
+    own transaction, which also moves the watermark.
+
+    In "command" mode, the minutes within the last `rollup_grace` seconds are
+    then counted again, so events committed after an event with a higher id
+    was counted (e.g. by a long transaction) are not missed.
+
+    With `rebuild`, all rollups are deleted and all events are counted.
+    Returns the number of counted events.
+    """
+    config: EventLogConfig = apps.get_app_config("eventlog")
+    using = config.get_database()
+    events = apps.get_model("eventlog", "Event").objects.using(using)
+    watermark_model = apps.get_model("eventlog", "EventRollupWatermark")
+    rollup_model = apps.get_model("eventlog", "EventRollup")
+
+    if rebuild:
+        with transaction.atomic(using=using):
+            rollup_model.objects.using(using).all().delete()
+            watermark_model.objects.using(using).update_or_create(
+                pk=1, defaults={"last_event_id": 0}
+            )
+
+    # Events written while this runs are counted by the next run.
+    end = events.aggregate(end=Max("pk"))["end"] or 0
+    since = bucket(timezone.now() - timedelta(seconds=config.rollup_grace))
+    counted = 0
+    while True:
+        with transaction.atomic(using=using):
+            # Locks the watermark, so concurrent runs don't count events twice.
+            watermark, _ = (
+                watermark_model.objects.using(using)
+                .select_for_update()
+                .get_or_create(pk=1)
+            )
+            start = watermark.last_event_id
+            if start >= end:
+                break
+
+            upper = min(start + chunk_size, end)
+            counts = _count(events.filter(pk__gt=start, pk__lte=upper))
+            _add(counts, using)
+            counted += sum(counts.values())
+
+            watermark.last_event_id = upper
+            watermark.save(using=using, update_fields=["last_event_id"])
+
+    if config.rollup == MODE_COMMAND and config.rollup_grace:
+        with transaction.atomic(using=using):
+            watermark = (
+                watermark_model.objects.using(using).select_for_update().get(pk=1)
+            )
+            # The counts of these minutes are replaced, events above the
+            # watermark are added to them by the next run.
+            counts = _count(
+                events.filter(timestamp__gte=since, pk__lte=watermark.last_event_id)
+            )
+            for (minute, event_type), count in counts.items():
+                upsert(
+                    rollup_model,
+                    {"bucket": minute, "type": event_type},
+                    {"count": count},
+                    {"count": count},
+                    using=using,
+                )
+    return counted
+
+
+def _count(events: QuerySet[Event]) -> dict[tuple[datetime, str], int]:
+    """Count the events per minute and type."""
+    rows = (
+        events.annotate(bucket=TruncMinute("timestamp", tzinfo=dt_timezone.utc))
+        .order_by()
+        .values_list("bucket", "type")
+        .annotate(count=Count("pk"))
+    )
+    return {(row[0], row[1]): row[2] for row in rows}
+
+
+def _add(counts: dict[tuple[datetime, str], int], using: str | None = None) -> None:
+    rollup_model = apps.get_model("eventlog", "EventRollup")
+    for (minute, event_type), count in counts.items():
+        upsert(
+            rollup_model,
+            {"bucket": minute, "type": event_type},
+            {"count": F("count") + count},
+            {"count": count},
+            using=using,
+        )
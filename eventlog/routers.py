@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from django.apps import apps
+
+if TYPE_CHECKING:
+    from django.db.models import Model
+
+    from .apps import EventLogConfig
+
+
+class EventLogRouter:
+    """
+    Database router for all eventlog models, using the `database` of the
+    EventLogConfig. Add it to the `DATABASE_ROUTERS` setting:
+
+        DATABASE_ROUTERS = ["eventlog.routers.EventLogRouter"]
+
+    Other apps are left to the following routers.
+    """
+
+    def _database(self, app_label: str) -> str | None:
+        if app_label != "eventlog":
+            return None
+        config: EventLogConfig = apps.get_app_config("eventlog")
+        return config.database
+
+    def db_for_read(self, model: type[Model], **hints: Any) -> str | None:
+        return self._database(model._meta.app_label)  # noqa: SLF001 Private member
+
+    def db_for_write(self, model: type[Model], **hints: Any) -> str | None:
+        return self._database(model._meta.app_label)  # noqa: SLF001 Private member
+
+    def allow_migrate(self, db: str, app_label: str, **hints: Any) -> bool | None:
+        """The eventlog tables are only created in the eventlog database."""
+        if database := self._database(app_label):
+            return db == database
+        return None
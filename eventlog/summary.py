@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Iterable
+
+from django.apps import apps
+from django.db import transaction
+from django.db.models import (
+    Case,
+    Count,
+    F,
+    Max,
+    Min,
+    OuterRef,
+    PositiveSmallIntegerField,
+    Subquery,
+    TextField,
+    Value,
+    When,
+)
+from django.db.models.functions import Greatest, Least
+
+from .db import upsert
+
+if TYPE_CHECKING:
+    from .apps import EventLogConfig
+    from .models import Event
+
+
+def update_summaries(events: Iterable[Event], using: str | None = None) -> None:
+    """
+    Add written events to the summary of their group. Events are aggregated
+    per group first, so a batch of events results in one upsert per group.
+    """
+    config: EventLogConfig = apps.get_app_config("eventlog")
+    event_types = config.get_event_types()
+
+    groups: dict[str, dict[str, Any]] = {}
+    for event in events:
+        severity = event_types.severity(event.type)
+        summary = groups.get(event.group)
+        if summary is None:
+            groups[event.group] = {
+                "event_count": 1,
+                "first_timestamp": event.timestamp,
+                "last_timestamp": event.timestamp,
+                "last_type": event.type,
+                "last_message": event.message,
+                "worst_type": event.type,
+                "severity": severity,
+            }
+            continue
+
+        summary["event_count"] += 1
+        summary["first_timestamp"] = min(summary["first_timestamp"], event.timestamp)
+        if event.timestamp >= summary["last_timestamp"]:
+            summary["last_timestamp"] = event.timestamp
+            summary["last_type"] = event.type
+            summary["last_message"] = event.message
+        if severity > summary["severity"]:
+            summary["worst_type"] = event.type
+            summary["severity"] = severity
+
+    for group, summary in groups.items():
+        _update_summary(group, summary, using)
+
+
+def _update_summary(group: str, summary: dict[str, Any], using: str | None) -> None:
+    summary_model = apps.get_model("eventlog", "EventGroupSummary")
+
+    # All expressions of an UPDATE refer to the values before the update.
+    newer = {"last_timestamp__lte": summary["last_timestamp"]}
+    update = {
+        "event_count": F("event_count") + summary["event_count"],
+        "first_timestamp": Least("first_timestamp", Value(summary["first_timestamp"])),
+        "last_timestamp": Greatest("last_timestamp", Value(summary["last_timestamp"])),
+        "last_type": Case(
+            When(**newer, then=Value(summary["last_type"])), default=F("last_type")
+        ),
+        "last_message": Case(
+            When(**newer, then=Value(summary["last_message"])),
+            default=F("last_message"),
+            output_field=TextField(),
+        ),
+        "worst_type": Case(
+            When(severity__lt=summary["severity"], then=Value(summary["worst_type"])),
+            default=F("worst_type"),
+        ),
+        "severity": Greatest(
+            "severity",
+            Value(summary["severity"]),
+            output_field=PositiveSmallIntegerField(),
+        ),
+    }
+
+    upsert(summary_model, {"group": group}, update, summary, using=using)
+
+
+def rebuild_summaries(batch_size: int = 1000) -> int:
+    """
+    Delete all group summaries and create them from the existing events.
+    Returns the number of summaries created.
+    """
+    config: EventLogConfig = apps.get_app_config("eventlog")
+    event_model = apps.get_model("eventlog", "Event")
+    summary_model = apps.get_model("eventlog", "EventGroupSummary")
+    event_types = config.get_event_types()
+
+    severity = Case(
+        *(
+            When(
+                type=event_type.name, then=Value(event_types.severity(event_type.name))
+            )
+            for event_type in event_types.events
+        ),
+        default=Value(0),
+    )
+    last = event_model.objects.filter(group=OuterRef("group")).order_by(
+        "-timestamp", "-pk"
+    )
+    worst = (
+        event_model.objects.filter(group=OuterRef("group"))
+        .annotate(severity=severity)
+        .order_by("-severity", "timestamp", "pk")
+    )
+    using = config.get_database()
+    rows = (
+        event_model.objects.using(using)
+        .order_by()
+        .values("group")
+        .annotate(
+            event_count=Count("pk"),
+            first_timestamp=Min("timestamp"),
+            last_timestamp=Max("timestamp"),
+            last_type=Subquery(last.values("type")[:1]),
+            last_message=Subquery(last.values("message")[:1]),
+            worst_type=Subquery(worst.values("type")[:1]),
+            severity=Max(severity),
+        )
+    )
+
+    count = 0
+    summaries = summary_model.objects.using(using)
+    with transaction.atomic(using=using):
+        summaries.all().delete()
+        batch = []
+        for row in rows.iterator(chunk_size=batch_size):
+            batch.append(summary_model(**row))
+            if len(batch) >= batch_size:
+                summaries.bulk_create(batch)
+                count += len(batch)
+                batch = []
+        summaries.bulk_create(batch)
+        count += len(batch)
+    return count
@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import gzip
+import json
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from io import StringIO
+from typing import TYPE_CHECKING
+
+import pytest
+from django.core.files.storage import FileSystemStorage
+from django.core.management import call_command
+from django.urls import reverse
+from pytest_django.asserts import assertContains, assertNotContains
+
+from eventlog import archive
+from eventlog.archive import archive_events, archived_days, find_archived_group
+from eventlog.models import Event, EventGroupSummary
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from django.test import Client
+
+DAY = datetime(2024, 3, 1, tzinfo=dt_timezone.utc)
+
+
+@pytest.fixture
+def storage(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> FileSystemStorage:
+    storage = FileSystemStorage(location=tmp_path)
+    monkeypatch.setattr(archive, "get_storage", lambda: storage)
+    return storage
+
+
+@pytest.fixture
+def events() -> None:
+    """Events of two groups on two days, and one event of the following day."""
+    for days in (0, 1):
+        for group in ("abc", "def"):
+            for event_type in ("info", "error"):
+                Event.objects.create(
+                    type=event_type,
+                    group=group,
+                    message=f"{group} {event_type} {days}",
+                    data={"days": days},
+                    timestamp=DAY + timedelta(days=days, hours=12),
+                )
+    Event.objects.create(
+        type="info", group="abc", message="Today", timestamp=DAY + timedelta(days=2)
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("events")
+def test_archive(storage: FileSystemStorage) -> None:
+    """Complete days are moved into one file per type, with an index."""
+    results = archive_events(DAY + timedelta(days=2, hours=6), chunk_size=3)
+
+    assert results == {"2024-03-01": 4, "2024-03-02": 4}
+    assert list(Event.objects.values_list("message", flat=True)) == ["Today"]
+    assert archived_days(storage) == [DAY, DAY + timedelta(days=1)]
+
+    assert sorted(storage.listdir("eventlog/2024/03/01")[1]) == [
+        "error.jsonl.gz",
+        "index.json",
+        "info.jsonl.gz",
+    ]
+    with storage.open("eventlog/2024/03/01/index.json") as f:
+        assert json.loads(f.read()) == {
+            "abc": ["error.jsonl.gz", "info.jsonl.gz"],
+            "def": ["error.jsonl.gz", "info.jsonl.gz"],
+        }
+    with storage.open("eventlog/2024/03/01/info.jsonl.gz") as f:
+        lines = gzip.decompress(f.read()).decode().splitlines()
+    assert [json.loads(line)["message"] for line in lines] == [
+        "abc info 0",
+        "def info 0",
+    ]
+
+    # Nothing left to archive.
+    assert archive_events(DAY + timedelta(days=2)) == {}
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("events")
+def test_archive_again(storage: FileSystemStorage) -> None:
+    """Events added to an archived day are archived into additional files."""
+    archive_events(DAY + timedelta(days=1))
+    Event.objects.create(
+        type="info", group="ghi", message="Late", timestamp=DAY + timedelta(hours=1)
+    )
+
+    assert archive_events(DAY + timedelta(days=1)) == {"2024-03-01": 1}
+    (new_file,) = archive.read_index(DAY, storage)["ghi"]
+    assert new_file != "info.jsonl.gz"
+    assert archive.read_index(DAY, storage)["abc"] == [
+        "error.jsonl.gz",
+        "info.jsonl.gz",
+    ]
+    assert [e["message"] for e in find_archived_group("ghi")] == ["Late"]
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("events")
+def test_find_archived_group(storage: FileSystemStorage) -> None:
+    """Archived events of a group are found, ordered by timestamp."""
+    assert find_archived_group("abc") == []
+    archive_events(DAY + timedelta(days=2))
+
+    events = find_archived_group("abc")
+    assert [e["message"] for e in events] == [
+        "abc info 0",
+        "abc error 0",
+        "abc info 1",
+        "abc error 1",
+    ]
+    assert events[0]["timestamp"] == DAY + timedelta(hours=12)
+    assert events[0]["data"] == {"days": 0}
+
+    events = find_archived_group("abc", since=DAY + timedelta(days=1, hours=1))
+    assert [e["message"] for e in events] == ["abc info 1", "abc error 1"]
+    events = find_archived_group("abc", until=DAY + timedelta(hours=1))
+    assert [e["message"] for e in events] == ["abc info 0", "abc error 0"]
+
+    # With a range, the days are not listed, missing days are skipped.
+    events = find_archived_group(
+        "abc", since=DAY - timedelta(days=3), until=DAY + timedelta(hours=1)
+    )
+    assert [e["message"] for e in events] == ["abc info 0", "abc error 0"]
+    assert find_archived_group("xyz") == []
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("events", "storage")
+def test_archive_command() -> None:
+    stdout = StringIO()
+    call_command("eventlog_archive", "--older-than", "10000", stdout=stdout)
+    assert stdout.getvalue() == "No events to archive.\n"
+
+    stdout = StringIO()
+    call_command("eventlog_archive", "--older-than", "0", stdout=stdout)
+    assert "2024-03-01: 4 events archived." in stdout.getvalue()
+    assert Event.objects.count() <= 1
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("events", "storage")
+def test_admin_archive(admin_client: Client) -> None:
+    """The admin looks up archived groups."""
+    archive_events(DAY + timedelta(days=2))
+    url = reverse("admin:eventlog_event_archive")
+
+    response = admin_client.get(reverse("admin:eventlog_event_changelist"))
+    assertContains(response, url)
+
+    response = admin_client.get(url)
+    assertNotContains(response, 'eventTree">')
+
+    response = admin_client.get(
+        url, {"group": "abc", "since": "2024-03-02", "until": "2024-03-31"}
+    )
+    assertContains(response, "abc error 1")
+    assertNotContains(response, "abc error 0")
+    assertNotContains(response, "def error 1")
+
+    response = admin_client.get(
+        url, {"group": "abc", "since": "2024-01-01", "until": "2024-03-31"}
+    )
+    assertContains(response, "Choose a range of at most 31 days.")
+    assertNotContains(response, "abc error 1")
+
+    # Without a range, the days of the group summary are looked up.
+    EventGroupSummary.objects.create(
+        group="abc",
+        first_timestamp=DAY,
+        last_timestamp=DAY + timedelta(days=1, hours=12),
+    )
+    response = admin_client.get(url, {"group": "abc"})
+    assertContains(response, "abc error 0")
+    assertContains(response, "abc error 1")
+    assertContains(response, 'value="2024-03-01"')
+
+    response = admin_client.get(url, {"group": "xyz"})
+    assertContains(response, "No archived events found")
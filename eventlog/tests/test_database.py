@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from io import StringIO
+from typing import TYPE_CHECKING
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.apps import apps
+from django.conf import settings as django_settings
+from django.core.files.storage import FileSystemStorage
+from django.core.management import call_command
+from django.db import transaction
+from django.urls import reverse
+from django.utils import timezone
+from pytest_django.asserts import assertContains
+
+from eventlog.archive import archive_events
+from eventlog.events import EventGroup
+from eventlog.models import Event, EventGroupSummary, EventRollup
+from eventlog.prune import prune_events
+from eventlog.query import EventQuery
+from eventlog.routers import EventLogRouter
+from eventlog.transfer import export_events
+
+if TYPE_CHECKING:
+    from pathlib import Path
+    from typing import Callable
+
+    from django.test import Client
+    from pytest_django.fixtures import SettingsWrapper
+
+
+@pytest.fixture
+def database(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(apps.get_app_config("eventlog"), "database", "eventlog")
+
+
+@pytest.mark.django_db(databases=["default", "eventlog"])
+@pytest.mark.usefixtures("database")
+def test_database(
+    monkeypatch: pytest.MonkeyPatch, django_capture_on_commit_callbacks: Callable
+) -> None:
+    """Events, summaries and rollups are written to the configured database."""
+    config = apps.get_app_config("eventlog")
+    monkeypatch.setattr(config, "group_summary", True)
+    monkeypatch.setattr(config, "rollup", "write")
+
+    e = EventGroup(group_id="abc")
+    with django_capture_on_commit_callbacks(using="eventlog", execute=True):
+        e.info("First")
+        with e.batch():
+            e.info("Second")
+            e.error("Third")
+        async_to_sync(e.ainfo)("Fourth")
+
+    assert not Event.objects.using("default").exists()
+    assert Event.objects.using("eventlog").count() == 4
+    summary = EventGroupSummary.objects.using("eventlog").get(group="abc")
+    assert summary.event_count == 4
+    assert sum(r.count for r in EventRollup.objects.using("eventlog")) == 4
+
+
+@pytest.mark.django_db(databases=["default", "eventlog"], transaction=True)
+@pytest.mark.usefixtures("database")
+def test_database_transaction() -> None:
+    """Events written to a separate database are kept if the caller rolls back."""
+    with transaction.atomic():
+        EventGroup().info("Hello World")
+        transaction.set_rollback(True)
+
+    assert Event.objects.using("eventlog").filter(message="Hello World").exists()
+
+
+@pytest.mark.django_db(databases=["default", "eventlog"])
+@pytest.mark.usefixtures("database")
+def test_database_without_router(admin_client: Client, tmp_path: Path) -> None:
+    """
+    Without the router, events are still read and deleted on the configured
+    database.
+    """
+    e = EventGroup(group_id="abc")
+    e.info("Hello World")
+    e.error("Goodbye World")
+    assert not Event.objects.using("default").exists()
+
+    assert [e.message for e in EventQuery().timeline("abc")] == [
+        "Hello World",
+        "Goodbye World",
+    ]
+    assert len(list(export_events())) == 2
+    response = admin_client.get(reverse("admin:eventlog_event_changelist"))
+    assertContains(response, "Hello World")
+
+    tomorrow = timezone.now() + timedelta(days=1)
+    assert prune_events({"error": 0}, now=tomorrow) == {"error": 1}
+    storage = FileSystemStorage(location=tmp_path)
+    assert sum(archive_events(tomorrow, storage=storage).values()) == 1
+    assert not Event.objects.using("eventlog").exists()
+
+
+@pytest.mark.usefixtures("database")
+def test_router() -> None:
+    router = EventLogRouter()
+    assert router.db_for_read(Event) == "eventlog"
+    assert router.db_for_write(EventRollup) == "eventlog"
+    assert router.db_for_write(apps.get_model("auth", "User")) is None
+    assert router.allow_migrate("eventlog", "eventlog")
+    assert not router.allow_migrate("default", "eventlog")
+    assert router.allow_migrate("default", "auth") is None
+
+
+def test_router_disabled() -> None:
+    router = EventLogRouter()
+    assert router.db_for_write(Event) is None
+    assert router.allow_migrate("default", "eventlog") is None
+
+
+@pytest.mark.django_db(transaction=True)
+def test_autonomous_writes(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Autonomous writes are kept if the caller's transaction is rolled back."""
+    e = EventGroup()
+    with transaction.atomic():
+        e.info("Rolled back")
+        transaction.set_rollback(True)
+
+    monkeypatch.setattr(e.config, "autonomous_writes", True)
+    with transaction.atomic():
+        e.info("Kept")
+        async_to_sync(e.ainfo)("Kept async")
+        with e.batch():
+            e.info("Kept batch 1")
+            e.info("Kept batch 2")
+        transaction.set_rollback(True)
+    e.info("Outside")
+
+    assert sorted(Event.objects.values_list("message", flat=True)) == [
+        "Kept",
+        "Kept async",
+        "Kept batch 1",
+        "Kept batch 2",
+        "Outside",
+    ]
+
+
+# The event databases, the PostgreSQL one only with EVENTLOG_TEST_POSTGRESQL.
+EVENT_DATABASES = [
+    alias for alias in ("eventlog", "postgresql") if alias in django_settings.DATABASES
+]
+
+
+@pytest.mark.parametrize("alias", EVENT_DATABASES)
+@pytest.mark.django_db(databases="__all__", transaction=True)
+def test_database_commands(
+    alias: str,
+    monkeypatch: pytest.MonkeyPatch,
+    settings: SettingsWrapper,
+    tmp_path: Path,
+) -> None:
+    """The commands use the transactions of the event database."""
+    config = apps.get_app_config("eventlog")
+    monkeypatch.setattr(config, "database", alias)
+    monkeypatch.setattr(config, "rollup", "command")
+    settings.DATABASE_ROUTERS = ["eventlog.routers.EventLogRouter"]
+
+    e = EventGroup(group_id="abc")
+    e.info("First")
+    e.error("Second")
+
+    call_command("eventlog_rollup", stdout=StringIO())
+    assert sum(EventRollup.objects.values_list("count", flat=True)) == 2
+    call_command("eventlog_rebuild_summaries", stdout=StringIO())
+    assert EventGroupSummary.objects.get().event_count == 2
+
+    path = tmp_path / "events.jsonl"
+    call_command("eventlog_export", f"--output={path}", stderr=StringIO())
+    Event.objects.all().delete()
+    call_command("eventlog_import", str(path), "--atomic", stdout=StringIO())
+    assert Event.objects.using(alias).count() == 2
+    assert not Event.objects.using("default").exists()
@@ -1,16 +1,22 @@
 from __future__ import annotations
 
 from datetime import timedelta
+from decimal import Decimal
 from http import HTTPStatus
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, Callable
+from uuid import UUID
 
 import pytest
+from asgiref.sync import async_to_sync
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
 from django.urls import reverse
 from django.utils import timezone
 from pytest_django.asserts import assertContains, assertNotContains
 
 from eventlog.admin import get_difference
-from eventlog.datastructures import EventType
+from eventlog.datastructures import EventType, EventTypeList
+from eventlog.encoders import OrjsonEncoder
 from eventlog.events import EventGroup
 from eventlog.models import Event
 
@@ -276,3 +282,415 @@ def test_duration() -> None:
         Event(timestamp=now + timedelta(seconds=10, minutes=5, hours=2, days=400)),
     )
     assert diff == "1y 35d 2h 5m 10s later"
+
+
+@pytest.mark.django_db
+def test_buffered_log(django_assert_num_queries: Callable) -> None:
+    """Buffered events are written with a single query upon flush."""
+    e = EventGroup(buffered=True)
+    e.info("Hello World 1")
+    e.error("Hello World 2")
+    assert Event.objects.count() == 0
+
+    with django_assert_num_queries(1):
+        e.flush()
+    assert Event.objects.count() == 2
+
+    # Flushing an empty buffer is a no-op.
+    with django_assert_num_queries(0):
+        e.flush()
+
+
+@pytest.mark.django_db
+def test_batch_log(mailoutbox: list[EmailMessage]) -> None:
+    """Events within a batch block are written when the block is left."""
+    e = EventGroup(send_mail="user@example.com")
+
+    with e.batch():
+        e.info("Hello World 1")
+        e.info("Hello World 2")
+        logged_before = timezone.now()
+        assert Event.objects.count() == 0
+        assert len(mailoutbox) == 0
+
+    assert Event.objects.count() == 2
+    assert len(mailoutbox) == 2
+    assert not e.buffered
+
+    # The timestamp is the time of the log call, not the time of the flush.
+    assert all(obj.timestamp <= logged_before for obj in Event.objects.all())
+
+
+@pytest.mark.django_db
+def test_buffered_log_size_limit(monkeypatch: pytest.MonkeyPatch) -> None:
+    """The buffer is flushed once it's full."""
+    e = EventGroup(buffered=True)
+    monkeypatch.setattr(e.config, "buffer_size", 3)
+    monkeypatch.setattr(e.config, "buffer_timeout", None)
+
+    e.info("Hello World 1")
+    e.info("Hello World 2")
+    assert Event.objects.count() == 0
+    e.info("Hello World 3")
+    assert Event.objects.count() == 3
+
+
+@pytest.mark.django_db
+def test_buffered_log_timeout(monkeypatch: pytest.MonkeyPatch) -> None:
+    """The buffer is flushed once the oldest event exceeds the timeout."""
+    e = EventGroup(buffered=True)
+    monkeypatch.setattr(e.config, "buffer_timeout", 0)
+
+    e.info("Hello World 1")
+    assert Event.objects.count() == 1
+
+
+@pytest.mark.django_db
+def test_buffered_log_on_commit(django_capture_on_commit_callbacks: Callable) -> None:
+    """Within a transaction, the buffer is flushed once it's committed."""
+    e = EventGroup(buffered=True)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        e.info("Hello World 1")
+        e.info("Hello World 2")
+        assert Event.objects.count() == 0
+
+    assert Event.objects.count() == 2
+
+
+@pytest.mark.django_db
+def test_buffered_log_rollback(django_capture_on_commit_callbacks: Callable) -> None:
+    """Events buffered in a rolled back transaction are discarded."""
+    e = EventGroup(buffered=True)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        with transaction.atomic():
+            e.info("Hello World 1")
+            transaction.set_rollback(True)
+
+        with transaction.atomic():
+            e.info("Hello World 2")
+        assert Event.objects.count() == 0
+
+    assert list(Event.objects.values_list("message", flat=True)) == ["Hello World 2"]
+    assert not e._buffer  # noqa: SLF001 Private member
+
+
+@pytest.mark.django_db
+def test_async_log(mailoutbox: list[EmailMessage]) -> None:
+    """Awaitable event methods are available with an 'a' prefix."""
+
+    async def log() -> None:
+        e = EventGroup()
+        await e.ainfo("Hello World 1", send_mail="user@example.com")
+        await e.aerror("Hello World 2")
+
+        e.buffered = True
+        await e.awarning("Hello World 3")
+        await e.acritical("Hello World 4")
+        await e.aflush()
+
+    async_to_sync(log)()
+    assert Event.objects.count() == 4
+    assert len(mailoutbox) == 1
+
+
+@pytest.mark.django_db
+def test_async_batch() -> None:
+    """Events within an abatch() block are written once the block is left."""
+
+    async def log() -> None:
+        e = EventGroup()
+        async with e.abatch():
+            await e.ainfo("Hello World 1")
+            await e.ainfo("Hello World 2")
+            assert e.buffered
+            assert len(e._buffer) == 2  # noqa: SLF001 Private member
+        assert not e.buffered
+        assert not e._buffer  # noqa: SLF001 Private member
+
+    async_to_sync(log)()
+    assert Event.objects.count() == 2
+
+
+def test_invalid_async_type_usage() -> None:
+    """Calling an invalid async type will raise an error."""
+    e = EventGroup()
+
+    with pytest.raises(TypeError):
+        e.adoesnotexist("Hello World")
+
+
+def test_event_type_list() -> None:
+    """Event types can be added and removed by name."""
+    info = EventType(name="info", label="Info")
+    event_types = EventTypeList(info, EventType(name="error", label="Error"))
+    assert event_types.by_name("info") is info
+    assert event_types.by_name("doesnotexist") is None
+
+    # Adding an event type with an existing name replaces it in place.
+    new_info = EventType(name="info", label="New Info")
+    event_types.add(new_info)
+    assert event_types.by_name("info") is new_info
+    assert [e.name for e in event_types.events] == ["info", "error"]
+    assert event_types.severity("info") == 1
+
+    event_types.remove("info")
+    assert event_types.by_name("info") is None
+    assert [e.name for e in event_types.events] == ["error"]
+
+    with pytest.raises(TypeError):
+        event_types.remove("info")
+
+
+def test_event_type_html_label() -> None:
+    """The html label is rendered once and cached."""
+    event_type = EventType(name="info", label="Info", color="red")
+    assert event_type.html_label == (
+        '<span class="eventType" style="color: red; ">Info</span>'
+    )
+    assert event_type.html_label is event_type.html_label
+
+
+def test_event_method_cached() -> None:
+    """Event methods are created once per instance."""
+    e = EventGroup()
+    assert e.info is e.info
+    assert e.ainfo is e.ainfo
+    assert e.info.__name__ == "info"
+    assert e.ainfo.__name__ == "ainfo"
+    assert "info" in vars(e)
+    assert "info" not in vars(EventGroup())
+
+
+@pytest.mark.django_db
+def test_structured_data_log() -> None:
+    """Datetimes, Decimals and UUIDs are stored as structured data."""
+    now = timezone.now()
+    e = EventGroup()
+    e.info(
+        "Hello World",
+        data={"date": now, "amount": Decimal("1.50"), "uuid": UUID(int=1)},
+    )
+
+    data = Event.objects.get().data
+    assert data["amount"] == "1.50"
+    assert data["uuid"] == "00000000-0000-0000-0000-000000000001"
+    assert data["date"].startswith(now.date().isoformat())
+
+
+@pytest.mark.django_db
+def test_data_serialized_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Data is serialized once, when it's written to the database."""
+    calls = []
+
+    class CountingEncoder(DjangoJSONEncoder):
+        def encode(self, o: Any) -> str:
+            calls.append(o)
+            return super().encode(o)
+
+    e = EventGroup()
+    monkeypatch.setattr(e.config, "data_encoder", CountingEncoder)
+    e.info("Hello World", data={"foo": "bar"})
+
+    assert calls == [{"foo": "bar"}]
+    assert Event.objects.get().data == {"foo": "bar"}
+
+
+@pytest.mark.django_db
+def test_orjson_data_log(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Data can be serialized with orjson."""
+    pytest.importorskip("orjson")
+
+    class Foo:
+        pass
+
+    e = EventGroup()
+    monkeypatch.setattr(e.config, "data_encoder", OrjsonEncoder)
+    e.info("Hello World", data={"amount": Decimal("1.50"), 1: UUID(int=1)})
+    e.info("Hello World", data={"foo": Foo()})
+
+    first, second = Event.objects.order_by("pk")
+    assert first.data == {"amount": "1.50", "1": "00000000-0000-0000-0000-000000000001"}
+    assert "Foo object" in second.data
+
+
+@pytest.mark.django_db
+def test_admin_changeform_timeline(
+    admin_client: Client,
+    monkeypatch: pytest.MonkeyPatch,
+    django_assert_num_queries: Callable,
+) -> None:
+    """
+    The change form lists a bounded window of events around the current one,
+    with the delay to the respective previous event.
+    """
+    from django.contrib import admin
+
+    from eventlog.admin import EventAdmin
+
+    now = timezone.now()
+    events = [
+        Event.objects.create(
+            group="abc",
+            type="info",
+            message=f"Event {i}",
+            timestamp=now + timedelta(minutes=i),
+        )
+        for i in range(7)
+    ]
+    monkeypatch.setattr(EventGroup().config, "admin_timeline_size", 2)
+    event_admin = EventAdmin(Event, admin.site)
+
+    with django_assert_num_queries(2):
+        timeline = event_admin.get_timeline(events[3])
+    assert [e.message for e in timeline["event_list"]] == [
+        "Event 1",
+        "Event 2",
+        "Event 3",
+        "Event 4",
+        "Event 5",
+    ]
+    assert [e.timestamp_delay for e in timeline["event_list"]] == ["1m later"] * 5
+    assert timeline["earlier_event"].pk == events[1].pk
+    assert timeline["later_event"].pk == events[5].pk
+
+    # The first event of a group has no delay.
+    timeline = event_admin.get_timeline(events[0])
+    assert [e.message for e in timeline["event_list"]] == [
+        "Event 0",
+        "Event 1",
+        "Event 2",
+    ]
+    assert timeline["event_list"][0].timestamp_delay is None
+    assert timeline["earlier_event"] is None
+    assert timeline["later_event"].pk == events[2].pk
+
+    changeform_url = reverse("admin:eventlog_event_change", args=(events[3].pk,))
+    response = admin_client.get(changeform_url)
+    assertContains(response, "Show earlier events")
+    assertContains(response, "Show later events")
+    assertNotContains(response, "Event 0")
+    assertNotContains(response, "Event 6")
+
+
+@pytest.mark.django_db
+def test_admin_changelist_search(
+    admin_client: Client, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Search fields can use exact and prefix lookups."""
+    EventGroup(group_id="abc").info("Hello World 1", initiator="Mailer")
+    EventGroup(group_id="abcdef").info("Hello World 2", initiator="The Mailer")
+
+    monkeypatch.setattr(
+        EventGroup().config, "admin_search_fields", ("=group", "^initiator", "@message")
+    )
+    changelist_url = reverse("admin:eventlog_event_changelist")
+
+    response = admin_client.get(changelist_url, {"q": "abc"})
+    assertContains(response, "Hello World 1")
+    assertNotContains(response, "Hello World 2")
+
+    # Exact group matches are case-sensitive, so they can use the index.
+    response = admin_client.get(changelist_url, {"q": "ABC"})
+    assertNotContains(response, "Hello World 1")
+
+    response = admin_client.get(changelist_url, {"q": "Mail"})
+    assertContains(response, "Hello World 1")
+    assertNotContains(response, "Hello World 2")
+
+    # Full-text search falls back to a "contains" lookup on SQLite.
+    response = admin_client.get(changelist_url, {"q": "World 2"})
+    assertNotContains(response, "Hello World 1")
+    assertContains(response, "Hello World 2")
+
+
+@pytest.mark.django_db
+def test_admin_changelist_estimated_count(
+    admin_client: Client, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Large tables use the estimated count for the pagination."""
+    from eventlog import admin
+
+    e = EventGroup()
+    e.info("Hello World")
+    changelist_url = reverse("admin:eventlog_event_changelist")
+
+    # SQLite has no estimates, so the exact count is used.
+    monkeypatch.setattr(e.config, "admin_estimated_count", 0)
+    assert admin.estimate_count(Event.objects.all()) is None
+    response = admin_client.get(changelist_url)
+    assert response.context["cl"].result_count == 1
+    assert not response.context["cl"].show_full_result_count
+
+    monkeypatch.setattr(admin, "estimate_count", lambda _: 1_000_000)
+    response = admin_client.get(changelist_url)
+    assert response.context["cl"].result_count == 1_000_000
+
+    # Below the threshold, the exact count is used.
+    monkeypatch.setattr(e.config, "admin_estimated_count", 10_000_000)
+    response = admin_client.get(changelist_url)
+    assert response.context["cl"].result_count == 1
+
+
+@pytest.mark.django_db
+def test_admin_changelist_type_filter(
+    admin_client: Client, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """The type filter lists the configured types, without a DISTINCT query."""
+    from django.core.cache import cache
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    e = EventGroup()
+    e.info("Hello World 1")
+    e.error("Hello World 2")
+    e.error("Hello World 3")
+    changelist_url = reverse("admin:eventlog_event_changelist")
+
+    with CaptureQueriesContext(connection) as queries:
+        response = admin_client.get(changelist_url, {"type": "error"})
+    assert not any("DISTINCT" in q["sql"] for q in queries.captured_queries)
+    assertContains(response, "Critical")
+    assertNotContains(response, "Hello World 1")
+    assertContains(response, "Hello World 2")
+
+    # Counts per type are cached.
+    cache.clear()
+    monkeypatch.setattr(e.config, "admin_type_counts", 60)
+    response = admin_client.get(changelist_url)
+    assertContains(response, "Error (2)")
+    assertContains(response, "Critical (0)")
+
+    e.error("Hello World 4")
+    response = admin_client.get(changelist_url)
+    assertContains(response, "Error (2)")
+    cache.clear()
+
+
+def test_event_type_fallback() -> None:
+    """Unknown event types get a cached fallback type."""
+    event_types = EventTypeList(EventType(name="info", label="Info"))
+    assert event_types.by_name_or_fallback("info") is event_types.by_name("info")
+
+    fallback = event_types.by_name_or_fallback("legacy_event")
+    assert fallback.label == "Legacy_Event"
+    assert event_types.by_name_or_fallback("legacy_event") is fallback
+    assert event_types.by_name("legacy_event") is None
+
+    legacy = EventType(name="legacy_event", label="Legacy")
+    event_types.add(legacy)
+    assert event_types.by_name_or_fallback("legacy_event") is legacy
+
+    assert Event(type="legacy_event").html_label == (
+        '<span class="eventType" style=" ">Legacy_Event</span>'
+    )
+
+
+@pytest.mark.django_db
+def test_type_timestamp_index() -> None:
+    """Querying events of a type within a time range uses an index."""
+    plan = Event.objects.filter(
+        type="error", timestamp__gte=timezone.now() - timedelta(hours=1)
+    ).explain()
+    assert "eventlog_ev_type_6d82d2_idx" in plan
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from typing import Iterator
+
+import pytest
+
+from eventlog.events import EventGroup
+from eventlog.limits import stats
+from eventlog.models import Event
+
+
+@pytest.fixture
+def e(monkeypatch: pytest.MonkeyPatch) -> Iterator[EventGroup]:
+    """An EventGroup with payload limits, and reset statistics."""
+    e = EventGroup()
+    monkeypatch.setattr(e.config, "max_message_bytes", 10)
+    monkeypatch.setattr(e.config, "max_data_bytes", 30)
+    monkeypatch.setattr(e.config, "max_data_depth", 2)
+    stats.reset()
+    yield e
+    stats.reset()
+
+
+@pytest.mark.django_db
+def test_within_limits(e: EventGroup) -> None:
+    """Events within the limits are stored as they are."""
+    e.info("Hello", data={"foo": ["bar"]})
+
+    event = Event.objects.get()
+    assert event.message == "Hello"
+    assert event.data == {"foo": ["bar"]}
+    assert not event.truncated
+    assert stats.as_dict() == {"messages": 0, "data": 0, "rejected": 0}
+
+
+@pytest.mark.django_db
+def test_truncate(e: EventGroup) -> None:
+    """Messages and data exceeding the limits are truncated."""
+    e.info("Hello Wörld, how are you?")
+    e.info("Hello", data={"foo": {"bar": {"baz": 1}}})
+    e.info("Hello", data={"foo": "x" * 100})
+
+    message, depth, size = Event.objects.order_by("pk")
+    assert message.message == "Hello Wör"
+    assert depth.data == {"foo": {"bar": "..."}}
+    assert size.data == '{"foo": "xxxxxxxxxxxxxxxxxxxxx'
+    assert all((message.truncated, depth.truncated, size.truncated))
+    assert stats.as_dict() == {"messages": 1, "data": 2, "rejected": 0}
+
+
+@pytest.mark.django_db
+def test_summarize(e: EventGroup, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Data exceeding the size limit is summarized."""
+    monkeypatch.setattr(e.config, "oversize_policy", "summarize")
+    e.info("Hello", data={"foo": "x" * 100})
+    e.info("Hello", data=["x" * 100])
+
+    first, second = Event.objects.order_by("pk")
+    assert first.data == {
+        "summary": True,
+        "type": "dict",
+        "bytes": 111,
+        "keys": ["foo"],
+    }
+    assert second.data == {"summary": True, "type": "list", "bytes": 104, "length": 1}
+    assert first.truncated
+
+
+@pytest.mark.django_db
+def test_reject(e: EventGroup, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Events exceeding a limit are rejected."""
+    monkeypatch.setattr(e.config, "oversize_policy", "reject")
+    e.info("Hello Wörld, how are you?")
+    e.info("Hello")
+
+    assert Event.objects.get().message == "Hello"
+    assert stats.rejected == 1
+
+
+def test_invalid_policy(e: EventGroup, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Unknown policies raise an error."""
+    monkeypatch.setattr(e.config, "oversize_policy", "yolo")
+    with pytest.raises(TypeError):
+        e.info("Hello")
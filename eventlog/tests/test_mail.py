@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+import pytest
+from django.apps import apps
+from django.core import mail
+from django.utils import translation
+
+from eventlog import EventGroup
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from django.core.mail import EmailMessage
+
+    from eventlog.apps import EventLogConfig
+
+
+@pytest.fixture
+def config() -> EventLogConfig:
+    return apps.get_app_config("eventlog")
+
+
+@pytest.fixture
+def connections(monkeypatch: pytest.MonkeyPatch) -> list[Any]:
+    """Connections opened to send emails."""
+    opened = []
+
+    def get_connection(**kwargs: Any) -> Any:
+        opened.append(mail.get_connection(**kwargs))
+        return opened[-1]
+
+    monkeypatch.setattr("eventlog.mail.get_connection", get_connection)
+    return opened
+
+
+@pytest.fixture
+def mail_queue(
+    config: EventLogConfig, monkeypatch: pytest.MonkeyPatch
+) -> Iterator[None]:
+    monkeypatch.setattr(config, "mail_queue", True)
+    monkeypatch.setattr(config, "_mail_dispatcher", None)
+    yield
+    config.get_mail_dispatcher().shutdown()
+
+
+@pytest.mark.django_db
+def test_mail(mailoutbox: list[EmailMessage]) -> None:
+    """An email is sent per event, with a HTML alternative."""
+    e = EventGroup()
+    e.critical("Server on fire", initiator="Monitoring", send_mail="user@example.com")
+
+    (message,) = mailoutbox
+    assert message.subject == "Event Log: Critical"
+    assert message.to == ["user@example.com"]
+    assert "Server on fire\n\n-- Monitoring" in message.body
+    assert message.alternatives[0][0].startswith("<html><body><p>The Event")
+
+
+@pytest.mark.django_db
+def test_mail_batch_connection(
+    mailoutbox: list[EmailMessage], connections: list[Any]
+) -> None:
+    """The emails of a batch are sent over a single connection."""
+    e = EventGroup(send_mail="user@example.com")
+    with e.batch():
+        for i in range(5):
+            e.error(f"Error {i}")
+
+    assert len(mailoutbox) == 5
+    assert len(connections) == 1
+
+
+@pytest.mark.django_db
+def test_mail_digest(
+    config: EventLogConfig,
+    monkeypatch: pytest.MonkeyPatch,
+    mailoutbox: list[EmailMessage],
+) -> None:
+    """In digest mode, the events for the same recipient are combined."""
+    monkeypatch.setattr(config, "mail_digest_window", 0)
+
+    e = EventGroup(send_mail="user@example.com")
+    with e.batch():
+        e.info("Hello World")
+        e.error("Hello Mars")
+        e.critical("Hello Venus", send_mail="other@example.com")
+        e.warning("Hello Jupiter")
+
+    first, second = sorted(mailoutbox, key=lambda m: m.to)
+    assert first.to == ["other@example.com"]
+    assert first.subject == "Event Log: Critical"
+    assert second.to == ["user@example.com"]
+    assert second.subject == "Event Log: 3 events"
+    assert second.body.count("The Event was") == 3
+    assert "Hello Mars" in second.body
+    assert "----" in second.body
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("mail_queue")
+def test_mail_queue(config: EventLogConfig, connections: list[Any]) -> None:
+    """Emails are sent by a background thread."""
+    e = EventGroup(send_mail="user@example.com")
+    for i in range(3):
+        e.error(f"Error {i}")
+
+    config.get_mail_dispatcher().flush()
+    assert len(mail.outbox) == 3
+    assert config.get_mail_dispatcher().stats()["flushed"] == 3
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("mail_queue")
+def test_mail_queue_digest(
+    config: EventLogConfig, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """The mail queue collects emails within the digest window."""
+    monkeypatch.setattr(config, "mail_digest_window", 0.5)
+
+    e = EventGroup(send_mail="user@example.com")
+    for i in range(3):
+        e.error(f"Error {i}")
+
+    config.get_mail_dispatcher().flush()
+    (message,) = mail.outbox
+    assert message.subject == "Event Log: 3 events"
+
+
+@pytest.mark.django_db
+def test_mail_template_context(
+    config: EventLogConfig,
+    monkeypatch: pytest.MonkeyPatch,
+    mailoutbox: list[EmailMessage],
+) -> None:
+    """The `type` variable is the event type, rendered as its label."""
+    monkeypatch.setattr(config, "_mail_templates", None)
+    monkeypatch.setattr(
+        config, "email_subject_template", "{type} {type.name} {type.label} {type_label}"
+    )
+    EventGroup().critical("Server on fire", send_mail="user@example.com")
+
+    (message,) = mailoutbox
+    assert message.subject == "Critical critical Critical Critical"
+
+
+def test_mail_templates(
+    config: EventLogConfig, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Templates are translated once per language."""
+    monkeypatch.setattr(config, "_mail_templates", None)
+
+    templates = config.get_mail_templates()
+    assert config.get_mail_templates() is templates
+    with translation.override("de"):
+        assert config.get_mail_templates() is not templates
+    assert templates[2](count=2) == "Event Log: 2 events"
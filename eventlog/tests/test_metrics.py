@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from typing import TYPE_CHECKING
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.apps import apps
+from django.db import DatabaseError
+from django.db.models import QuerySet
+
+from eventlog.events import EventGroup
+from eventlog.metrics import InMemoryMetrics
+from eventlog.models import Event
+
+if TYPE_CHECKING:
+    from django.test import Client
+
+
+@pytest.fixture
+def metrics(monkeypatch: pytest.MonkeyPatch) -> InMemoryMetrics:
+    config = apps.get_app_config("eventlog")
+    monkeypatch.setattr(config, "metrics_class", InMemoryMetrics)
+    monkeypatch.setattr(config, "_metrics", None)
+    return config.get_metrics()
+
+
+def test_disabled() -> None:
+    """Metrics are disabled by default."""
+    assert apps.get_app_config("eventlog").get_metrics() is None
+    assert EventGroup().metrics is None
+
+
+def test_metrics_created_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Threads asking for the collector at the same time share one instance."""
+
+    class SlowMetrics(InMemoryMetrics):
+        def __init__(self) -> None:
+            time.sleep(0.05)
+            super().__init__()
+
+    config = apps.get_app_config("eventlog")
+    monkeypatch.setattr(config, "metrics_class", SlowMetrics)
+    monkeypatch.setattr(config, "_metrics", None)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        collectors = list(executor.map(lambda _: config.get_metrics(), range(4)))
+    assert len({id(collector) for collector in collectors}) == 1
+
+
+@pytest.mark.django_db
+def test_metrics(metrics: InMemoryMetrics) -> None:
+    """Events, emails and durations are recorded."""
+    e = EventGroup()
+    e.info("Hello World")
+    e.info("Hello World", data={"obj": object()})
+    e.error("Hello World", send_mail="user@example.com")
+    with e.batch():
+        e.info("Hello World")
+        e.info("Hello World")
+
+    result = metrics.as_dict()
+    assert result["events"] == {"info": 4, "error": 1}
+    assert result["mails"] == {"error": 1}
+    assert result["serialize_fallbacks"] == {"": 1}
+    assert result["write"]["count"] == 4
+    assert result["write"]["max"] <= result["write"]["sum"]
+    # Only the data of one event was not None.
+    assert result["serialize"]["count"] == 1
+    assert result["mail"]["count"] == 1
+
+    metrics.reset()
+    assert metrics.as_dict() == {}
+
+
+@pytest.mark.django_db
+def test_metrics_async(metrics: InMemoryMetrics) -> None:
+    e = EventGroup()
+    async_to_sync(e.ainfo)("Hello World")
+    assert metrics.as_dict()["events"] == {"info": 1}
+    assert metrics.as_dict()["write"]["count"] == 1
+
+
+@pytest.mark.django_db
+def test_metrics_limits(
+    metrics: InMemoryMetrics, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Truncated and rejected events are counted."""
+    config = apps.get_app_config("eventlog")
+    monkeypatch.setattr(config, "max_message_bytes", 5)
+
+    e = EventGroup()
+    e.info("Hello World")
+    monkeypatch.setattr(config, "oversize_policy", "reject")
+    e.info("Hello World")
+
+    result = metrics.as_dict()
+    assert result["events"] == {"info": 1}
+    assert result["truncated"] == {"info": 1}
+    assert result["rejected"] == {"info": 1}
+
+
+@pytest.mark.django_db
+def test_metrics_failures(
+    metrics: InMemoryMetrics, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Failed writes and emails are counted."""
+
+    def fail(*args: object, **kwargs: object) -> None:
+        raise DatabaseError
+
+    e = EventGroup()
+    with monkeypatch.context() as m:
+        m.setattr(Event, "save", fail)
+        m.setattr(QuerySet, "bulk_create", fail)
+        with pytest.raises(DatabaseError):
+            e.info("Hello World")
+
+        e.buffered = True
+        e.info("Hello World")
+        e.info("Hello World")
+        with pytest.raises(DatabaseError):
+            e.flush()
+
+    monkeypatch.setattr(
+        "django.core.mail.backends.locmem.EmailBackend.send_messages",
+        lambda *_: 0,
+    )
+    e.buffered = False
+    e.error("Hello World", send_mail="user@example.com")
+
+    result = metrics.as_dict()
+    assert result["write_failures"] == {"": 3}
+    assert result["mail_failures"] == {"error": 1}
+    assert "write" in result
+
+
+@pytest.mark.django_db
+def test_metrics_view(client: Client, metrics: InMemoryMetrics) -> None:
+    """The metrics are exposed in the Prometheus text format."""
+    e = EventGroup()
+    e.info("Hello World")
+    e.error("Hello World")
+
+    response = client.get("/metrics/")
+    assert response.status_code == HTTPStatus.OK
+    assert response["Content-Type"].startswith("text/plain")
+    text = response.content.decode()
+    assert "# TYPE eventlog_events_total counter\n" in text
+    assert 'eventlog_events_total{type="info"} 1\n' in text
+    assert 'eventlog_events_total{type="error"} 1\n' in text
+    assert "eventlog_write_seconds_count 2\n" in text
+
+
+def test_metrics_view_disabled(client: Client) -> None:
+    assert client.get("/metrics/").status_code == HTTPStatus.NOT_FOUND
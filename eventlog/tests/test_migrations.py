@@ -1,8 +1,19 @@
+from __future__ import annotations
+
 from io import StringIO
+from typing import TYPE_CHECKING
 
 import pytest
+from django.conf import settings
 from django.core.management import call_command
-from pytest_django.fixtures import SettingsWrapper
+from django.db import connections
+from django.db.migrations.loader import MigrationLoader
+
+from eventlog.db import FULL_TEXT_CONFIG
+from eventlog.models import Event
+
+if TYPE_CHECKING:
+    from pytest_django.fixtures import SettingsWrapper
 
 
 @pytest.mark.django_db
@@ -42,3 +53,77 @@ def test_no_pending_migrations_if_autofield_differs(settings: SettingsWrapper) -
     """
     settings.DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
     test_no_pending_migrations()
+
+
+@pytest.mark.skipif(
+    "postgresql" not in settings.DATABASES, reason="Requires EVENTLOG_TEST_POSTGRESQL"
+)
+@pytest.mark.django_db(databases=["default", "postgresql"], transaction=True)
+def test_add_index_concurrently() -> None:
+    """The (type, timestamp) index is created concurrently on PostgreSQL."""
+    connection = connections["postgresql"]
+    loader = MigrationLoader(connection)
+    migration = loader.get_migration("eventlog", "0008_event_type_timestamp_index")
+    operation = migration.operations[0]
+    before = loader.project_state(("eventlog", "0007_event_truncated"))
+    after = loader.project_state(("eventlog", "0008_event_type_timestamp_index"))
+
+    def indexes() -> set[str]:
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(
+                cursor, "eventlog_event"
+            )
+        return {name for name, c in constraints.items() if c["index"]}
+
+    assert operation.index.name in indexes()
+    with connection.schema_editor(atomic=False, collect_sql=False) as editor:
+        operation.database_backwards("eventlog", editor, after, before)
+    assert operation.index.name not in indexes()
+    with connection.schema_editor(atomic=False, collect_sql=False) as editor:
+        operation.database_forwards("eventlog", editor, before, after)
+    assert operation.index.name in indexes()
+
+
+@pytest.mark.skipif(
+    "postgresql" not in settings.DATABASES, reason="Requires EVENTLOG_TEST_POSTGRESQL"
+)
+@pytest.mark.django_db(databases=["default", "postgresql"], transaction=True)
+def test_add_full_text_index() -> None:
+    """
+    The full-text index of the message is created concurrently on PostgreSQL,
+    and used by the full-text search of the admin.
+    """
+    connection = connections["postgresql"]
+    loader = MigrationLoader(connection)
+    migration = loader.get_migration("eventlog", "0012_event_message_full_text_index")
+    operation = migration.operations[0]
+    before = loader.project_state(("eventlog", "0011_event_rollup"))
+    after = loader.project_state(("eventlog", "0012_event_message_full_text_index"))
+
+    def indexes() -> set[str]:
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(
+                cursor, "eventlog_event"
+            )
+        return {name for name, c in constraints.items() if c["index"]}
+
+    assert operation.name in indexes()
+    with connection.schema_editor(atomic=False, collect_sql=False) as editor:
+        operation.database_backwards("eventlog", editor, after, before)
+    assert operation.name not in indexes()
+    with connection.schema_editor(atomic=False, collect_sql=False) as editor:
+        operation.database_forwards("eventlog", editor, before, after)
+    assert operation.name in indexes()
+
+    # The lookup of "@message" in the admin search.
+    from django.contrib.postgres.search import SearchQuery
+
+    queryset = Event.objects.using("postgresql").filter(
+        message__search=SearchQuery("refused", config=FULL_TEXT_CONFIG)
+    )
+    with connection.cursor() as cursor:
+        cursor.execute("SET enable_seqscan = off")
+        try:
+            assert operation.name in queryset.explain()
+        finally:
+            cursor.execute("RESET enable_seqscan")
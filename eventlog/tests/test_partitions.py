@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from django.apps import apps
+from django.conf import settings
+from django.core.management import CommandError, call_command
+from django.db import connections
+
+from eventlog import partitions
+from eventlog.models import Event
+
+
+def test_interval_start() -> None:
+    """The start of an interval is the start of the day or month, in UTC."""
+    dt = datetime(2024, 2, 29, 13, 37, tzinfo=timezone.utc)
+    assert partitions.interval_start(dt, "day") == datetime(
+        2024, 2, 29, tzinfo=timezone.utc
+    )
+    assert partitions.interval_start(dt, "month") == datetime(
+        2024, 2, 1, tzinfo=timezone.utc
+    )
+
+    with pytest.raises(TypeError):
+        partitions.interval_start(dt, "year")
+
+
+def test_next_interval() -> None:
+    """The next interval starts the next day or month."""
+    start = datetime(2024, 12, 31, tzinfo=timezone.utc)
+    assert partitions.next_interval(start, "day") == datetime(
+        2025, 1, 1, tzinfo=timezone.utc
+    )
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    assert partitions.next_interval(start, "month") == datetime(
+        2024, 2, 1, tzinfo=timezone.utc
+    )
+
+
+def test_partition_name() -> None:
+    """Partition names contain their start and can be parsed again."""
+    start = datetime(2024, 3, 1, tzinfo=timezone.utc)
+    for interval, name in (
+        ("month", "eventlog_event_p202403"),
+        ("day", "eventlog_event_p20240301"),
+    ):
+        assert partitions.partition_name("eventlog_event", start, interval) == name
+        assert partitions.parse_partition_name("eventlog_event", name) == (
+            start,
+            interval,
+        )
+
+    assert (
+        partitions.parse_partition_name("eventlog_event", "eventlog_event_legacy")
+        is None
+    )
+
+
+def test_create_partition_sql() -> None:
+    """Partitions cover the range of their interval."""
+    start = datetime(2024, 3, 1, tzinfo=timezone.utc)
+    assert partitions.create_partition_sql("eventlog_event", start, "month") == (
+        'CREATE TABLE IF NOT EXISTS "eventlog_event_p202403" '
+        'PARTITION OF "eventlog_event" '
+        "FOR VALUES FROM ('2024-03-01T00:00:00+00:00') "
+        "TO ('2024-04-01T00:00:00+00:00')"
+    )
+
+
+def test_partition_command_requires_postgresql() -> None:
+    """Partitioning is not supported on other databases."""
+    with pytest.raises(CommandError):
+        call_command("eventlog_partition")
+
+    with pytest.raises(CommandError):
+        call_command("eventlog_partition", "--setup")
+
+
+@pytest.mark.skipif(
+    "postgresql" not in settings.DATABASES, reason="Requires EVENTLOG_TEST_POSTGRESQL"
+)
+@pytest.mark.django_db(databases=["default", "postgresql"])
+def test_partitioning_postgresql(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Convert the event table, then create and drop partitions. The changes
+    are rolled back with the test transaction.
+    """
+    monkeypatch.setattr(apps.get_app_config("eventlog"), "database", "postgresql")
+    events = Event.objects.using("postgresql")
+    now = datetime(2026, 10, 18, 12, tzinfo=timezone.utc)
+    old = events.create(type="info", message="Before", timestamp=now)
+
+    connection = connections["postgresql"]
+    with connection.cursor() as cursor:
+        for sql in partitions.setup_sql(now, "month"):
+            cursor.execute(sql)
+
+    # The current interval is held by the legacy partition.
+    assert partitions.create_partitions(now, "month", 2) == [
+        "eventlog_event_p202611",
+        "eventlog_event_p202612",
+    ]
+    # Running it again is a no-op.
+    partitions.create_partitions(now, "month", 2)
+
+    new = events.create(
+        type="info", message="After", timestamp=now + timedelta(days=20)
+    )
+    assert new.pk > old.pk
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT tableoid::regclass::text, "message" FROM "eventlog_event" '
+            'ORDER BY "id"'
+        )
+        assert cursor.fetchall() == [
+            ("eventlog_event_legacy", "Before"),
+            ("eventlog_event_p202611", "After"),
+        ]
+
+    later = now + timedelta(days=60)
+    assert partitions.drop_partitions(later) == ["eventlog_event_p202611"]
+    assert list(events.values_list("message", flat=True)) == ["Before"]
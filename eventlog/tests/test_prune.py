@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.utils import timezone
+
+from eventlog.models import Event
+from eventlog.prune import prune_events
+
+
+@pytest.fixture
+def events() -> None:
+    """Three events per type, 1, 10 and 100 days old."""
+    now = timezone.now()
+    for event_type in ("info", "error", "critical"):
+        for days in (1, 10, 100):
+            Event.objects.create(
+                type=event_type,
+                group="abc",
+                message=f"{days} days old",
+                timestamp=now - timedelta(days=days),
+            )
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("events")
+def test_prune() -> None:
+    """Events are deleted per type and retention."""
+    progress = []
+    results = prune_events(
+        {"info": 5, "critical": None, "*": 50},
+        chunk_size=1,
+        progress=lambda name, count: progress.append((name, count)),
+    )
+
+    assert results == {"info": 2, "*": 1}
+    assert progress == [("info", 1), ("info", 2), ("*", 1)]
+    assert Event.objects.filter(type="info").count() == 1
+    assert Event.objects.filter(type="error").count() == 2
+    assert Event.objects.filter(type="critical").count() == 3
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("events")
+def test_prune_dry_run() -> None:
+    """A dry run only counts the events."""
+    results = prune_events({"*": 5}, dry_run=True)
+
+    assert results == {"*": 6}
+    assert Event.objects.count() == 9
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("events")
+def test_prune_config_retention(monkeypatch: pytest.MonkeyPatch) -> None:
+    """The retention defaults to the one defined in the config."""
+    from eventlog.events import EventGroup
+
+    monkeypatch.setattr(EventGroup().config, "retention", {"error": 5})
+
+    assert prune_events() == {"error": 2}
+    assert Event.objects.count() == 7
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("events")
+def test_prune_command() -> None:
+    """The prune command deletes events and reports the progress."""
+    out = StringIO()
+    call_command(
+        "eventlog_prune",
+        "--keep=*=5",
+        "--keep=critical=forever",
+        "--sleep=0.001",
+        "--chunk-size=1",
+        verbosity=2,
+        stdout=out,
+    )
+
+    assert "*: 1 events deleted so far..." in out.getvalue()
+    assert "*: 4 events deleted." in out.getvalue()
+    assert Event.objects.count() == 5
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("events")
+def test_prune_command_dry_run() -> None:
+    """A dry run with the prune command doesn't delete any event."""
+    out = StringIO()
+    call_command("eventlog_prune", "--keep=info=5", "--dry-run", stdout=out)
+
+    assert "info: 2 events would be deleted." in out.getvalue()
+    assert Event.objects.count() == 9
+
+
+def test_prune_command_no_retention() -> None:
+    """Without any retention, nothing is deleted."""
+    out = StringIO()
+    call_command("eventlog_prune", stdout=out)
+    assert "No retention defined" in out.getvalue()
+
+
+def test_prune_command_invalid_retention() -> None:
+    """Invalid retention arguments raise an error."""
+    with pytest.raises(CommandError):
+        call_command("eventlog_prune", "--keep=info=yolo")
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from eventlog import EventQuery
+from eventlog.models import Event
+
+
+@pytest.fixture
+def events() -> list[Event]:
+    """Ten events, one minute apart, in two groups."""
+    now = timezone.now()
+    return [
+        Event.objects.create(
+            type=("info", "error", "critical")[i % 3],
+            group="abc" if i % 2 else "def",
+            message=f"Event {i}",
+            data={"i": i},
+            timestamp=now - timedelta(minutes=10 - i),
+        )
+        for i in range(10)
+    ]
+
+
+def query_plan(func: object, *args: object, **kwargs: object) -> str:
+    """The SQLite query plan of the single query run by the function."""
+    with CaptureQueriesContext(connection) as ctx:
+        func(*args, **kwargs)
+    (query,) = ctx.captured_queries
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN QUERY PLAN {query['sql']}")
+        return " ".join(str(row[-1]) for row in cursor.fetchall())
+
+
+@pytest.mark.django_db
+def test_timeline(events: list[Event]) -> None:
+    query = EventQuery()
+    timeline = query.timeline("abc")
+    assert [e.message for e in timeline] == [f"Event {i}" for i in (1, 3, 5, 7, 9)]
+
+    timeline = query.timeline("abc", limit=2, after=(events[3].timestamp, events[3].pk))
+    assert [e.message for e in timeline] == ["Event 5", "Event 7"]
+    timeline = query.timeline("abc", since=events[6].timestamp)
+    assert [e.message for e in timeline] == ["Event 7", "Event 9"]
+
+    # Only the requested fields are fetched.
+    assert "data" in timeline[0].get_deferred_fields()
+    timeline = query.timeline("abc", fields=("timestamp", "data"))
+    assert timeline[0].get_deferred_fields() >= {"message", "type"}
+
+    plan = query_plan(query.timeline, "abc", since=events[0].timestamp)
+    assert "USING INDEX eventlog_ev_group_" in plan
+
+
+@pytest.mark.django_db
+def test_latest(events: list[Event]) -> None:
+    query = EventQuery()
+    assert [e.message for e in query.latest(limit=3)] == [
+        "Event 9",
+        "Event 8",
+        "Event 7",
+    ]
+
+    latest = query.latest(types=["error"], limit=2)
+    assert [e.message for e in latest] == ["Event 7", "Event 4"]
+    latest = query.latest(types=["error"], before=(latest[-1].timestamp, latest[-1].pk))
+    assert [e.message for e in latest] == ["Event 1"]
+
+    assert "USING INDEX eventlog_ev_type_" in query_plan(query.latest, types=["info"])
+    assert "USING INDEX eventlog_ev_timesta" in query_plan(query.latest)
+
+
+@pytest.mark.django_db
+def test_counts_by_type(events: list[Event]) -> None:
+    query = EventQuery()
+    assert query.counts_by_type() == {"info": 4, "error": 3, "critical": 3}
+    assert query.counts_by_type(window=timedelta(minutes=3, seconds=30)) == {
+        "info": 1,
+        "error": 1,
+        "critical": 1,
+    }
+    assert query.counts_by_type(window=timedelta(0)) == {}
+
+
+@pytest.mark.django_db
+def test_iterate(events: list[Event]) -> None:
+    """Events are iterated in chunks, continuing after the last event."""
+    query = EventQuery()
+    with CaptureQueriesContext(connection) as ctx:
+        iterated = list(query.iterate(chunk_size=3))
+    assert [e.pk for e in iterated] == [e.pk for e in events]
+    assert len(ctx.captured_queries) == 4
+    assert "OFFSET" not in ctx.captured_queries[-1]["sql"]
+
+    checkpoint = (events[6].timestamp, events[6].pk)
+    iterated = list(query.iterate(group_id="def", after=checkpoint))
+    assert [e.message for e in iterated] == ["Event 8"]
+    iterated = list(query.iterate(types=["critical"], after=checkpoint))
+    assert [e.message for e in iterated] == ["Event 8"]
+    iterated = list(query.iterate(types=["critical"]))
+    assert [e.message for e in iterated] == ["Event 2", "Event 5", "Event 8"]
@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from io import StringIO
+from typing import TYPE_CHECKING
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.apps import apps
+from django.core.management import CommandError, call_command
+from django.urls import reverse
+from django.utils import timezone
+from pytest_django.asserts import assertContains
+
+from eventlog import EventQuery
+from eventlog.events import EventGroup
+from eventlog.models import Event, EventRollup, EventRollupWatermark
+from eventlog.rollup import rollup_events
+
+if TYPE_CHECKING:
+    from typing import Callable
+
+    from django.test import Client
+
+START = datetime(2024, 3, 1, 15, 0, tzinfo=dt_timezone.utc)
+
+
+def set_mode(monkeypatch: pytest.MonkeyPatch, mode: str | None) -> None:
+    monkeypatch.setattr(apps.get_app_config("eventlog"), "rollup", mode)
+
+
+def counts() -> dict[tuple[datetime, str], int]:
+    return {(r.bucket, r.type): r.count for r in EventRollup.objects.all()}
+
+
+def create_events() -> None:
+    """Events within two minutes, two hours and two days."""
+    for minutes, event_type in (
+        (0, "info"),
+        (0, "info"),
+        (0, "error"),
+        (1, "info"),
+        (90, "info"),
+        (60 * 24, "error"),
+    ):
+        Event.objects.create(
+            type=event_type,
+            group="abc",
+            message="Hello World",
+            timestamp=START + timedelta(minutes=minutes, seconds=30),
+        )
+
+
+@pytest.mark.django_db
+def test_rollup_write(
+    monkeypatch: pytest.MonkeyPatch, django_capture_on_commit_callbacks: Callable
+) -> None:
+    """
+    In "write" mode, rollups are updated with each written event, once the
+    transaction is committed.
+    """
+    set_mode(monkeypatch, "write")
+    e = EventGroup()
+    with django_capture_on_commit_callbacks(execute=True):
+        e.info("First")
+        with e.batch():
+            e.info("Second")
+            e.error("Third")
+        async_to_sync(e.ainfo)("Fourth")
+        assert not EventRollup.objects.exists()
+
+    assert sum(r.count for r in EventRollup.objects.filter(type="info")) == 3
+    assert sum(r.count for r in EventRollup.objects.filter(type="error")) == 1
+    for rollup in EventRollup.objects.all():
+        assert rollup.bucket.second == 0
+        assert rollup.bucket.microsecond == 0
+
+
+@pytest.mark.django_db
+def test_rollup_disabled() -> None:
+    EventGroup().info("Hello World")
+    assert not EventRollup.objects.exists()
+
+
+@pytest.mark.django_db
+def test_rollup_command(monkeypatch: pytest.MonkeyPatch) -> None:
+    """In "command" mode, events above the watermark are counted."""
+    set_mode(monkeypatch, "command")
+    create_events()
+    assert not EventRollup.objects.exists()
+
+    assert rollup_events(chunk_size=2) == 6
+    expected = {
+        (START, "info"): 2,
+        (START, "error"): 1,
+        (START + timedelta(minutes=1), "info"): 1,
+        (START + timedelta(minutes=90), "info"): 1,
+        (START + timedelta(days=1), "error"): 1,
+    }
+    assert counts() == expected
+    last_id = Event.objects.order_by("-pk").first().pk
+    assert EventRollupWatermark.objects.get().last_event_id == last_id
+
+    # Only new events are counted by the next run.
+    assert rollup_events() == 0
+    Event.objects.create(type="info", message="New", timestamp=START)
+    stdout = StringIO()
+    call_command("eventlog_rollup", stdout=stdout)
+    assert stdout.getvalue() == "1 events counted.\n"
+    assert counts()[START, "info"] == 3
+
+    # A rebuild counts all events again.
+    EventRollup.objects.all().delete()
+    assert rollup_events(rebuild=True) == 7
+    assert counts()[START, "info"] == 3
+
+
+@pytest.mark.django_db
+def test_rollup_command_late_commit(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Events committed after an event with a higher id was counted are counted
+    by the next run, if they were logged within `rollup_grace` seconds.
+    """
+    set_mode(monkeypatch, "command")
+    now = timezone.now()
+    minute = now.replace(second=0, microsecond=0)
+    Event.objects.create(pk=10, type="info", message="Hello World", timestamp=now)
+    Event.objects.create(pk=20, type="info", message="Hello World", timestamp=now)
+    assert rollup_events() == 2
+
+    # Committed late, below the watermark.
+    Event.objects.create(pk=15, type="info", message="Hello World", timestamp=now)
+    Event.objects.create(pk=16, type="info", message="Hello World", timestamp=START)
+    Event.objects.create(pk=30, type="info", message="Hello World", timestamp=now)
+    assert rollup_events() == 1
+    assert counts() == {(minute, "info"): 4}
+
+    # Counting the minute again doesn't count events twice.
+    assert rollup_events() == 0
+    assert counts() == {(minute, "info"): 4}
+
+
+@pytest.mark.django_db
+def test_rollup_command_errors(monkeypatch: pytest.MonkeyPatch) -> None:
+    with pytest.raises(CommandError, match="Rollups are disabled"):
+        call_command("eventlog_rollup")
+
+    set_mode(monkeypatch, "write")
+    with pytest.raises(CommandError, match="use --rebuild"):
+        call_command("eventlog_rollup")
+
+    create_events()
+    stdout = StringIO()
+    call_command("eventlog_rollup", "--rebuild", stdout=stdout)
+    assert stdout.getvalue() == "6 events counted.\n"
+
+
+@pytest.mark.django_db
+def test_rates(monkeypatch: pytest.MonkeyPatch) -> None:
+    set_mode(monkeypatch, "command")
+    create_events()
+    rollup_events()
+    query = EventQuery()
+
+    assert query.rates("minute", until=START + timedelta(minutes=2)) == [
+        (START, "error", 1),
+        (START, "info", 2),
+        (START + timedelta(minutes=1), "info", 1),
+    ]
+    assert query.rates(types=["info"], until=START + timedelta(days=1)) == [
+        (START, "info", 3),
+        (START + timedelta(hours=1), "info", 1),
+    ]
+    day = timezone.localtime(START).replace(hour=0)
+    assert query.rates("day", since=START) == [
+        (day, "error", 1),
+        (day, "info", 4),
+        (day + timedelta(days=1), "error", 1),
+    ]
+
+    with pytest.raises(TypeError, match="interval must be one of"):
+        query.rates("week")
+
+
+@pytest.mark.django_db
+def test_admin_rates(
+    admin_client: Client,
+    monkeypatch: pytest.MonkeyPatch,
+    django_capture_on_commit_callbacks: Callable,
+) -> None:
+    set_mode(monkeypatch, "write")
+    e = EventGroup()
+    with django_capture_on_commit_callbacks(execute=True):
+        e.info("First")
+        e.info("Second")
+        e.error("Third")
+
+    url = reverse("admin:eventlog_event_rates")
+    response = admin_client.get(url)
+    assertContains(response, 'class="eventRateBar"', count=1)
+    assertContains(response, "<td>3</td>")
+    assertContains(response, 'value="hour" selected')
+
+    response = admin_client.get(url, {"interval": "minute"})
+    assertContains(response, 'value="minute" selected')
+    assertContains(response, "<td>3</td>")
+
+    response = admin_client.get(url, {"interval": "invalid"})
+    assertContains(response, 'value="hour" selected')
+
+    response = admin_client.get(reverse("admin:eventlog_event_changelist"))
+    assertContains(response, url)
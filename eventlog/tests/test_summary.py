@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from io import StringIO
+from typing import TYPE_CHECKING
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.apps import apps
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from pytest_django.asserts import assertContains, assertNotContains
+
+from eventlog.events import EventGroup
+from eventlog.models import Event, EventGroupSummary
+from eventlog.summary import rebuild_summaries
+
+if TYPE_CHECKING:
+    from django.test import Client
+
+
+@pytest.fixture(autouse=True)
+def group_summary(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(apps.get_app_config("eventlog"), "group_summary", True)
+
+
+def summary_values(group: str) -> dict:
+    return EventGroupSummary.objects.filter(group=group).values(
+        "event_count", "last_type", "last_message", "worst_type", "severity"
+    )[0]
+
+
+@pytest.mark.django_db
+def test_summary() -> None:
+    """The summary is updated with each written event."""
+    e = EventGroup(group_id="abc")
+    e.warning("First")
+    e.error("Second")
+    e.info("Third")
+    async_to_sync(e.ainfo)("Fourth")
+    EventGroup(group_id="def").info("Other")
+
+    assert summary_values("abc") == {
+        "event_count": 4,
+        "last_type": "info",
+        "last_message": "Fourth",
+        "worst_type": "error",
+        "severity": 3,
+    }
+    summary = EventGroupSummary.objects.get(group="abc")
+    events = Event.objects.filter(group="abc").order_by("timestamp")
+    assert summary.first_timestamp == events.first().timestamp
+    assert summary.last_timestamp == events.last().timestamp
+    assert summary_values("def")["event_count"] == 1
+
+
+@pytest.mark.django_db
+def test_summary_batch() -> None:
+    """A batch of events is aggregated before the summary is updated."""
+    e = EventGroup(group_id="abc")
+    e.info("First")
+    with e.batch():
+        e.critical("Second")
+        e.info("Third")
+        EventGroup(group_id="abc").warning("Fourth")
+
+    assert summary_values("abc") == {
+        "event_count": 4,
+        "last_type": "warning",
+        "last_message": "Fourth",
+        "worst_type": "critical",
+        "severity": 4,
+    }
+
+
+@pytest.mark.django_db
+def test_summary_disabled(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(apps.get_app_config("eventlog"), "group_summary", False)
+    EventGroup().info("Hello World")
+    assert not EventGroupSummary.objects.exists()
+
+
+@pytest.mark.django_db
+def test_rebuild_summaries(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Summaries are created from existing events."""
+    monkeypatch.setattr(apps.get_app_config("eventlog"), "group_summary", False)
+    now = timezone.now()
+    for i, event_type in enumerate(("info", "critical", "error", "unknown")):
+        Event.objects.create(
+            type=event_type,
+            group="abc",
+            message=f"Event {i}",
+            timestamp=now + timedelta(minutes=i),
+        )
+    Event.objects.create(type="info", group="def", message="Other", timestamp=now)
+    EventGroupSummary.objects.create(
+        group="old", first_timestamp=now, last_timestamp=now
+    )
+
+    assert rebuild_summaries(batch_size=1) == 2
+    assert summary_values("abc") == {
+        "event_count": 4,
+        "last_type": "unknown",
+        "last_message": "Event 3",
+        "worst_type": "critical",
+        "severity": 4,
+    }
+    assert EventGroupSummary.objects.get(group="abc").first_timestamp == now
+    assert summary_values("def")["worst_type"] == "info"
+    assert not EventGroupSummary.objects.filter(group="old").exists()
+
+    stdout = StringIO()
+    call_command("eventlog_rebuild_summaries", stdout=stdout)
+    assert stdout.getvalue() == "2 group summaries created.\n"
+
+
+@pytest.mark.django_db
+def test_admin_summary(admin_client: Client) -> None:
+    EventGroup(group_id="abc").critical("Hello Critical")
+    EventGroup(group_id="def").info("Hello Info")
+
+    url = reverse("admin:eventlog_eventgroupsummary_changelist")
+    response = admin_client.get(url)
+    assertContains(response, "Hello Critical")
+    assertContains(response, "Hello Info")
+    assertContains(response, f"{reverse('admin:eventlog_event_changelist')}?group=abc")
+
+    response = admin_client.get(url, {"worst_type": "critical", "o": "-3"})
+    assertContains(response, "Hello Critical")
+    assertNotContains(response, "Hello Info")
+
+    response = admin_client.get(
+        reverse("admin:eventlog_event_changelist"), {"group": "def"}
+    )
+    assertContains(response, "Hello Info")
+    assertNotContains(response, "Hello Critical")
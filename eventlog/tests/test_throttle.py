@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.apps import apps
+from django.core.cache import cache
+from django.urls import reverse
+from pytest_django.asserts import assertContains
+
+from eventlog.events import EventGroup
+from eventlog.metrics import InMemoryMetrics
+from eventlog.models import Event
+
+if TYPE_CHECKING:
+    from django.core.mail import EmailMessage
+    from django.test import Client
+
+
+@pytest.fixture(autouse=True)
+def throttle(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Allow two events with the same type and message per minute."""
+    cache.clear()
+    config = apps.get_app_config("eventlog")
+    monkeypatch.setattr(config, "throttle_rate", 2)
+    monkeypatch.setattr(config, "throttle_period", 60)
+
+
+@pytest.mark.django_db
+def test_throttle_drop(mailoutbox: list[EmailMessage]) -> None:
+    """Events exceeding the rate are dropped, and no emails are sent."""
+    e = EventGroup()
+    for _ in range(5):
+        e.error("Connection refused", send_mail="user@example.com")
+    e.error("Another message")
+    e.info("Connection refused")
+
+    # Throttled per group.
+    EventGroup().error("Connection refused")
+
+    assert Event.objects.filter(type="error", message="Connection refused").count() == 3
+    assert Event.objects.count() == 5
+    assert len(mailoutbox) == 2
+
+
+@pytest.mark.django_db
+def test_throttle_collapse(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Events exceeding the rate are counted in the latest event."""
+    monkeypatch.setattr(apps.get_app_config("eventlog"), "throttle_mode", "collapse")
+
+    e = EventGroup()
+    for _ in range(5):
+        e.error("Connection refused")
+    async_to_sync(e.aerror)("Connection refused")
+
+    first, latest = Event.objects.order_by("pk")
+    assert (first.occurrences, first.last_seen) == (1, None)
+    assert latest.occurrences == 5
+    assert latest.last_seen >= latest.timestamp
+
+
+@pytest.mark.django_db
+def test_throttle_collapse_groups(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Repetitions are counted in an event of the same group only."""
+    config = apps.get_app_config("eventlog")
+    monkeypatch.setattr(config, "throttle_mode", "collapse")
+    monkeypatch.setattr(config, "throttle_rate", 1)
+
+    EventGroup(group_id="A").error("Connection refused")
+    EventGroup(group_id="B").error("Connection refused")
+    EventGroup(group_id="B").error("Connection refused")
+    with EventGroup(group_id="A").batch() as e:
+        e.error("Connection refused")
+
+    assert dict(Event.objects.values_list("group", "occurrences")) == {
+        "A": 2,
+        "B": 2,
+    }
+
+
+@pytest.mark.django_db
+def test_throttle_collapse_buffered(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Repetitions are counted in the latest buffered event."""
+    monkeypatch.setattr(apps.get_app_config("eventlog"), "throttle_mode", "collapse")
+
+    e = EventGroup()
+    with e.batch():
+        for _ in range(5):
+            e.error("Connection refused")
+
+    first, latest = Event.objects.order_by("pk")
+    assert first.occurrences == 1
+    assert latest.occurrences == 4
+    assert latest.last_seen >= latest.timestamp
+
+
+@pytest.mark.django_db
+def test_throttle_collapse_missing(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Repetitions are stored if there is no earlier event to collapse into."""
+    monkeypatch.setattr(apps.get_app_config("eventlog"), "throttle_mode", "collapse")
+
+    e = EventGroup()
+    for _ in range(2):
+        e.error("Connection refused")
+    Event.objects.all().delete()
+    e.error("Connection refused")
+    e.error("Connection refused")
+
+    assert list(Event.objects.values_list("occurrences", flat=True)) == [2]
+
+
+@pytest.mark.django_db
+def test_throttle_window(monkeypatch: pytest.MonkeyPatch) -> None:
+    """The counter starts over in each period."""
+    now = [120.0]
+    monkeypatch.setattr("eventlog.throttle.time.time", lambda: now[0])
+
+    e = EventGroup()
+    for _ in range(3):
+        e.error("Connection refused")
+    now[0] += 60
+    for _ in range(3):
+        e.error("Connection refused")
+
+    assert Event.objects.count() == 4
+
+
+@pytest.mark.django_db
+def test_throttle_metrics(monkeypatch: pytest.MonkeyPatch) -> None:
+    config = apps.get_app_config("eventlog")
+    monkeypatch.setattr(config, "metrics_class", InMemoryMetrics)
+    monkeypatch.setattr(config, "_metrics", None)
+
+    e = EventGroup()
+    for _ in range(3):
+        e.error("Connection refused")
+    assert config.get_metrics().as_dict()["throttled"] == {"error": 1}
+
+
+@pytest.mark.django_db
+def test_throttle_invalid_mode(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(apps.get_app_config("eventlog"), "throttle_mode", "ignore")
+    with pytest.raises(TypeError, match="throttle_mode must be one of"):
+        EventGroup().info("Hello World")
+
+
+@pytest.mark.django_db
+def test_admin_occurrences(
+    admin_client: Client, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """The timeline shows the number of occurrences."""
+    monkeypatch.setattr(apps.get_app_config("eventlog"), "throttle_mode", "collapse")
+    e = EventGroup()
+    for _ in range(4):
+        e.error("Connection refused")
+
+    obj = Event.objects.order_by("pk").last()
+    response = admin_client.get(reverse("admin:eventlog_event_change", args=(obj.pk,)))
+    assertContains(response, "(3 times)")
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import csv
+import gzip
+import json
+from datetime import timedelta
+from io import StringIO
+from typing import TYPE_CHECKING
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.utils import timezone
+
+from eventlog.models import Event
+from eventlog.transfer import dump_events, export_events, import_events, load_events
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+@pytest.fixture
+def events() -> list[Event]:
+    """Five events, one minute apart."""
+    now = timezone.now()
+    return [
+        Event.objects.create(
+            type="error" if i % 2 else "info",
+            group="abc" if i < 3 else "def",
+            message=f"Event {i}",
+            data={"i": i},
+            timestamp=now + timedelta(minutes=i),
+        )
+        for i in range(5)
+    ]
+
+
+@pytest.mark.django_db
+def test_export_events(events: list[Event]) -> None:
+    """Events are exported ordered by timestamp and can be filtered."""
+    exported = list(export_events(chunk_size=2))
+    assert [e["message"] for e in exported] == [f"Event {i}" for i in range(5)]
+    assert exported[0]["data"] == {"i": 0}
+
+    assert len(list(export_events(group="abc"))) == 3
+    assert len(list(export_events(types=["error"]))) == 2
+    assert len(list(export_events(since=events[1].timestamp))) == 4
+    assert len(list(export_events(until=events[1].timestamp))) == 1
+
+    # Resume after a checkpoint.
+    resumed = export_events(after=(events[2].timestamp, events[2].pk))
+    assert [e["message"] for e in resumed] == ["Event 3", "Event 4"]
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("events")
+def test_dump_events() -> None:
+    """Events are written as JSON Lines or CSV."""
+    stream = StringIO()
+    last = dump_events(export_events(), stream)
+    lines = stream.getvalue().splitlines()
+    assert len(lines) == 5
+    assert json.loads(lines[0])["message"] == "Event 0"
+    assert last["message"] == "Event 4"
+
+    stream = StringIO()
+    dump_events(export_events(), stream, "csv")
+    rows = list(csv.DictReader(StringIO(stream.getvalue())))
+    assert len(rows) == 5
+    assert json.loads(rows[0]["data"]) == {"i": 0}
+
+    with pytest.raises(TypeError):
+        dump_events([], StringIO(), "xml")
+
+
+@pytest.mark.django_db
+def test_export_command(events: list[Event], tmp_path: Path) -> None:
+    """The export command writes events to stdout or files."""
+    out, err = StringIO(), StringIO()
+    call_command("eventlog_export", "--type=info", stdout=out, stderr=err)
+    assert len(out.getvalue().splitlines()) == 3
+    checkpoint = f"{events[4].timestamp.isoformat()},{events[4].pk}"
+    assert checkpoint in err.getvalue()
+
+    output = tmp_path / "events.csv.gz"
+    call_command(
+        "eventlog_export",
+        f"--output={output}",
+        f"--after={events[0].timestamp.isoformat()},{events[0].pk}",
+        stderr=StringIO(),
+    )
+    with gzip.open(output, "rt") as f:
+        assert len(list(csv.DictReader(f))) == 4
+
+    output = tmp_path / "events.jsonl"
+    err = StringIO()
+    call_command(
+        "eventlog_export",
+        f"--output={output}",
+        "--since=2000-01-01T00:00:00Z",
+        "--until=2000-01-02T00:00:00Z",
+        stderr=err,
+    )
+    assert output.read_text() == ""
+    assert "No events exported." in err.getvalue()
+
+
+def test_export_command_invalid_arguments() -> None:
+    """Invalid datetimes and checkpoints raise an error."""
+    with pytest.raises(CommandError):
+        call_command("eventlog_export", "--since=yesterday")
+
+    with pytest.raises(CommandError):
+        call_command("eventlog_export", "--after=2000-01-01T00:00:00Z")
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("fmt", ["jsonl", "csv"])
+def test_import_events(events: list[Event], fmt: str) -> None:
+    """Exported events can be imported again, keeping their timestamps."""
+    stream = StringIO()
+    dump_events(export_events(), stream, fmt)
+    Event.objects.all().delete()
+
+    stream.seek(0)
+    results = import_events(load_events(stream, fmt), batch_size=2, atomic=True)
+    assert results == {"imported": 5, "skipped": 0}
+
+    imported = list(Event.objects.order_by("timestamp"))
+    assert [e.timestamp for e in imported] == [e.timestamp for e in events]
+    assert [e.data for e in imported] == [{"i": i} for i in range(5)]
+    assert all(e.initiator is None for e in imported)
+
+    # Duplicates are skipped.
+    stream.seek(0)
+    results = import_events(load_events(stream, fmt), skip_duplicates=True)
+    assert results == {"imported": 0, "skipped": 5}
+    assert Event.objects.count() == 5
+
+    with pytest.raises(TypeError):
+        list(load_events(StringIO(), "xml"))
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("events")
+def test_import_command(tmp_path: Path) -> None:
+    """The import command reads plain and compressed files."""
+    csv_file = tmp_path / "events.csv"
+    jsonl_file = tmp_path / "events.jsonl.gz"
+    call_command("eventlog_export", f"--output={csv_file}", stderr=StringIO())
+    call_command("eventlog_export", f"--output={jsonl_file}", stderr=StringIO())
+    Event.objects.all().delete()
+
+    out = StringIO()
+    call_command(
+        "eventlog_import",
+        str(csv_file),
+        str(jsonl_file),
+        "--skip-duplicates",
+        stdout=out,
+    )
+    assert f"{csv_file}: 5 events imported, 0 duplicates skipped." in out.getvalue()
+    assert f"{jsonl_file}: 0 events imported, 5 duplicates skipped." in out.getvalue()
+    assert Event.objects.count() == 5
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, Any
+
+import pytest
+from asgiref.sync import async_to_sync
+
+from eventlog.events import EventGroup
+from eventlog.models import Event
+from eventlog.writer import EventWriter
+
+if TYPE_CHECKING:
+    from django.core.mail import EmailMessage
+
+
+def test_writer_batches() -> None:
+    """Queued items are handed over to the handler in batches."""
+    batches: list[list[Any]] = []
+    writer = EventWriter(handler=batches.append, batch_size=2)
+    for i in range(5):
+        assert writer.put(i)
+
+    writer.start()
+    writer.flush()
+    writer.shutdown()
+
+    assert sorted(i for batch in batches for i in batch) == [0, 1, 2, 3, 4]
+    assert all(len(batch) <= 2 for batch in batches)
+    assert writer.stats() == {"queued": 0, "flushed": 5, "dropped": 0, "failed": 0}
+
+
+def test_writer_drop_newest() -> None:
+    """If the queue is full, new items are dropped."""
+    batches: list[list[Any]] = []
+    writer = EventWriter(handler=batches.append, maxsize=2, overflow="drop_newest")
+    assert writer.put(1)
+    assert writer.put(2)
+    assert not writer.put(3)
+
+    writer.start()
+    writer.shutdown()
+
+    assert batches == [[1, 2]]
+    assert writer.dropped == 1
+
+
+def test_writer_drop_oldest() -> None:
+    """If the queue is full, the oldest items are dropped."""
+    batches: list[list[Any]] = []
+    writer = EventWriter(handler=batches.append, maxsize=2, overflow="drop_oldest")
+    assert writer.put(1)
+    assert writer.put(2)
+    assert not writer.put(3)
+
+    writer.start()
+    writer.shutdown()
+
+    assert batches == [[2, 3]]
+    assert writer.dropped == 1
+
+
+def test_writer_aput() -> None:
+    """Waiting for room in a full queue doesn't block the event loop."""
+    writer = EventWriter(handler=print, maxsize=1)
+    assert writer.put(1)
+
+    async def put_and_drain() -> list[Any]:
+        put = asyncio.ensure_future(writer.aput(2))
+        await asyncio.sleep(0.05)
+        assert not put.done()
+        # Runs while aput() waits for room.
+        items = [writer.queue.get_nowait()]
+        assert await put
+        items.append(writer.queue.get_nowait())
+        return items
+
+    assert async_to_sync(put_and_drain)() == [1, 2]
+
+
+def test_writer_failure() -> None:
+    """Failing batches are counted and don't stop the queue."""
+
+    def handler(batch: list[Any]) -> None:
+        raise RuntimeError
+
+    writer = EventWriter(handler=handler)
+    writer.put(1)
+    writer.start()
+    writer.flush()
+    writer.shutdown()
+
+    assert writer.failed == 1
+    assert writer.flushed == 0
+
+
+def test_writer_invalid_overflow() -> None:
+    """Unknown overflow policies raise an error."""
+    with pytest.raises(TypeError):
+        EventWriter(handler=print, overflow="yolo")
+
+
+@pytest.mark.django_db(transaction=True)
+def test_write_behind(
+    monkeypatch: pytest.MonkeyPatch, mailoutbox: list[EmailMessage]
+) -> None:
+    """With write-behind enabled, events are written by the background queue."""
+    e = EventGroup(send_mail="user@example.com")
+    monkeypatch.setattr(e.config, "write_behind", True)
+    monkeypatch.setattr(e.config, "_event_writer", None)
+
+    e.info("Hello World 1")
+    with e.batch():
+        e.info("Hello World 2")
+        e.info("Hello World 3")
+
+    writer = e.config.get_event_writer()
+    writer.flush()
+    writer.shutdown()
+
+    assert Event.objects.count() == 3
+    assert len(mailoutbox) == 3
+    assert writer.flushed == 3
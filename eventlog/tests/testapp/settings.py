@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 DEBUG = True
@@ -17,8 +18,23 @@ DATABASES = {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": TESTAPP_DIR / "testdb.sqlite",
     },
+    # A separate database for events, see `EventLogConfig.database`.
+    "eventlog": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": TESTAPP_DIR / "testdb_eventlog.sqlite",
+    },
 }
 
+# Tests requiring PostgreSQL (e.g. partitioning) run with
+# `EVENTLOG_TEST_POSTGRESQL=1`, and are skipped otherwise. The connection is
+# configured with the libpq environment variables, e.g. PGHOST, PGUSER,
+# PGPASSWORD and PGDATABASE.
+if os.environ.get("EVENTLOG_TEST_POSTGRESQL"):
+    DATABASES["postgresql"] = {
+        "ENGINE": "django.db.backends.postgresql",
+        "NAME": os.environ.get("PGDATABASE", "eventlog"),
+    }
+
 DEFAULT_AUTO_FIELD = "django.db.models.AutoField"
 
 STATIC_ROOT = TESTAPP_DIR / ".static"
@@ -40,6 +56,9 @@ INSTALLED_APPS = [
     "django.contrib.staticfiles",
 ]
 
+if "postgresql" in DATABASES:
+    INSTALLED_APPS.append("django.contrib.postgres")
+
 MIDDLEWARE = (
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
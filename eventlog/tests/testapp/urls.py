@@ -3,9 +3,12 @@ from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import re_path
 
+from eventlog.views import metrics_view
+
 admin.autodiscover()
 
 urlpatterns = [
     re_path("^admin/", admin.site.urls),
+    re_path("^metrics/$", metrics_view),
     *static(settings.STATIC_URL, document_root=settings.STATIC_ROOT),
 ]
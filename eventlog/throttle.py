@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import hashlib
+import time
+from datetime import datetime
+from datetime import timezone as dt_timezone
+from typing import TYPE_CHECKING, Iterable
+
+from django.core.cache import caches
+from django.db.models import F
+
+if TYPE_CHECKING:
+    from .apps import EventLogConfig
+    from .models import Event
+
+MODE_DROP = "drop"
+MODE_COLLAPSE = "collapse"
+MODES = (MODE_DROP, MODE_COLLAPSE)
+
+
+def throttle(
+    config: EventLogConfig, event: Event, pending: Iterable[Event] = ()
+) -> bool:
+    """
+    Count the event within the current period of `throttle_period` seconds.
+    Returns True if it exceeds the `throttle_rate` and must not be stored.
+
+    Events are counted per group, type and message. In "collapse" mode, the
+    repetition is added to the latest `pending` (i.e. buffered) or stored
+    event of the same group with the same type and message instead. If
+    there is no such event, e.g. as it's still queued or already deleted, the
+    event is stored.
+    """
+    mode = config.throttle_mode
+    if mode not in MODES:
+        msg = f"throttle_mode must be one of {', '.join(MODES)}"
+        raise TypeError(msg)
+
+    period = config.throttle_period
+    window = int(time.time() // period)
+    # The group id and message may contain characters not allowed in keys.
+    fingerprint = hashlib.sha256(
+        f"{event.group}\0{event.message}".encode()
+    ).hexdigest()[:32]
+    key = f"eventlog:throttle:{event.type}:{fingerprint}:{window}"
+
+    # A counter per fixed time window, as add() and incr() are atomic in the
+    # cache backends shared between processes.
+    cache = caches[config.throttle_cache]
+    if cache.add(key, 1, timeout=period + 1):
+        count = 1
+    else:
+        try:
+            count = cache.incr(key)
+        except ValueError:  # The key expired in between.
+            cache.add(key, 1, timeout=period + 1)
+            count = 1
+
+    if count <= config.throttle_rate:
+        return False
+
+    if mode == MODE_COLLAPSE:
+        since = datetime.fromtimestamp(window * period, dt_timezone.utc)
+        return collapse_pending(event, pending, since) or collapse(
+            event, since, using=config.get_database()
+        )
+    return True
+
+
+def collapse_pending(event: Event, pending: Iterable[Event], since: datetime) -> bool:
+    """
+    Add the event as a repetition to the latest of the `pending` events of
+    the same group with the same type and message, logged after `since`.
+    Returns False if there is no such event.
+    """
+    for other in reversed(list(pending)):
+        if (
+            other.group == event.group
+            and other.type == event.type
+            and other.message == event.message
+            and other.timestamp >= since
+        ):
+            other.occurrences += 1
+            other.last_seen = event.timestamp
+            return True
+    return False
+
+
+def collapse(event: Event, since: datetime, using: str | None = None) -> bool:
+    """
+    Add the event as a repetition to the latest event of the same group with
+    the same type and message, logged after `since`. Returns False if there
+    is no such event, e.g. because it's not written yet in buffered mode.
+    """
+    events = type(event).objects.using(using)
+    # Uses the (group, timestamp) index.
+    pk = (
+        events.filter(
+            group=event.group,
+            type=event.type,
+            message=event.message,
+            timestamp__gte=since,
+        )
+        .order_by("-timestamp", "-pk")
+        .values_list("pk", flat=True)
+        .first()
+    )
+    if pk is None:
+        return False
+
+    events.filter(pk=pk).update(
+        occurrences=F("occurrences") + 1, last_seen=event.timestamp
+    )
+    return True
@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import csv
+import json
+from contextlib import nullcontext
+from typing import TYPE_CHECKING, Any, Iterable, Iterator
+
+from django.apps import apps
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+if TYPE_CHECKING:
+    from datetime import datetime
+    from typing import TextIO
+
+    from .apps import EventLogConfig
+    from .models import Event
+
+JSONL = "jsonl"
+CSV = "csv"
+FORMATS = (JSONL, CSV)
+
+# Fields of an exported event.
+FIELDS = (
+    "id",
+    "type",
+    "group",
+    "timestamp",
+    "message",
+    "data",
+    "initiator",
+    "truncated",
+    "occurrences",
+    "last_seen",
+)
+
+
+def export_events(  # noqa: PLR0913 Too many arguments
+    *,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    group: str | None = None,
+    types: Iterable[str] | None = None,
+    after: tuple[datetime, int] | None = None,
+    chunk_size: int = 2000,
+    using: str | None = None,
+) -> Iterator[dict[str, Any]]:
+    """
+    Yield events as dictionaries, ordered by timestamp and id.
+
+    Events are fetched in chunks of `chunk_size` rows (using a server-side
+    cursor, where supported), so memory usage is constant. `after` is a
+    (timestamp, id) checkpoint of the last exported event, to resume an
+    export after it.
+
+    Events are read from the database `using`, or `EventLogConfig.database`
+    if set, otherwise the database router decides.
+    """
+    config: EventLogConfig = apps.get_app_config("eventlog")
+    event_model = apps.get_model("eventlog", "Event")
+    qs = event_model.objects.using(using or config.database)
+
+    if since:
+        qs = qs.filter(timestamp__gte=since)
+    if until:
+        qs = qs.filter(timestamp__lt=until)
+    if group:
+        qs = qs.filter(group=group)
+    if types:
+        qs = qs.filter(type__in=list(types))
+    if after:
+        timestamp, pk = after
+        qs = qs.filter(Q(timestamp__gt=timestamp) | Q(timestamp=timestamp, pk__gt=pk))
+
+    yield from (
+        qs.order_by("timestamp", "pk").values(*FIELDS).iterator(chunk_size=chunk_size)
+    )
+
+
+def dump_events(
+    events: Iterable[dict[str, Any]], stream: TextIO, fmt: str = JSONL
+) -> dict[str, Any] | None:
+    """
+    Write events to the stream as JSON Lines or CSV. In CSV files, the
+    data is stored as a JSON string. Returns the last written event.
+    """
+    if fmt not in FORMATS:
+        msg = f"format must be one of {', '.join(FORMATS)}"
+        raise TypeError(msg)
+
+    writer = None
+    if fmt == CSV:
+        writer = csv.DictWriter(stream, fieldnames=FIELDS)
+        writer.writeheader()
+
+    event = None
+    for event in events:
+        # The DjangoJSONEncoder would cut the timestamp to milliseconds.
+        row = {
+            **event,
+            "timestamp": event["timestamp"].isoformat(),
+            "last_seen": event["last_seen"] and event["last_seen"].isoformat(),
+        }
+        if writer:
+            writer.writerow(
+                {**row, "data": json.dumps(row["data"], cls=DjangoJSONEncoder)}
+            )
+        else:
+            stream.write(json.dumps(row, cls=DjangoJSONEncoder))
+            stream.write("\n")
+    return event
+
+
+def load_events(stream: TextIO, fmt: str = JSONL) -> Iterator[dict[str, Any]]:
+    """
+    Read events written by `dump_events()` from the stream.
+    """
+    if fmt not in FORMATS:
+        msg = f"format must be one of {', '.join(FORMATS)}"
+        raise TypeError(msg)
+
+    if fmt == JSONL:
+        for line in stream:
+            if line.strip():
+                yield _parse_event(json.loads(line))
+        return
+
+    for row in csv.DictReader(stream):
+        yield _parse_event(
+            {
+                **row,
+                "data": json.loads(row["data"]) if row.get("data") else None,
+                "initiator": row.get("initiator") or None,
+                "truncated": row.get("truncated") == "True",
+                "occurrences": row.get("occurrences") or None,
+                "last_seen": row.get("last_seen") or None,
+            }
+        )
+
+
+def _parse_event(event: dict[str, Any]) -> dict[str, Any]:
+    for name in ("timestamp", "last_seen"):
+        if isinstance(event.get(name), str):
+            event[name] = parse_datetime(event[name])
+    return event
+
+
+def import_events(
+    events: Iterable[dict[str, Any]],
+    *,
+    batch_size: int = 1000,
+    atomic: bool = False,
+    skip_duplicates: bool = False,
+) -> dict[str, int]:
+    """
+    Insert events with one bulk INSERT per `batch_size` events. The original
+    timestamp of each event is kept, its id is not.
+
+    With `atomic`, each batch is inserted in its own transaction. With
+    `skip_duplicates`, events with the same group, timestamp, type and
+    message as an existing event are skipped.
+
+    Returns the number of imported and skipped events.
+    """
+    event_model = apps.get_model("eventlog", "Event")
+    results = {"imported": 0, "skipped": 0}
+
+    batch = []
+    for event in events:
+        batch.append(
+            event_model(
+                **{
+                    name: event[name]
+                    for name in FIELDS
+                    if name != "id" and event.get(name) is not None
+                }
+            )
+        )
+        if len(batch) >= batch_size:
+            _import_batch(batch, atomic, skip_duplicates, results)
+            batch = []
+
+    if batch:
+        _import_batch(batch, atomic, skip_duplicates, results)
+    return results
+
+
+def _import_batch(
+    batch: list[Event], atomic: bool, skip_duplicates: bool, results: dict[str, int]
+) -> None:
+    config: EventLogConfig = apps.get_app_config("eventlog")
+    using = config.get_database()
+    events = apps.get_model("eventlog", "Event").objects.using(using)
+
+    with transaction.atomic(using=using) if atomic else nullcontext():
+        if skip_duplicates:
+            # Uses the (group, timestamp) index.
+            seen = set(
+                events.filter(
+                    group__in={e.group for e in batch},
+                    timestamp__in={e.timestamp for e in batch},
+                ).values_list("group", "timestamp", "type", "message")
+            )
+            unique = []
+            for e in batch:
+                key = (e.group, e.timestamp, e.type, e.message)
+                if key not in seen:
+                    seen.add(key)
+                    unique.append(e)
+            results["skipped"] += len(batch) - len(unique)
+            batch = unique
+
+        events.bulk_create(batch)
+        results["imported"] += len(batch)
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from django.apps import apps
+from django.http import Http404, HttpResponse
+
+from .metrics import InMemoryMetrics
+
+if TYPE_CHECKING:
+    from django.http import HttpRequest
+
+    from .apps import EventLogConfig
+
+
+def metrics_view(request: HttpRequest) -> HttpResponse:
+    """
+    The metrics of this process in the Prometheus text format. Requires
+    `EventLogConfig.metrics_class` to be the built-in `InMemoryMetrics`.
+    """
+    config: EventLogConfig = apps.get_app_config("eventlog")
+    metrics = config.get_metrics()
+    if not isinstance(metrics, InMemoryMetrics):
+        raise Http404
+
+    return HttpResponse(
+        metrics.as_prometheus(), content_type="text/plain; version=0.0.4"
+    )
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from logging import getLogger
+from typing import Any, Callable
+
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+
+logger = getLogger(__name__)
+
+OVERFLOW_BLOCK = "block"
+OVERFLOW_DROP_OLDEST = "drop_oldest"
+OVERFLOW_DROP_NEWEST = "drop_newest"
+OVERFLOW_POLICIES = (OVERFLOW_BLOCK, OVERFLOW_DROP_OLDEST, OVERFLOW_DROP_NEWEST)
+
+
+class EventWriter:
+    """
+    Write-behind queue. Items are put into a bounded in-process queue and
+    handed over to `handler` in batches by a pool of background threads.
+
+    With `linger`, the threads wait up to this number of seconds for more
+    items, to hand over larger batches.
+    """
+
+    def __init__(  # noqa: PLR0913 Too many arguments
+        self,
+        handler: Callable[[list[Any]], None],
+        maxsize: int = 10_000,
+        workers: int = 1,
+        batch_size: int = 100,
+        overflow: str = OVERFLOW_BLOCK,
+        *,
+        linger: float = 0,
+    ) -> None:
+        if overflow not in OVERFLOW_POLICIES:
+            msg = f"overflow must be one of {', '.join(OVERFLOW_POLICIES)}"
+            raise TypeError(msg)
+
+        self.handler = handler
+        self.workers = workers
+        self.batch_size = batch_size
+        self.overflow = overflow
+        self.linger = linger
+        self.queue: queue.Queue = queue.Queue(maxsize=maxsize)
+
+        # Counters
+        self.flushed = 0
+        self.dropped = 0
+        self.failed = 0
+
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._threads: list[threading.Thread] = []
+
+    def start(self) -> None:
+        """Start the background threads."""
+        self._stopping.clear()
+        for i in range(self.workers):
+            thread = threading.Thread(
+                target=self._run, name=f"eventlog-writer-{i}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def put(self, item: Any) -> bool:
+        """
+        Add an item to the queue. Returns False if the item (or, with the
+        `drop_oldest` policy, an older item) was dropped as the queue is full.
+        """
+        if self.overflow == OVERFLOW_BLOCK:
+            self.queue.put(item)
+            return True
+
+        try:
+            self.queue.put_nowait(item)
+        except queue.Full:
+            pass
+        else:
+            return True
+
+        if self.overflow == OVERFLOW_DROP_NEWEST:
+            self._count("dropped", 1)
+            return False
+
+        # Drop the oldest items until there is room for the new one.
+        while True:
+            try:
+                self.queue.get_nowait()
+            except queue.Empty:
+                pass
+            else:
+                self.queue.task_done()
+                self._count("dropped", 1)
+            try:
+                self.queue.put_nowait(item)
+            except queue.Full:
+                continue
+            return False
+
+    async def aput(self, item: Any) -> bool:
+        """
+        Like `put()`, for async code. With the `block` policy, a full queue
+        is waited for in a thread, so the event loop is not blocked.
+        """
+        if self.overflow != OVERFLOW_BLOCK:
+            return self.put(item)
+
+        try:
+            self.queue.put_nowait(item)
+        except queue.Full:
+            return await sync_to_async(self.put, thread_sensitive=False)(item)
+        return True
+
+    def flush(self) -> None:
+        """Block until all queued items are processed."""
+        self.queue.join()
+
+    def shutdown(self, timeout: float | None = None) -> None:
+        """Drain the queue and stop the background threads."""
+        self._stopping.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = [t for t in self._threads if t.is_alive()]
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "queued": self.queue.qsize(),
+            "flushed": self.flushed,
+            "dropped": self.dropped,
+            "failed": self.failed,
+        }
+
+    def _count(self, counter: str, value: int) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + value)
+
+    def _run(self) -> None:
+        while batch := self._get_batch():
+            try:
+                self.handler(batch)
+            except Exception:  # noqa: PERF203 try-except within a loop
+                logger.exception("Unable to write %s queued events.", len(batch))
+                self._count("failed", len(batch))
+            else:
+                self._count("flushed", len(batch))
+            finally:
+                close_old_connections()
+                for _ in batch:
+                    self.queue.task_done()
+
+    def _get_batch(self) -> list[Any]:
+        """
+        Wait for the next batch of items. Returns an empty list once the
+        writer is stopped and the queue is empty.
+        """
+        while True:
+            try:
+                batch = [self.queue.get(timeout=0.1)]
+                break
+            except queue.Empty:
+                if self._stopping.is_set():
+                    return []
+
+        deadline = time.monotonic() + self.linger
+        while len(batch) < self.batch_size:
+            # Wait in short steps, so a shutdown is not delayed.
+            timeout = min(deadline - time.monotonic(), 0.1)
+            lingering = timeout > 0 and not self._stopping.is_set()
+            try:
+                if lingering:
+                    batch.append(self.queue.get(timeout=timeout))
+                else:
+                    batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                if not lingering:
+                    break
+        return batch